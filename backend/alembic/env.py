@@ -29,6 +29,8 @@ from app.models.configuration.base import BaseModel
 #    metadata BaseModel sebelum Alembic membandingkannya.
 from app.models import *
 from app.models.packing import manifest as packing_manifest_models
+from app.models.packing import stats as packing_stats_models
+from app.models.packing import job as packing_job_models
 
 # --- [AKHIR BAGIAN 1] ---
 
@@ -0,0 +1,33 @@
+"""adding sscc serial sequence
+
+Revision ID: 3b9d2f6a1c47
+Revises: 6c5beb509c8d
+Create Date: 2026-10-18 09:12:31.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f6a1c47'
+down_revision: Union[str, Sequence[str], None] = '6c5beb509c8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('sscc_serial_seq', start=1, increment=1000)))
+    # SSCC lama dibuat dari packed_boxes.id, jadi serial baru harus mulai di atas ID terbesar
+    # supaya tidak ada SSCC yang dobel.
+    op.execute(
+        "SELECT setval('sscc_serial_seq', (SELECT COALESCE(MAX(id), 0) + 1 FROM packed_boxes), false)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('sscc_serial_seq')))
@@ -0,0 +1,43 @@
+"""adding customer search indexes
+
+Revision ID: 3e1b7c95a4d0
+Revises: 2d8f4a61c9e3
+Create Date: 2026-10-18 15:31:09.617342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e1b7c95a4d0'
+down_revision: Union[str, Sequence[str], None] = '2d8f4a61c9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GiST (bukan GIN): selain filter ILIKE, GiST bisa melayani ORDER BY jarak trigram + LIMIT
+TRGM_INDEXES = [
+    ('ix_customers_name_trgm', 'customers', 'name'),
+    ('ix_branches_name_trgm', 'branches', 'name'),
+    ('ix_locations_name_trgm', 'locations', 'name'),
+    ('ix_locations_city_trgm', 'locations', 'city'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in TRGM_INDEXES:
+            op.create_index(index_name, table_name, [column_name], unique=False,
+                            postgresql_using='gist', postgresql_ops={column_name: 'gist_trgm_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _column_name in reversed(TRGM_INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,39 @@
+"""adding customer list indexes
+
+Revision ID: 5b8e1d3f0a27
+Revises: 4a9c2e7d1f56
+Create Date: 2026-10-18 16:52:37.408115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1d3f0a27'
+down_revision: Union[str, Sequence[str], None] = '4a9c2e7d1f56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset pagination GET /customers: urut (name, id), opsional filter customer_type
+LIST_INDEXES = [
+    ('ix_customers_name_id', ['name', 'id']),
+    ('ix_customers_type_name_id', ['customer_type', 'name', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, columns in LIST_INDEXES:
+            op.create_index(index_name, 'customers', columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, _columns in reversed(LIST_INDEXES):
+            op.drop_index(index_name, table_name='customers', postgresql_concurrently=True, if_exists=True)
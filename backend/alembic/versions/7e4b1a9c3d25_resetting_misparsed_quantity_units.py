@@ -0,0 +1,41 @@
+"""resetting misparsed quantity units
+
+Revision ID: 7e4b1a9c3d25
+Revises: 6c2f9a4e8b13
+Create Date: 2026-10-18 19:12:44.307215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4b1a9c3d25'
+down_revision: Union[str, Sequence[str], None] = '6c2f9a4e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Salinan measures.QUANTITY_PATTERN saat migrasi ini dibuat
+QUANTITY_PATTERN = r"^\s*(\d{1,3}(?:\.\d{3})+|\d+)\s*\D*$"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Aturan lama menggabung semua digit ("2 x 10" -> 210). Teks yang tidak cocok aturan baru
+    # jadi NULL; yang cocok hasilnya sama dengan aturan lama, tidak perlu disentuh.
+    op.get_bind().execute(
+        sa.text(
+            "UPDATE packed_items SET quantity_units = NULL "
+            "WHERE quantity_units IS NOT NULL AND quantity !~ :pattern"
+        ),
+        {"pattern": QUANTITY_PATTERN},
+    )
+    # Rollup masih berisi angka lama: py manage.py db rebuild-packing-stats
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Data saja; isi ulang dengan aturan lama lewat: py manage.py db backfill-packing-measures
+    pass
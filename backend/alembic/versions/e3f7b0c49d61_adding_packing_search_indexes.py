@@ -0,0 +1,52 @@
+"""adding packing search indexes
+
+Revision ID: e3f7b0c49d61
+Revises: d92a4b6e1f38
+Create Date: 2026-10-18 12:02:18.905733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f7b0c49d61'
+down_revision: Union[str, Sequence[str], None] = 'd92a4b6e1f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_INDEXES = [
+    ('ix_packed_items_product_trgm', 'packed_items', 'product'),
+    ('ix_packed_items_batch_trgm', 'packed_items', 'batch'),
+    ('ix_packing_manifests_packing_slip_trgm', 'packing_manifests', 'packing_slip'),
+    ('ix_packing_manifests_tujuan_kirim_trgm', 'packing_manifests', 'tujuan_kirim'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY supaya tabel packed_items yang besar tidak terkunci selama index dibangun.
+    # CONCURRENTLY tidak boleh jalan di dalam transaksi, makanya pakai autocommit_block.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_packed_boxes_manifest_id', 'packed_boxes', ['manifest_id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_packed_items_box_id', 'packed_items', ['box_id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        for index_name, table_name, column_name in TRGM_INDEXES:
+            op.create_index(index_name, table_name, [column_name], unique=False,
+                            postgresql_using='gin', postgresql_ops={column_name: 'gin_trgm_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _column_name in reversed(TRGM_INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_packed_items_box_id', table_name='packed_items',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_packed_boxes_manifest_id', table_name='packed_boxes',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,44 @@
+"""adding packing typed measures
+
+Revision ID: f1a6c2d8e4b9
+Revises: e3f7b0c49d61
+Create Date: 2026-10-18 12:47:31.206518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6c2d8e4b9'
+down_revision: Union[str, Sequence[str], None] = 'e3f7b0c49d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Kolom nullable tanpa default -> cuma ubah katalog, tidak rewrite tabel
+    op.add_column('packed_items', sa.Column('quantity_units', sa.BigInteger(), nullable=True))
+    op.add_column('packed_items', sa.Column('expire_on', sa.Date(), nullable=True))
+    op.add_column('packed_boxes', sa.Column('berat_kg', sa.Numeric(precision=10, scale=3), nullable=True))
+    op.add_column('packing_location_daily_stats',
+                  sa.Column('weight_kg', sa.Numeric(precision=14, scale=3), server_default='0', nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_packed_items_expire_on'), 'packed_items', ['expire_on'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+    # Isi data lama (bertahap, per batch): py manage.py db backfill-packing-measures
+    # lalu: py manage.py db rebuild-packing-stats
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_packed_items_expire_on'), table_name='packed_items',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('packing_location_daily_stats', 'weight_kg')
+    op.drop_column('packed_boxes', 'berat_kg')
+    op.drop_column('packed_items', 'expire_on')
+    op.drop_column('packed_items', 'quantity_units')
@@ -1,19 +1,31 @@
 # file: app/api/routers/customer_router.py
 
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, status, Query, Request, Response
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Impor dependensi untuk mendapatkan sesi DB
 from app.api.deps import get_db_session
+from app.core.exceptions import BadRequestException
+from app.core.responses import APIResponse
+from app.models.users import CustomerTypeEnum
 
 # Impor semua skema yang relevan
+from app.schema.base import PaginatedResponse
 from app.schema.internal.user import customer as schemas
 
 # Impor semua fungsi service yang akan kita panggil
 from app.service import customer as customer_service
+from app.service.internal.file_lines import iter_text_lines
+from app.service.internal.user import credit as credit_service
+from app.service.internal.user import customer_import as customer_import_service
+from app.service.internal.user import geo as geo_service
+from app.service.internal.user import lookup_cache as lookup_cache_service
+from app.service.internal.user import lookup_sync as lookup_sync_service
+from app.service.internal.user import public_ids as public_ids_service
+from app.service.internal.user import search as search_service
 
 # =============================================================================
 # INISIALISASI ROUTER
@@ -45,23 +57,90 @@ async def onboard_new_customer_endpoint(
     new_customer = await customer_service.onboard_customer(db=db, payload=payload)
     return new_customer
 
+@router.post(
+    "/onboard/bulk",
+    response_model=schemas.CustomerOnboardBulkResponse,
+    summary="Onboard Customer Massal dari File (NDJSON/CSV)"
+)
+async def onboard_customers_bulk_endpoint(
+    request: Request,
+    format: customer_import_service.CustomerImportFormat = Query(default=customer_import_service.CustomerImportFormat.NDJSON),
+    dry_run: bool = Query(default=False, description="Validasi & cek duplikat saja, semua chunk di-ROLLBACK."),
+):
+    """
+    Body request = isi file mentah (bukan multipart), dibaca sebagai stream.
+    - `ndjson`: satu baris satu body `POST /customers/onboard`.
+    - `csv`   : satu baris satu location, dikelompokkan per `customer_name` (lihat customer_import.py).
+    Tiap chunk customer di-commit di transaksi sendiri (tidak lewat `get_db_session`).
+    Record yang gagal (skema, nama/NPWP duplikat) dilaporkan di `errors` dan dilewati.
+    """
+    report = await customer_import_service.onboard_customers_bulk(
+        lines=iter_text_lines(request.stream()),
+        file_format=format,
+        dry_run=dry_run,
+    )
+    return report.as_dict()
+
 @router.get(
     "",
-    response_model=List[schemas.CustomerResponse],
+    response_model=PaginatedResponse[schemas.CustomerResponse],
     status_code=status.HTTP_200_OK,
     summary="Dapatkan Daftar Semua Customer"
 )
 async def get_all_customers_endpoint(
-    skip: int = 0,
-    limit: int = Query(default=100, lte=1000), # Batasi limit maks 1000
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000), # Batasi limit maks 1000
+    cursor: Optional[str] = Query(default=None, description="`pagination.next_cursor` (atau header `X-Next-Cursor`) halaman sebelumnya."),
+    page: int = Query(default=1, ge=1, description="Nomor halaman untuk ditampilkan di UI saja; posisi data ditentukan `cursor`."),
+    customer_type: Optional[List[CustomerTypeEnum]] = Query(default=None, description="Filter tipe customer (boleh diulang)."),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
-    Mengambil daftar semua customer dengan data dasar.
-    Endpoint ini mendukung paginasi menggunakan parameter `skip` dan `limit`.
+    Daftar customer dengan data dasar, urut nama, keyset pagination di (name, id).
+    `pagination.total`: tanpa filter = perkiraan statistik planner (`total_is_estimate=true`),
+    dengan filter `customer_type` = hitungan exact.
     """
-    customers = await customer_service.get_all_customers(db=db, skip=skip, limit=limit)
-    return customers
+    customers, next_cursor, total, total_is_estimate = await customer_service.get_all_customers(
+        db=db, limit=limit, cursor=cursor, customer_types=customer_type
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return APIResponse.paginated(
+        data=[schemas.CustomerResponse.model_validate(customer) for customer in customers],
+        total=total,
+        page=page,
+        per_page=limit,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+    )
+
+@router.get(
+    "/search",
+    response_model=List[schemas.CustomerSearchHit],
+    status_code=status.HTTP_200_OK,
+    summary="Typeahead Customer, Branch & Location"
+)
+async def search_customers_endpoint(
+    q: str = Query(..., min_length=3, max_length=100, description="Kata kunci (nama customer/branch/location atau kota)."),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Pencarian sebagian (tidak peka huruf besar/kecil) lewat index trigram, diurutkan dari yang
+    paling mirip. Tiap hit membawa `path` (customer -> branch ...) untuk ditampilkan di dropdown.
+    Didaftarkan sebelum `/{customer_public_id}` supaya "search" tidak dibaca sebagai UUID.
+    """
+    return await search_service.search_lookup(db=db, q=q, limit=limit)
+
+@router.get(
+    "/admin/public-id-cache",
+    response_model=schemas.PublicIdCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Statistik Cache Resolusi public_id"
+)
+async def get_public_id_cache_stats_endpoint():
+    """Isi dan hit ratio cache public_id -> id (customer/branch/location) di worker yang melayani request ini."""
+    return public_ids_service.get_public_id_cache_stats()
 
 @router.get(
     "/{customer_public_id}",
@@ -83,6 +162,73 @@ async def get_customer_details_endpoint(
     )
     return db_customer
 
+# =============================================================================
+# ENDPOINTS UNTUK KREDIT CUSTOMER
+# =============================================================================
+
+@router.get(
+    "/{customer_public_id}/credit",
+    response_model=schemas.CreditBalanceResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Dapatkan Kredit Tersedia Customer"
+)
+async def get_credit_balance_endpoint(
+    customer_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Kredit tersedia = ledger utama + jumlah semua sub-ledger (shard)."""
+    return await credit_service.get_credit_balance(db=db, customer_public_id=customer_public_id)
+
+@router.post(
+    "/{customer_public_id}/credit/reserve",
+    response_model=schemas.CreditReservationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Reservasi Kredit Customer"
+)
+async def reserve_credit_endpoint(
+    customer_public_id: uuid.UUID,
+    payload: schemas.CreditAmount,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Kurangi kredit tersedia secara atomik (satu UPDATE bersyarat).
+    422 kalau kredit tidak cukup; saldo tidak pernah menjadi minus.
+    """
+    return await credit_service.reserve_credit(db=db, customer_public_id=customer_public_id, amount=payload.amount)
+
+@router.post(
+    "/{customer_public_id}/credit/release",
+    response_model=schemas.CreditReservationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Kembalikan Kredit Customer"
+)
+async def release_credit_endpoint(
+    customer_public_id: uuid.UUID,
+    payload: schemas.CreditAmount,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Kembalikan kredit hasil reservasi (order batal / lunas). 422 kalau hasilnya melebihi limit customer."""
+    return await credit_service.release_credit(db=db, customer_public_id=customer_public_id, amount=payload.amount)
+
+@router.put(
+    "/{customer_public_id}/credit/shards",
+    response_model=schemas.CreditBalanceResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Atur Sub-ledger Kredit Customer"
+)
+async def set_credit_shards_endpoint(
+    customer_public_id: uuid.UUID,
+    payload: schemas.CreditShardsUpdate,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Pecah kredit tersedia ke `shard_count` baris untuk customer yang order-nya sangat ramai
+    (reservasi bersamaan tidak antre di satu baris). `shard_count=0` menyatukan kembali.
+    """
+    return await credit_service.set_credit_shards(
+        db=db, customer_public_id=customer_public_id, shard_count=payload.shard_count
+    )
+
 # =============================================================================
 # ENDPOINTS UNTUK BRANCH (SUB-RESOURCE DARI CUSTOMER)
 # =============================================================================
@@ -126,6 +272,66 @@ async def get_branch_details_endpoint(
     branch = await customer_service.get_branch_with_locations(db=db, branch_public_id=branch_public_id)
     return branch
 
+@router.patch(
+    "/branches/{branch_public_id}/parent",
+    response_model=schemas.BranchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Pindahkan Branch ke Parent Lain"
+)
+async def move_branch_endpoint(
+    branch_public_id: uuid.UUID,
+    payload: schemas.BranchMove,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Memindahkan branch beserta seluruh turunannya ke parent lain (customer yang sama),
+    atau menjadikannya root. Closure table ikut diperbarui di transaksi yang sama.
+    """
+    return await customer_service.move_branch(
+        db=db,
+        branch_public_id=branch_public_id,
+        new_parent_public_id=payload.new_parent_public_id
+    )
+
+@router.get(
+    "/branches/{branch_public_id}/subtree",
+    response_model=List[schemas.BranchPathItem],
+    status_code=status.HTTP_200_OK,
+    summary="Dapatkan Branch Ini dan Semua Turunannya"
+)
+async def get_branch_subtree_endpoint(
+    branch_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Flat, urut kedalaman (branch ini depth 0). Satu lookup ke closure table."""
+    return await customer_service.get_branch_subtree(db=db, branch_public_id=branch_public_id)
+
+@router.get(
+    "/branches/{branch_public_id}/subtree/locations",
+    response_model=List[schemas.LocationResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Dapatkan Semua Lokasi di Bawah Branch"
+)
+async def get_branch_subtree_locations_endpoint(
+    branch_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Semua lokasi milik branch ini dan seluruh cabang turunannya (mis. satu kantor regional)."""
+    return await customer_service.get_branch_subtree_locations(db=db, branch_public_id=branch_public_id)
+
+@router.get(
+    "/branches/{branch_public_id}/ancestors",
+    response_model=List[schemas.BranchPathItem],
+    status_code=status.HTTP_200_OK,
+    summary="Dapatkan Jalur Branch dari Root"
+)
+async def get_branch_ancestors_endpoint(
+    branch_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Urut dari root branch sampai branch ini sendiri (elemen terakhir, depth 0)."""
+    return await customer_service.get_branch_ancestors(db=db, branch_public_id=branch_public_id)
+
 # =============================================================================
 # ENDPOINTS UNTUK LOCATION (SUB-RESOURCE DARI BRANCH)
 # =============================================================================
@@ -172,6 +378,36 @@ async def add_location_to_branch_endpoint(
     )
     return new_location
 
+@router.get(
+    "/locations/nearby",
+    response_model=List[schemas.NearbyLocation],
+    status_code=status.HTTP_200_OK,
+    summary="Cari Location Terdekat"
+)
+async def find_nearby_locations_endpoint(
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lon: Optional[float] = Query(default=None, ge=-180, le=180),
+    near: Optional[uuid.UUID] = Query(default=None, description="public_id Location sebagai titik asal (pengganti lat/lon)."),
+    k: int = Query(default=10, ge=1, le=500),
+    radius_km: Optional[float] = Query(default=None, gt=0, le=geo_service.MAX_RADIUS_KM),
+    location_type: Optional[str] = Query(default=None),
+    active_only: bool = Query(default=True),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    `k` location terdekat dari titik (`lat`+`lon`) atau dari location lain (`near`).
+    Dengan `radius_km` hanya yang berada di dalam radius. Location tanpa koordinat tidak ikut.
+    Didaftarkan sebelum `/locations/{location_public_id}` supaya "nearby" tidak dibaca sebagai UUID.
+    """
+    options = dict(k=k, radius_km=radius_km, location_type=location_type, active_only=active_only)
+    if near is not None:
+        if lat is not None or lon is not None:
+            raise BadRequestException("Pilih salah satu: `near` atau `lat`+`lon`.")
+        return await geo_service.find_nearby_locations_from(db=db, location_public_id=near, **options)
+    if lat is None or lon is None:
+        raise BadRequestException("`lat` dan `lon` wajib diisi (atau pakai `near`).")
+    return await geo_service.find_nearby_locations(db=db, lat=lat, lon=lon, **options)
+
 @router.get(
     "/locations/{location_public_id}",
     response_model=schemas.LocationResponse,
@@ -191,21 +427,65 @@ async def get_location_details_endpoint(
     )
     return location
 
+@router.get(
+    "/locations/{location_public_id}/branch-path",
+    response_model=List[schemas.BranchPathItem],
+    status_code=status.HTTP_200_OK,
+    summary="Dapatkan Jalur Branch sebuah Location"
+)
+async def get_location_branch_path_endpoint(
+    location_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Elemen pertama = root branch tempat lokasi ini bernaung, terakhir = branch pemiliknya."""
+    return await customer_service.get_location_branch_path(db=db, location_public_id=location_public_id)
+
 @router.get(
     "/lookup/all",
     response_model=List[schemas.CustomerLookup],
     status_code=status.HTTP_200_OK,
-    summary="Dapatkan Semua Customer & Hierarkinya untuk Dropdown"
+    summary="Dapatkan Semua Customer & Hierarkinya untuk Dropdown",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Snapshot sama dengan ETag di `If-None-Match`."}}
 )
 async def get_all_customers_for_lookup_endpoint(
+    if_none_match: Optional[str] = Header(default=None),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     Mengembalikan daftar SEMUA customer, branch, dan location dalam format
     nested yang ringan (hanya public_id dan name).
-    
-    Sangat dioptimalkan untuk mengisi data filter/dropdown di frontend.
+
+    Body diambil dari snapshot bytes yang sudah di-encode (lookup_cache.py) dan dikirim
+    dengan ETag. Kirim balik ETag di `If-None-Match` -> 304 tanpa body kalau belum berubah.
+    Header `X-Sync-Token` dipakai sebagai `since` untuk `GET /customers/lookup/changes`.
+    """
+    etag, body, sync_token = await lookup_cache_service.get_lookup_snapshot(db=db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Sync-Token": sync_token}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get(
+    "/lookup/changes",
+    response_model=schemas.LookupChangesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Perubahan Customer/Branch/Location Sejak Token Sync",
+    responses={status.HTTP_410_GONE: {"description": "Token terlalu lama / perubahan terlalu banyak, muat ulang /lookup/all."}}
+)
+async def get_lookup_changes_endpoint(
+    since: str = Query(..., description="Token dari header `X-Sync-Token` atau field `token` respons sebelumnya."),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Delta untuk pohon lookup: baris yang dibuat/diubah (upsert) dan public_id yang dihapus.
+    Terapkan sebagai upsert/delete idempoten (baris di sekitar batas token bisa terkirim ulang),
+    lalu simpan `token` untuk request berikutnya.
     """
-    customers = await customer_service.get_all_customers_for_lookup(db=db)
-    return customers
-    
\ No newline at end of file
+    return await lookup_sync_service.get_lookup_changes(db=db, since=since)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Perbandingan weak sesuai RFC 9110 untuk If-None-Match (prefix W/ diabaikan)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
@@ -0,0 +1,34 @@
+# file: app/api/internal/packing/admin.py
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.schema.internal.packing import packing_manifest as schemas
+from app.service.internal.packing import sscc as sscc_service
+from app.service.internal.packing import box_lookup as box_lookup_service
+
+router = APIRouter(prefix="/admin", tags=["Packing - Admin"])
+
+@router.get(
+    "/sscc/serial-space", # Path: GET /packing/admin/sscc/serial-space
+    response_model=schemas.SSCCSerialSpaceResponse,
+    summary="Cek Sisa Ruang Serial SSCC"
+)
+async def get_sscc_serial_space_endpoint(
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Melaporkan berapa serial SSCC yang masih tersedia untuk company prefix 8994957,
+    berdasarkan state sequence `sscc_serial_seq` di database.
+    """
+    return await sscc_service.get_sscc_serial_space(db=db)
+
+@router.get(
+    "/box-cache", # Path: GET /packing/admin/box-cache
+    response_model=schemas.BoxCacheStatsResponse,
+    summary="Statistik Cache Lookup SSCC"
+)
+async def get_box_cache_stats_endpoint():
+    """Isi dan hit ratio cache lookup box di worker yang melayani request ini."""
+    return box_lookup_service.get_box_cache_stats()
@@ -0,0 +1,31 @@
+# file: app/api/internal/packing/barcodes.py
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.schema.internal.packing import packing_manifest as schemas
+from app.service.internal.packing import packing as packing_service
+
+router = APIRouter(prefix="/barcodes", tags=["Packing & Manifest"])
+
+@router.post(
+    "/validate", # Path: POST /packing/barcodes/validate
+    response_model=schemas.BarcodeValidateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Validasi Massal Check Digit SSCC/GTIN"
+)
+async def validate_barcodes_endpoint(
+    payload: schemas.BarcodeValidateRequest,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Memvalidasi check digit GS1 untuk ribuan kode sekaligus. Dipakai job rekonsiliasi
+    hasil scan. Set `check_registered` untuk sekalian mencari SSCC yang valid
+    tapi tidak ada di `packed_boxes`.
+    """
+    return await packing_service.validate_barcodes(
+        db=db,
+        codes=payload.codes,
+        check_registered=payload.check_registered
+    )
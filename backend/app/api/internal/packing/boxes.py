@@ -0,0 +1,42 @@
+# file: app/api/internal/packing/boxes.py
+
+from fastapi import APIRouter, Depends, Path, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.schema.internal.packing import packing_manifest as schemas
+from app.service.internal.packing import box_lookup as box_lookup_service
+
+router = APIRouter(prefix="/boxes", tags=["Packing & Manifest"])
+
+@router.post(
+    "/lookup:batch", # Path: POST /packing/boxes/lookup:batch
+    response_model=schemas.BoxScanBatchResponse,
+    summary="Lookup Banyak SSCC Sekaligus"
+)
+async def lookup_boxes_batch_endpoint(
+    payload: schemas.BoxScanBatchRequest,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Untuk scanner yang mengirim hasil scan per batch. SSCC yang belum ada di cache
+    dimuat dalam satu query; yang tidak terdaftar ditandai `not_found`.
+    """
+    body = await box_lookup_service.get_boxes_json_by_sscc_batch(db=db, ssccs=payload.ssccs)
+    return Response(content=body, media_type="application/json")
+
+@router.get(
+    "/{sscc}", # Path: GET /packing/boxes/{sscc}
+    response_model=schemas.BoxScanResponse,
+    summary="Lookup Box dari Hasil Scan SSCC"
+)
+async def lookup_box_endpoint(
+    sscc: str = Path(..., pattern=r"^\d{18}$"),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Resolve SSCC hasil scan ke box, item di dalamnya, dan manifest tujuannya.
+    Scan ulang box yang sama dilayani dari cache in-process (tanpa query).
+    """
+    body = await box_lookup_service.get_box_json_by_sscc(db=db, sscc=sscc)
+    return Response(content=body, media_type="application/json")
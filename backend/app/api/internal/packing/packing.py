@@ -1,13 +1,19 @@
 # file: app/api/routers/packing_router.py
 
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session
 from app.schema.internal.packing import packing_manifest as schemas
 from app.service.internal.packing import packing as packing_service
+from app.service.internal.packing import manifest_json as manifest_json_service
+from app.service.internal.file_lines import iter_text_lines
+from app.service.internal.packing import importer as import_service
+from app.service.internal.packing import jobs as job_service
 
 # ✅ BENERIN PREFIX BIAR JELAS DAN RESTFUL
 router = APIRouter(prefix="/manifests", tags=["Packing & Manifest"])
@@ -16,13 +22,32 @@ router = APIRouter(prefix="/manifests", tags=["Packing & Manifest"])
     "", # Path: POST /manifests
     response_model=schemas.PackingManifestResponse,
     status_code=status.HTTP_201_CREATED,
-    summary="Buat Packing Manifest Baru"
+    summary="Buat Packing Manifest Baru",
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.ManifestJobResponse}}
 )
 async def create_manifest_endpoint(
+    request: Request,
     payload: schemas.PackingManifestCreate,
+    background_tasks: BackgroundTasks,
+    bulk: bool = Query(default=False, description="Insert semua box & item sekaligus (disarankan untuk manifest besar)."),
+    run_async: bool = Query(default=False, alias="async", description="Masukkan ke antrian, balas 202 + job (untuk manifest 1000+ box)."),
     db: AsyncSession = Depends(get_db_session)
 ):
-    manifest = await packing_service.create_packing_manifest(db=db, payload=payload)
+    if run_async:
+        job = await job_service.enqueue_manifest_job(db=db, payload=payload)
+        # Background task jalan setelah commit, jadi worker pasti bisa melihat job-nya
+        background_tasks.add_task(job_service.manifest_job_pool.wake)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(schemas.ManifestJobResponse(**job_service.job_to_dict(job))),
+            # url_for ikut prefix mount router (/api/v1/packing/...), bukan cuma prefix router ini
+            headers={"Location": str(request.url_for("get_manifest_job_endpoint", job_public_id=job.public_id))},
+        )
+
+    if bulk:
+        manifest = await packing_service.create_packing_manifest_bulk(db=db, payload=payload)
+    else:
+        manifest = await packing_service.create_packing_manifest(db=db, payload=payload)
     
     # Konstruksi response secara eksplisit
     return schemas.PackingManifestResponse(
@@ -36,34 +61,98 @@ async def create_manifest_endpoint(
         packed_boxes=manifest.packed_boxes
     )
 
+@router.post(
+    "/import", # Path: POST /manifests/import
+    response_model=schemas.ManifestImportResponse,
+    summary="Import Massal Manifest dari File (NDJSON/CSV)"
+)
+async def import_manifests_endpoint(
+    request: Request,
+    format: import_service.ManifestImportFormat = Query(default=import_service.ManifestImportFormat.NDJSON),
+    dry_run: bool = Query(default=False, description="Cek error saja, semua chunk di-ROLLBACK."),
+):
+    """
+    Body request = isi file mentah (bukan multipart), dibaca sebagai stream.
+    - `ndjson`: satu baris satu body `POST /manifests`.
+    - `csv`   : satu baris satu item, dikelompokkan per `manifest_ref` (lihat importer.py).
+    Baris yang gagal dilaporkan di `errors` dan dilewati; sisanya tetap di-import.
+    Tiap chunk di-commit sendiri, jadi chunk yang ditolak DB tidak membatalkan chunk lain.
+    """
+    report = await import_service.import_manifests(
+        lines=iter_text_lines(request.stream()),
+        file_format=format,
+        dry_run=dry_run,
+    )
+    return report.as_dict()
+
 @router.get(
     "", # Path: GET /manifests
-    response_model=List[schemas.PackingManifestResponse],
+    response_model=Union[List[schemas.PackingManifestResponse], List[schemas.PackingManifestSummaryResponse]],
     summary="Dapatkan Daftar Manifest Packing Terbaru"
 )
 async def get_latest_manifests_endpoint(
+    response: Response,
     limit: int = Query(default=25, lte=100),
+    cursor: Optional[str] = Query(default=None, description="Token dari header `X-Next-Cursor` halaman sebelumnya."),
+    view: schemas.ManifestListView = Query(default=schemas.ManifestListView.FULL),
     db: AsyncSession = Depends(get_db_session)
 ):
-    manifests = await packing_service.get_latest_manifests(db=db, limit=limit)
-    
-    # Konstruksi response secara eksplisit untuk setiap item dalam list
-    response_list = []
-    for manifest in manifests:
-        response_list.append(
-            schemas.PackingManifestResponse(
-                public_id=manifest.public_id,
-                created_at=manifest.created_at,
-                updated_at=manifest.updated_at,
-                location_public_id=manifest.location.public_id,
-                tujuan_kirim=manifest.tujuan_kirim,
-                packing_slip=manifest.packing_slip,
-                total_boxes=manifest.total_boxes,
-                packed_boxes=manifest.packed_boxes
-            )
-        )
+    """
+    Daftar manifest terbaru dengan keyset pagination di (created_at, id).
+    Token halaman berikutnya dikirim lewat header `X-Next-Cursor` (kosong kalau sudah habis).
+    - `view=full`   : nested lengkap sampai item (untuk drill-down).
+    - `view=summary`: hanya header manifest + jumlah box & item (untuk tabel).
+    """
+    if view == schemas.ManifestListView.SUMMARY:
+        rows, next_cursor = await packing_service.get_latest_manifest_summaries(db=db, limit=limit, cursor=cursor)
+        response_list = [schemas.PackingManifestSummaryResponse.model_validate(row) for row in rows]
+    else:
+        # Jalur cepat: proyeksi kolom -> bytes JSON (orjson), bentuknya sama dengan PackingManifestResponse
+        body, next_cursor = await manifest_json_service.get_latest_manifests_json(db=db, limit=limit, cursor=cursor)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return response_list
 
+@router.post(
+    "/print-data:batch", # Path: POST /manifests/print-data:batch
+    response_model=schemas.LabelDataBatchResponse,
+    summary="Dapatkan Data Cetak Label untuk Banyak Manifest Sekaligus"
+)
+async def get_formatted_label_data_batch_endpoint(
+    payload: schemas.LabelDataBatchRequest,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Untuk cetak massal akhir shift (50-300 manifest). Semua manifest dimuat
+    dalam beberapa query IN, hasilnya urut sesuai `manifest_public_ids`.
+    Manifest yang tidak ada ditandai `not_found` tanpa menggagalkan yang lain.
+    """
+    results = await packing_service.get_data_for_label_printing_batch(
+        db=db,
+        manifest_public_ids=payload.manifest_public_ids
+    )
+    found_count = sum(1 for result in results if result["status"] == "ok")
+    return {
+        "results": results,
+        "found_count": found_count,
+        "missing_count": len(results) - found_count,
+    }
+
+@router.get(
+    "/jobs/{job_public_id}", # Path: GET /manifests/jobs/{job_public_id}
+    response_model=schemas.ManifestJobResponse,
+    summary="Cek Status Job Pembuatan Manifest"
+)
+async def get_manifest_job_endpoint(
+    job_public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Poll endpoint ini setelah `POST /manifests?async=true` sampai status `done` / `failed`."""
+    return await job_service.get_manifest_job(db=db, public_id=job_public_id)
+
 @router.get(
     "/{public_id}", # Path: GET /manifests/{public_id}
     response_model=schemas.PackingManifestResponse,
@@ -73,19 +162,8 @@ async def get_manifest_details_endpoint(
     public_id: uuid.UUID,
     db: AsyncSession = Depends(get_db_session)
 ):
-    manifest = await packing_service.get_manifest_by_public_id(db=db, public_id=public_id)
-    
-    # Konstruksi response secara eksplisit
-    return schemas.PackingManifestResponse(
-        public_id=manifest.public_id,
-        created_at=manifest.created_at,
-        updated_at=manifest.updated_at,
-        location_public_id=manifest.location.public_id,
-        tujuan_kirim=manifest.tujuan_kirim,
-        packing_slip=manifest.packing_slip,
-        total_boxes=manifest.total_boxes,
-        packed_boxes=manifest.packed_boxes
-    )
+    body = await manifest_json_service.get_manifest_json_by_public_id(db=db, public_id=public_id)
+    return Response(content=body, media_type="application/json")
 
 @router.get(
     "/{public_id}/print-data",
@@ -106,4 +184,26 @@ async def get_formatted_label_data_endpoint(
     
     # Service ngasih dictionary, kita tinggal return.
     # FastAPI akan validasi pake `LabelDataResponse`.
-    return label_data_dict
\ No newline at end of file
+    return label_data_dict
+
+@router.get(
+    "/{public_id}/labels.zpl",
+    response_class=StreamingResponse,
+    summary="Cetak Label ZPL untuk Semua Box di Manifest"
+)
+async def get_manifest_labels_zpl_endpoint(
+    public_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Me-render label ZPL di server dan men-stream-nya satu label per box,
+    siap dikirim langsung ke printer Zebra. Template diambil dari DocumentType
+    `SHIPPING_LABEL_ZPL` (kalau ada `template_path`) atau template bawaan.
+    """
+    manifest, labels = await packing_service.get_zpl_labels_for_manifest(db=db, manifest_public_id=public_id)
+    filename = f"labels-{manifest.packing_slip or manifest.public_id}.zpl"
+    return StreamingResponse(
+        labels,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
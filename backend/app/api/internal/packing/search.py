@@ -0,0 +1,44 @@
+# file: app/api/internal/packing/search.py
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.schema.internal.packing import packing_manifest as schemas
+from app.service.internal.packing import search as search_service
+
+router = APIRouter(prefix="/search", tags=["Packing & Manifest"])
+
+@router.get(
+    "", # Path: GET /packing/search
+    response_model=List[schemas.ManifestSearchHit],
+    summary="Cari Manifest (Produk, Batch, Packing Slip, Tujuan)"
+)
+async def search_manifests_endpoint(
+    response: Response,
+    product: Optional[str] = Query(default=None, max_length=100),
+    batch: Optional[str] = Query(default=None, max_length=50, description="Nomor lot/batch, untuk lookup recall."),
+    packing_slip: Optional[str] = Query(default=None, max_length=50),
+    tujuan_kirim: Optional[str] = Query(default=None, max_length=255),
+    limit: int = Query(default=25, le=100),
+    cursor: Optional[str] = Query(default=None, description="Token dari header `X-Next-Cursor` halaman sebelumnya."),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Pencarian manifest memakai index trigram (pencocokan sebagian, tidak peka huruf besar/kecil).
+    Semua filter digabung AND, minimal satu diisi (min. 3 karakter).
+    Pagination sama seperti daftar manifest: token berikutnya ada di header `X-Next-Cursor`.
+    """
+    hits, next_cursor = await search_service.search_manifests(
+        db=db,
+        product=product,
+        batch=batch,
+        packing_slip=packing_slip,
+        tujuan_kirim=tujuan_kirim,
+        limit=limit,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return hits
@@ -0,0 +1,92 @@
+# file: app/api/internal/packing/stats.py
+
+import uuid
+from datetime import date, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.core.exceptions import BadRequestException
+from app.schema.internal.packing import packing_manifest as schemas
+from app.service.internal.packing import stats as stats_service
+
+# Endpoint di sini membaca tabel rollup, bukan packed_boxes/packed_items.
+# Pengecualian: /expiring, yang langsung memfilter kolom bertipe `expire_on` (ber-index).
+router = APIRouter(prefix="/stats", tags=["Packing - Dashboard Stats"])
+
+def _date_range(date_from: Optional[date], date_to: Optional[date]):
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise BadRequestException("date_from tidak boleh setelah date_to.")
+    return date_from, date_to
+
+@router.get(
+    "/boxes-per-day", # Path: GET /packing/stats/boxes-per-day
+    response_model=List[schemas.BoxesPerDayStat],
+    summary="Statistik Box per Hari"
+)
+async def get_boxes_per_day_endpoint(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    location_public_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Default 30 hari terakhir. Bisa difilter ke satu lokasi tujuan."""
+    date_from, date_to = _date_range(date_from, date_to)
+    return await stats_service.get_boxes_per_day(
+        db=db, date_from=date_from, date_to=date_to, location_public_id=location_public_id
+    )
+
+@router.get(
+    "/manifests-per-destination", # Path: GET /packing/stats/manifests-per-destination
+    response_model=List[schemas.ManifestsPerDestinationStat],
+    summary="Statistik Manifest per Lokasi Tujuan"
+)
+async def get_manifests_per_destination_endpoint(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(default=20, le=200),
+    db: AsyncSession = Depends(get_db_session)
+):
+    date_from, date_to = _date_range(date_from, date_to)
+    return await stats_service.get_manifests_per_destination(
+        db=db, date_from=date_from, date_to=date_to, limit=limit
+    )
+
+@router.get(
+    "/units-per-product", # Path: GET /packing/stats/units-per-product
+    response_model=List[schemas.UnitsPerProductStat],
+    summary="Statistik Unit Terkirim per Produk"
+)
+async def get_units_per_product_endpoint(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(default=20, le=200),
+    db: AsyncSession = Depends(get_db_session)
+):
+    date_from, date_to = _date_range(date_from, date_to)
+    return await stats_service.get_units_per_product(
+        db=db, date_from=date_from, date_to=date_to, limit=limit
+    )
+
+@router.get(
+    "/expiring", # Path: GET /packing/stats/expiring
+    response_model=List[schemas.ExpiringShipmentStat],
+    summary="Kiriman dengan ED Mendekati / di Rentang Tanggal"
+)
+async def get_expiring_shipments_endpoint(
+    expire_from: Optional[date] = None,
+    expire_to: Optional[date] = None,
+    limit: int = Query(default=100, le=1000),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Default: batch terkirim yang ED-nya jatuh dalam 90 hari ke depan."""
+    expire_from = expire_from or date.today()
+    expire_to = expire_to or expire_from + timedelta(days=90)
+    if expire_from > expire_to:
+        raise BadRequestException("expire_from tidak boleh setelah expire_to.")
+    return await stats_service.get_expiring_shipments(
+        db=db, expire_from=expire_from, expire_to=expire_to, limit=limit
+    )
@@ -1,6 +1,11 @@
 from fastapi import APIRouter
 from .internal import customer as customer_router
 from .internal.packing import packing as packing_router
+from .internal.packing import admin as packing_admin_router
+from .internal.packing import barcodes as packing_barcodes_router
+from .internal.packing import stats as packing_stats_router
+from .internal.packing import search as packing_search_router
+from .internal.packing import boxes as packing_boxes_router
 
 #from .routers.process import inbound as router_inbound
 #from .routers.process import consignment as router_consignment
@@ -31,6 +36,11 @@ from .internal.packing import packing as packing_router
 api_router = APIRouter()
 api_router.include_router(customer_router.router, prefix="/customer")
 api_router.include_router(packing_router.router, prefix="/packing")
+api_router.include_router(packing_admin_router.router, prefix="/packing")
+api_router.include_router(packing_barcodes_router.router, prefix="/packing")
+api_router.include_router(packing_stats_router.router, prefix="/packing")
+api_router.include_router(packing_search_router.router, prefix="/packing")
+api_router.include_router(packing_boxes_router.router, prefix="/packing")
 
 #api_router.include_router(router_inbound.router, prefix="/process", tags=["Business Processes"])
 #api_router.include_router(router_consignment.router, prefix="/process/consignment", tags=["Business Processes - Consignment"])
@@ -10,6 +10,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1000
 
+    # Job async pembuatan manifest (POST /manifests?async=true), per proses API
+    MANIFEST_JOB_WORKERS: int = 2
+    MANIFEST_JOB_POLL_SECONDS: float = 2.0
+    # Job "running" tanpa heartbeat selama ini dianggap workernya mati dan boleh diambil ulang
+    MANIFEST_JOB_STALE_SECONDS: int = 300
+
+    # Delta-sync lookup customer (GET /customers/lookup/changes)
+    # Tombstone lebih tua dari ini dihapus `db purge-lookup-tombstones`; token lebih tua dapat 410
+    LOOKUP_TOMBSTONE_RETENTION_DAYS: int = 30
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -29,4 +29,12 @@ class UnprocessableEntityException(HTTPException):
     Berguna untuk validasi logika bisnis yang lebih dalam.
     """
     def __init__(self, detail: str = "Unprocessable entity"):
-        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+class GoneException(HTTPException):
+    """
+    Exception kustom untuk resource/token yang sudah tidak berlaku lagi (HTTP 410).
+    Dipakai misalnya untuk token delta-sync yang sudah melewati masa simpan tombstone.
+    """
+    def __init__(self, detail: str = "Resource is gone"):
+        super().__init__(status_code=status.HTTP_410_GONE, detail=detail)
@@ -16,7 +16,8 @@ class APIResponse:
         }
     
     @staticmethod
-    def paginated(data, total, page, per_page, message="Success"):
+    def paginated(data, total, page, per_page, message="Success", **pagination_extra):
+        # pagination_extra: metadata tambahan, mis. next_cursor untuk keyset pagination
         return {
             "success": True,
             "message": message,
@@ -25,6 +26,7 @@ class APIResponse:
                 "total": total,
                 "page": page,
                 "per_page": per_page,
-                "total_pages": (total + per_page - 1) // per_page
+                "total_pages": (total + per_page - 1) // per_page,
+                **pagination_extra
             }
         }
@@ -3,5 +3,5 @@ from .users import *
 
 __all__ = [
     "TimestampMixin","PublicIDMixin","BaseModel",
-    "Customer", "CustomerSpecification", "CustomerDetails", "CustomerTypeEnum", "Branch", "Location"
+    "Customer", "CustomerSpecification", "CustomerCreditShard", "CustomerDetails", "CustomerTypeEnum", "Branch", "BranchClosure", "Location", "LookupTombstone"
 ]
\ No newline at end of file
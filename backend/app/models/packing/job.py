@@ -0,0 +1,43 @@
+# file: app/models/packing/job.py
+
+from __future__ import annotations
+import enum
+from datetime import datetime
+from sqlalchemy import String, ForeignKey, Integer, Text, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from typing import Optional, Dict, Any
+
+from ..configuration import BaseModel
+
+class ManifestJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class PackingManifestJob(BaseModel):
+    """
+    Antrian persisten untuk `POST /manifests?async=true`. Diambil worker pakai
+    `FOR UPDATE SKIP LOCKED`, jadi aman dijalankan di banyak proses API sekaligus.
+    """
+    __tablename__ = 'packing_manifest_jobs'
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=ManifestJobStatus.QUEUED.value)
+    # Body PackingManifestCreate (by_alias), divalidasi dulu sebelum masuk antrian
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    total_boxes: Mapped[int] = mapped_column(Integer, nullable=False)
+    processed_boxes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    manifest_id: Mapped[Optional[int]] = mapped_column(ForeignKey('packing_manifests.id'))
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100))
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Query claim: WHERE status IN ('queued', 'running') ORDER BY id
+        Index('ix_packing_manifest_jobs_pending', 'id',
+              postgresql_where=text("status IN ('queued', 'running')")),
+    )
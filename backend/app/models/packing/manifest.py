@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 from sqlalchemy import (
-    String, ForeignKey, Integer, Text
+    String, ForeignKey, Integer, BigInteger, Date, Numeric, Text, Sequence, Index
 )
 import uuid
+from datetime import date
+from decimal import Decimal
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
@@ -13,46 +15,82 @@ from ..configuration import BaseModel
 if TYPE_CHECKING:
     from ..users.customer import Location
 
+# Sequence khusus untuk serial reference SSCC, lepas dari PackedBox.id.
+# Satu nextval() = satu BLOK serial (sebesar increment) yang di-lease oleh satu worker.
+SSCC_SERIAL_BLOCK_SIZE = 1000
+sscc_serial_seq = Sequence(
+    'sscc_serial_seq',
+    start=1,
+    increment=SSCC_SERIAL_BLOCK_SIZE,
+    metadata=BaseModel.metadata,
+)
+
 class PackingManifest(BaseModel):
     __tablename__ = 'packing_manifests'
     
     location_id: Mapped[int] = mapped_column(ForeignKey('locations.id'), nullable=False)
     shipping_to_location_public_id: uuid.UUID # Lokasi TUJUAN
+    tujuan_kirim: Mapped[str] = mapped_column(String(255))
     packing_slip: Mapped[Optional[str]] = mapped_column(String(50), index=True)
     total_boxes: Mapped[int] = mapped_column(Integer)
     shipping_address_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)
+    # Hasil `_process_shipping_address_for_label` (LabelAddressData), dihitung saat create/update
+    label_address: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)
     shipping_to_location_id: Mapped[int] = mapped_column(ForeignKey('locations.id'), nullable=False)
     
     
     location: Mapped[Location] = relationship(foreign_keys=[location_id])
     shipping_to_location: Mapped[Location] = relationship(foreign_keys=[shipping_to_location_id])
     packed_boxes: Mapped[List[PackedBox]] = relationship(
-        back_populates='manifest', cascade='all, delete-orphan'
+        back_populates='manifest', cascade='all, delete-orphan', order_by='PackedBox.id'
+    )
+
+    __table_args__ = (
+        # Untuk keyset pagination daftar manifest terbaru: ORDER BY (created_at, id) DESC
+        Index('ix_packing_manifests_created_at_id', 'created_at', 'id'),
+        # Trigram (pg_trgm) untuk pencarian ILIKE '%...%' di /packing/search
+        Index('ix_packing_manifests_packing_slip_trgm', 'packing_slip',
+              postgresql_using='gin', postgresql_ops={'packing_slip': 'gin_trgm_ops'}),
+        Index('ix_packing_manifests_tujuan_kirim_trgm', 'tujuan_kirim',
+              postgresql_using='gin', postgresql_ops={'tujuan_kirim': 'gin_trgm_ops'}),
     )
 
 class PackedBox(BaseModel):
     __tablename__ = 'packed_boxes'
     
-    manifest_id: Mapped[int] = mapped_column(ForeignKey('packing_manifests.id'), nullable=False)
+    manifest_id: Mapped[int] = mapped_column(ForeignKey('packing_manifests.id'), nullable=False, index=True)
     box_number: Mapped[int] = mapped_column(Integer)
     sscc: Mapped[str] = mapped_column(String(18), unique=True, index=True)
     gtin: Mapped[str] = mapped_column(String(8))
     petugas: Mapped[Optional[str]] = mapped_column(String(50))
     berat: Mapped[Optional[str]] = mapped_column(String(20))
+    # Versi bertipe dari `berat` (lihat service/internal/packing/measures.py), untuk SUM di SQL
+    berat_kg: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 3))
     
     manifest: Mapped[PackingManifest] = relationship(back_populates='packed_boxes')
     packed_items: Mapped[List[PackedItem]] = relationship(
-        back_populates='box', cascade='all, delete-orphan'
+        back_populates='box', cascade='all, delete-orphan', order_by='PackedItem.id'
     )
 
 class PackedItem(BaseModel):
     __tablename__ = 'packed_items'
     
-    box_id: Mapped[int] = mapped_column(ForeignKey('packed_boxes.id'), nullable=False)
+    box_id: Mapped[int] = mapped_column(ForeignKey('packed_boxes.id'), nullable=False, index=True)
     product: Mapped[str] = mapped_column(String(100))
     batch: Mapped[str] = mapped_column(String(50))
     expire_date: Mapped[str] = mapped_column(String(20))
     quantity: Mapped[str] = mapped_column(String(20))
     unit: Mapped[str] = mapped_column(String(20))
+    # Versi bertipe dari `quantity` dan `expire_date`, diisi saat create / backfill
+    quantity_units: Mapped[Optional[int]] = mapped_column(BigInteger)
+    expire_on: Mapped[Optional[date]] = mapped_column(Date, index=True)
     
-    box: Mapped[PackedBox] = relationship(back_populates='packed_items')
\ No newline at end of file
+    box: Mapped[PackedBox] = relationship(back_populates='packed_items')
+
+    __table_args__ = (
+        # Trigram (pg_trgm) untuk pencarian produk/batch, mis. lookup recall per lot
+        Index('ix_packed_items_product_trgm', 'product',
+              postgresql_using='gin', postgresql_ops={'product': 'gin_trgm_ops'}),
+        Index('ix_packed_items_batch_trgm', 'batch',
+              postgresql_using='gin', postgresql_ops={'batch': 'gin_trgm_ops'}),
+    )
\ No newline at end of file
@@ -0,0 +1,40 @@
+# file: app/models/packing/stats.py
+
+from __future__ import annotations
+from datetime import date, datetime
+from sqlalchemy import (
+    String, ForeignKey, Integer, BigInteger, Numeric, Date, DateTime, func
+)
+from decimal import Decimal
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+# Tabel rollup untuk dashboard overview. Di-update di transaksi yang sama dengan
+# `create_packing_manifest`, dan bisa dibangun ulang penuh lewat
+# `py manage.py db rebuild-packing-stats`. Tidak pakai BaseModel karena kuncinya
+# komposit (bukan id/public_id) dan tidak pernah diekspos per baris.
+
+class PackingLocationDailyStat(Base):
+    """Per hari per lokasi tujuan: jumlah manifest, box, baris item, unit, dan berat (kg)."""
+    __tablename__ = 'packing_location_daily_stats'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    location_id: Mapped[int] = mapped_column(ForeignKey('locations.id'), primary_key=True)
+    manifest_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    box_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unit_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    weight_kg: Mapped[Decimal] = mapped_column(Numeric(14, 3), nullable=False, default=0, server_default='0')
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+class PackingProductDailyStat(Base):
+    """Per hari per lokasi tujuan per produk: jumlah baris item dan unit."""
+    __tablename__ = 'packing_product_daily_stats'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    location_id: Mapped[int] = mapped_column(ForeignKey('locations.id'), primary_key=True)
+    product: Mapped[str] = mapped_column(String(100), primary_key=True)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unit_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,6 +1,6 @@
-from .customer import Customer, CustomerSpecification, CustomerDetails, CustomerTypeEnum, Branch, Location
+from .customer import Customer, CustomerSpecification, CustomerCreditShard, CustomerDetails, CustomerTypeEnum, Branch, BranchClosure, Location, LookupTombstone
 #from user import '
 
 __all__=[
-    "Customer", "CustomerSpecification", "CustomerDetails", "CustomerTypeEnum", "Branch", "Location"
+    "Customer", "CustomerSpecification", "CustomerCreditShard", "CustomerDetails", "CustomerTypeEnum", "Branch", "BranchClosure", "Location", "LookupTombstone"
 ]
\ No newline at end of file
@@ -1,12 +1,17 @@
 from __future__ import annotations
 from sqlalchemy import (
-    String, ForeignKey, Text, Boolean, Numeric, Enum as SQLAlchemyEnum, Integer, 
+    String, ForeignKey, Text, Boolean, Numeric, Enum as SQLAlchemyEnum, Integer, BigInteger, DateTime, Index, func,
+    Computed, CheckConstraint,
 )
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import List, Optional, TYPE_CHECKING
+from datetime import datetime
 import enum
+import uuid
 
 from ..configuration import BaseModel
+from app.database.database import Base
 if TYPE_CHECKING:
     from app.models.packing.manifest import PackingManifest
 
@@ -21,8 +26,25 @@ class CustomerSpecification(BaseModel):
     default_credit_limit: Mapped[Optional[float]] = mapped_column(Numeric(15, 2), default=0.0)
     current_credit_limit: Mapped[Optional[float]] = mapped_column(Numeric(15, 2), default=0.0)
     default_payment_terms_days: Mapped[Optional[int]] = mapped_column(Integer, default=30)
+    # 0 = kredit tersedia di current_credit_limit saja; N = dipecah ke N baris customer_credit_shards
+    credit_shard_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
     customer:Mapped[Customer]=relationship(back_populates='specification')
 
+class CustomerCreditShard(Base):
+    """
+    Sub-ledger kredit untuk customer yang ramai order: sisa kredit dipecah ke beberapa baris
+    supaya reservasi bersamaan tidak antre di satu baris. Kredit tersedia =
+    current_credit_limit + SUM(available). Dijaga oleh service credit (credit.py).
+    """
+    __tablename__ = 'customer_credit_shards'
+    customer_id: Mapped[int] = mapped_column(ForeignKey('customers.id', ondelete='CASCADE'), primary_key=True)
+    shard_no: Mapped[int] = mapped_column(Integer, primary_key=True)
+    available: Mapped[float] = mapped_column(Numeric(15, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint('available >= 0', name='ck_customer_credit_shards_available'),
+    )
+
 class CustomerDetails(BaseModel):
     __tablename__ = 'customer_details'
     customer_id: Mapped[int] = mapped_column(ForeignKey('customers.id'), unique=True, nullable=False)
@@ -49,6 +71,17 @@ class Customer(BaseModel):
         cascade='all, delete-orphan',
     )
 
+    __table_args__ = (
+        # Delta-sync lookup: WHERE updated_at > token
+        Index('ix_customers_updated_at', 'updated_at'),
+        # Typeahead /customers/search: ILIKE + ORDER BY jarak trigram (KNN) dari satu index GiST
+        Index('ix_customers_name_trgm', 'name',
+              postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
+        # Daftar customer: keyset (name, id), dengan/tanpa filter customer_type (+ count per tipe)
+        Index('ix_customers_name_id', 'name', 'id'),
+        Index('ix_customers_type_name_id', 'customer_type', 'name', 'id'),
+    )
+
     @property 
     def root_branches(self) -> List[Branch]:
         return[Branch for branch in self.branches if branch.parent_id is None]
@@ -66,9 +99,41 @@ class Branch(BaseModel):
     parent: Mapped[Optional[Branch]]= relationship(remote_side='Branch.id', back_populates='children')
     locations: Mapped[List[Location]]=relationship(back_populates='branch', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        Index('ix_branches_updated_at', 'updated_at'),
+        Index('ix_branches_name_trgm', 'name',
+              postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
+    )
+
     def __repr__(self) -> str:
         return f'<Branch name="{self.name}"'
     
+class BranchClosure(Base):
+    """
+    Closure table untuk hierarki Branch: satu baris per pasangan (ancestor, descendant),
+    termasuk diri sendiri (depth 0). Subtree = WHERE ancestor_id = X,
+    ancestor = WHERE descendant_id = X; dua-duanya satu lookup index.
+    Dijaga oleh service customer (create/move); delete ikut CASCADE.
+    """
+    __tablename__ = 'branch_closure'
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey('branches.id', ondelete='CASCADE'), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey('branches.id', ondelete='CASCADE'), primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('ix_branch_closure_descendant_depth', 'descendant_id', 'depth'),
+    )
+
+# Grid spasial untuk query "lokasi terdekat" tanpa PostGIS: bumi dibagi sel 0.1 x 0.1 derajat
+# (~11 km), nomor sel = baris_lintang * GEO_GRID_COLUMNS + kolom_bujur. Sel yang bertetangga
+# dalam satu baris lintang nomornya berurutan, jadi satu kotak pencarian = beberapa range B-tree.
+GEO_GRID_CELLS_PER_DEGREE = 10
+GEO_GRID_COLUMNS = 360 * GEO_GRID_CELLS_PER_DEGREE
+GEO_CELL_SQL = (
+    f"floor((latitude + 90) * {GEO_GRID_CELLS_PER_DEGREE})::bigint * {GEO_GRID_COLUMNS}"
+    f" + least(floor((longitude + 180) * {GEO_GRID_CELLS_PER_DEGREE})::bigint, {GEO_GRID_COLUMNS - 1})"
+)
+
 class Location(BaseModel):
     __tablename__='locations'
     branch_id:Mapped[int]=mapped_column(ForeignKey('branches.id'), nullable=False)
@@ -90,7 +155,29 @@ class Location(BaseModel):
     location_pic_contact: Mapped[str]=mapped_column(String(15))
     minimal_order_value: Mapped[Optional[float]] = mapped_column(Numeric(15, 2))
     delivery_instructions: Mapped[Optional[str]] = mapped_column(Text)  
+    # Generated column: ikut terisi di semua jalur insert/update (ORM, Core, SQL manual)
+    geo_cell: Mapped[Optional[int]] = mapped_column(BigInteger, Computed(GEO_CELL_SQL, persisted=True), index=True)
     packing_manifests: Mapped[List[PackingManifest]] = relationship(back_populates="location")
+
+    __table_args__ = (
+        Index('ix_locations_updated_at', 'updated_at'),
+        Index('ix_locations_name_trgm', 'name',
+              postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
+        Index('ix_locations_city_trgm', 'city',
+              postgresql_using='gist', postgresql_ops={'city': 'gist_trgm_ops'}),
+    )
+
+class LookupTombstone(Base):
+    """
+    Jejak customer/branch/location yang dihapus, untuk delta-sync lookup
+    (`GET /customers/lookup/changes`). Diisi trigger AFTER DELETE di database
+    (lihat migration), jadi delete lewat ORM, Core, maupun SQL manual tercatat semua.
+    """
+    __tablename__ = 'lookup_tombstones'
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False, comment='customer, branch, location')
+    public_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     
 
 
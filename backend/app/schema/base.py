@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel, Field, ConfigDict
 from typing_extensions import Annotated
 from datetime import datetime
@@ -60,6 +60,22 @@ class TypeUpdate(FePlUpdate):
     """Pola Update untuk skema berbasis TypeBase."""
     code: Optional[str] = None
     name: Optional[str] = None
-    description: Optional[str] = None    
+    description: Optional[str] = None
 
+T = TypeVar("T")
 
+class PaginationMeta(_Base):
+    """Bentuk `pagination` dari `APIResponse.paginated`."""
+    total: int
+    page: int
+    per_page: int
+    total_pages: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+
+class PaginatedResponse(_Base, Generic[T]):
+    """Envelope `APIResponse.paginated` (success, message, data, pagination)."""
+    success: bool
+    message: str
+    data: List[T]
+    pagination: PaginationMeta
@@ -1,7 +1,10 @@
 # file: app/schemas/internal/packing/manifest_schemas.py
 
+import enum
 import uuid
-from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 from app.schema.base import FePlBase, FeResBase
@@ -61,6 +64,24 @@ class PackingManifestResponse(FeResBase):
     total_boxes: int
     packed_boxes: List[PackedBoxResponse]
 
+class PackingManifestSummaryResponse(FeResBase):
+    """
+    Versi ringan untuk tabel daftar manifest (`view=summary`).
+    Tidak membawa isi box/item, cukup jumlahnya saja.
+    """
+    location_public_id: uuid.UUID
+    tujuan_kirim: str
+    packing_slip: Optional[str]
+    total_boxes: int
+    box_count: int
+    item_count: int
+    unit_count: int
+    total_weight_kg: Optional[Decimal] = None
+
+class ManifestListView(str, enum.Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
 class LabelAddressData(BaseModel):
     """Struktur data alamat yang sudah diolah untuk label."""
     line_1: str
@@ -83,4 +104,143 @@ class LabelDataResponse(FeResBase):
     shipping_address: LabelAddressData
     
     # Data kotak-kotak yang akan dicetak (kita bisa pake ulang skema yang ada)
-    packed_boxes: List[PackedBoxResponse]    
\ No newline at end of file
+    packed_boxes: List[PackedBoxResponse]
+
+class LabelDataBatchRequest(BaseModel):
+    """PAYLOAD untuk `POST /packing/manifests/print-data:batch`."""
+    manifest_public_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
+
+class LabelDataBatchItem(BaseModel):
+    """Satu baris hasil batch, urutannya sama dengan request."""
+    manifest_public_id: uuid.UUID
+    status: Literal["ok", "not_found"]
+    detail: Optional[str] = None
+    data: Optional[LabelDataResponse] = None
+
+class LabelDataBatchResponse(BaseModel):
+    results: List[LabelDataBatchItem]
+    found_count: int
+    missing_count: int
+
+class ManifestImportError(BaseModel):
+    row: int = Field(..., description="Nomor baris di file (untuk CSV: baris pertama manifest tersebut).")
+    ref: Optional[str] = Field(None, description="manifest_ref (CSV) atau packing_slip (NDJSON) kalau ada.")
+    detail: str
+
+class ManifestImportResponse(BaseModel):
+    imported_count: int
+    box_count: int
+    item_count: int
+    error_count: int
+    errors: List[ManifestImportError]
+    # Terisi kalau import berhenti sebelum file habis; chunk sebelumnya tetap tersimpan
+    stopped_reason: Optional[str] = None
+
+class ManifestJobResponse(FeResBase):
+    """Status job `POST /manifests?async=true`. Progres dihitung dari jumlah box yang sudah masuk."""
+    status: Literal["queued", "running", "done", "failed"]
+    total_boxes: int
+    processed_boxes: int
+    progress: float = Field(..., description="processed_boxes / total_boxes (0.0 - 1.0).")
+    attempts: int
+    error: Optional[str] = None
+    manifest_public_id: Optional[uuid.UUID] = Field(None, description="Terisi setelah status `done`.")
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class SSCCSerialSpaceResponse(BaseModel):
+    """Sisa ruang serial reference SSCC untuk satu company prefix."""
+    extension_digit: str
+    company_prefix: str
+    max_serial: int
+    block_size: int
+    next_block_start: int
+    remaining_serials: int
+    remaining_blocks: int
+    used_ratio: float
+    worker_leased_remaining: int = Field(..., description="Sisa serial di blok yang sedang dipegang worker ini.")
+
+class BarcodeValidateRequest(BaseModel):
+    """PAYLOAD untuk `POST /packing/barcodes/validate`."""
+    codes: List[str] = Field(..., description="Daftar kode GS1 lengkap (SSCC-18, GTIN-8/12/13/14).")
+    check_registered: bool = Field(False, description="Cocokkan juga SSCC yang valid ke tabel packed_boxes.")
+
+class BarcodeValidateResponse(BaseModel):
+    """Hasil validasi massal check digit GS1."""
+    total: int
+    valid_count: int
+    invalid_count: int
+    invalid_codes: List[str]
+    unregistered_codes: Optional[List[str]] = None
+
+class BoxesPerDayStat(BaseModel):
+    day: date
+    manifest_count: int
+    box_count: int
+    unit_count: int
+    weight_kg: Decimal
+
+class ExpiringShipmentStat(BaseModel):
+    product: str
+    batch: str
+    expire_on: date
+    location_public_id: uuid.UUID
+    location_name: Optional[str]
+    unit_count: int
+    box_count: int
+    manifest_count: int
+    last_shipped_at: datetime
+
+class ManifestsPerDestinationStat(BaseModel):
+    location_public_id: uuid.UUID
+    location_name: Optional[str]
+    manifest_count: int
+    box_count: int
+
+class UnitsPerProductStat(BaseModel):
+    product: str
+    unit_count: int
+    item_count: int
+
+class ManifestSearchHit(BaseModel):
+    """Satu manifest hasil `GET /packing/search`, plus item yang cocok (untuk recall)."""
+    public_id: uuid.UUID
+    created_at: datetime
+    location_public_id: uuid.UUID
+    tujuan_kirim: str
+    packing_slip: Optional[str]
+    total_boxes: int
+    matched_item_count: int = Field(..., description="Jumlah baris item yang cocok dengan filter produk/batch.")
+    matched_ssccs: List[str] = Field(default_factory=list, description="SSCC box yang berisi item yang cocok.")
+
+class BoxScanManifestHeader(BaseModel):
+    public_id: uuid.UUID
+    location_public_id: uuid.UUID
+    tujuan_kirim: str
+    packing_slip: Optional[str]
+    total_boxes: int
+
+class BoxScanResponse(PackedBoxResponse):
+    """Hasil scan SSCC di dock: box, isinya, dan header manifest tujuannya."""
+    manifest: BoxScanManifestHeader
+
+class BoxScanBatchRequest(BaseModel):
+    ssccs: List[str] = Field(..., min_length=1, max_length=500)
+
+class BoxScanBatchItem(BaseModel):
+    sscc: str
+    status: Literal["ok", "not_found"]
+    data: Optional[BoxScanResponse] = None
+
+class BoxScanBatchResponse(BaseModel):
+    results: List[BoxScanBatchItem]
+    found_count: int
+    missing_count: int
+
+class BoxCacheStatsResponse(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
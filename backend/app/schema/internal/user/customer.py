@@ -1,7 +1,8 @@
 from __future__ import annotations
 import uuid
-from typing import List, Optional
-from pydantic import Field
+from decimal import Decimal
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
 from app.schema.base import FePlBase, FeResBase, FeResLookup
 from app.models.users import CustomerTypeEnum
 
@@ -74,6 +75,13 @@ class CustomerCreateSimple(FePlBase):
     details: CustomerDetailsCreate
     specification: CustomerSpecificationCreate
 
+class BranchMove(FePlBase):
+    """
+    PAYLOAD untuk endpoint `PATCH /customers/branches/{branch_public_id}/parent`
+    Kosongkan `new_parent_public_id` untuk menjadikan branch sebagai root.
+    """
+    new_parent_public_id: Optional[uuid.UUID] = None
+
 # =============================================================================
 # BLOCK 3: SKEMA RESPONSE (OUTPUT DARI API)
 # FeResBase sudah punya public_id, created_at, updated_at, dan config from_attributes.
@@ -141,4 +149,102 @@ class BranchLookup(FeResLookup):
 class CustomerLookup(FeResLookup):
     """Skema lookup enteng untuk Customer. Isinya hierarki branch."""
     # public_id dan name udah diwarisin dari FeResLookup
-    branches: List[BranchLookup] = []    
\ No newline at end of file
+    branches: List[BranchLookup] = []
+
+class BranchPathItem(FeResLookup):
+    """Satu branch di hasil query closure table (subtree / jalur ancestor)."""
+    # public_id dan name udah diwarisin dari FeResLookup
+    depth: int = Field(..., description="Jarak (jumlah level) dari branch acuan.")
+    parent_public_id: Optional[uuid.UUID] = None
+
+class CustomerOnboardBulkError(BaseModel):
+    row: int = Field(..., description="Nomor baris di file (untuk CSV: baris pertama customer tersebut).")
+    ref: Optional[str] = Field(None, description="Nama customer kalau sudah terbaca.")
+    detail: str
+
+class CustomerOnboardBulkResponse(BaseModel):
+    """Hasil `POST /customers/onboard/bulk`. `dry_run=True`: count = yang akan dibuat, tidak ada yang disimpan."""
+    dry_run: bool = False
+    created_count: int
+    branch_count: int
+    location_count: int
+    error_count: int
+    errors: List[CustomerOnboardBulkError]
+    elapsed_seconds: float
+    customers_per_second: float
+
+class CustomerLookupChange(FeResLookup):
+    """Customer yang dibuat/diubah sejak token sync."""
+    pass
+
+class BranchLookupChange(FeResLookup):
+    """Branch yang dibuat/diubah (termasuk dipindah) sejak token sync. Flat, tanpa children."""
+    customer_public_id: uuid.UUID
+    parent_public_id: Optional[uuid.UUID] = None
+
+class LocationLookupChange(FeResLookup):
+    """Location yang dibuat/diubah sejak token sync."""
+    location_type: Optional[str]
+    branch_public_id: uuid.UUID
+
+class LookupDeleted(BaseModel):
+    customers: List[uuid.UUID] = []
+    branches: List[uuid.UUID] = []
+    locations: List[uuid.UUID] = []
+
+class LookupChangesResponse(BaseModel):
+    """Hasil `GET /customers/lookup/changes`."""
+    token: str = Field(..., description="Dipakai sebagai `since` di request berikutnya.")
+    customers: List[CustomerLookupChange]
+    branches: List[BranchLookupChange]
+    locations: List[LocationLookupChange]
+    deleted: LookupDeleted
+
+class SearchPathItem(FeResLookup):
+    """Satu langkah jalur ancestry hasil pencarian (customer dulu, lalu branch dari root)."""
+    kind: Literal["customer", "branch"]
+
+class CustomerSearchHit(FeResLookup):
+    """Satu hasil `GET /customers/search`."""
+    kind: Literal["customer", "branch", "location"]
+    city: Optional[str] = None
+    matched_on: Literal["name", "city"]
+    score: float = Field(..., description="Word similarity trigram terhadap kata kunci (0-1).")
+    path: List[SearchPathItem] = Field(default_factory=list, description="Ancestry dari customer sampai induk langsung hit ini.")
+
+class NearbyLocation(FeResLookup):
+    """Satu hasil `GET /customers/locations/nearby`, urut dari yang terdekat."""
+    location_type: Optional[str] = None
+    city: Optional[str] = None
+    latitude: float
+    longitude: float
+    is_active: bool
+    distance_km: float = Field(..., description="Jarak great-circle (haversine) dari titik asal, dalam km.")
+
+class PublicIdCacheStatsResponse(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+class CreditAmount(FePlBase):
+    """PAYLOAD `POST /customers/{customer_public_id}/credit/reserve` dan `/credit/release`."""
+    amount: Decimal = Field(..., gt=0, max_digits=15, decimal_places=2)
+
+class CreditShardsUpdate(FePlBase):
+    """PAYLOAD `PUT /customers/{customer_public_id}/credit/shards`. 0 = matikan sub-ledger."""
+    shard_count: int = Field(..., ge=0, le=64)
+
+class CreditReservationResponse(BaseModel):
+    customer_public_id: uuid.UUID
+    amount: float
+    ledger: Literal["main", "shard", "shards"] = Field(..., description="Baris yang diubah: ledger utama, satu shard, atau beberapa shard.")
+    shard_no: Optional[int] = None
+    ledger_remaining: float = Field(..., description="Sisa di baris yang diubah (bukan total kredit tersedia).")
+
+class CreditBalanceResponse(BaseModel):
+    customer_public_id: uuid.UUID
+    credit_limit: float
+    available_credit: float = Field(..., description="Ledger utama + jumlah semua shard.")
+    credit_shard_count: int
@@ -3,12 +3,19 @@ from .internal.user import customer
 __all__=[
     "_get_customer_by_public_id",
     "_get_branch_by_public_id",
-    "_create_branch_hierarchy_recursive",
+    "_create_branch_hierarchy",
+    "_insert_branch_levels",
     "onboard_customer",
     "add_branch_to_customer",
     "add_location_to_branch",
     "get_all_customers",
     "get_customer_with_full_hierarchy",
     "get_branch_with_locations",
-    "get_location_details"
+    "get_location_details",
+    "move_branch",
+    "get_branch_subtree",
+    "get_branch_subtree_locations",
+    "get_branch_ancestors",
+    "get_location_branch_path",
+    "rebuild_branch_closure"
 ]
\ No newline at end of file
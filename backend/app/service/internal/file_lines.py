@@ -0,0 +1,34 @@
+# file: app/service/internal/file_lines.py
+#
+# Helper bersama untuk import massal (manifest, customer): baca file per baris
+# tanpa menampung seluruh isinya, dan ringkas error validasi Pydantic jadi satu string.
+
+import codecs
+from typing import AsyncIterator, Iterable
+from pydantic import ValidationError
+
+
+async def iter_text_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Pecah stream bytes (mis. `request.stream()`) jadi baris teks UTF-8, tanpa menampung seluruh body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_file_lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Bungkus file teks biasa (manage.py) jadi async iterator."""
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+def validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
@@ -0,0 +1,144 @@
+# file: app/service/internal/packing/box_cache.py
+#
+# LRU body JSON hasil scan SSCC (diisi box_lookup.py) beserta invalidasinya.
+# Box yang berubah dicatat dulu di session.info, baru dibuang dari LRU di `after_commit`
+# (pola yang sama dengan public_ids.py), jadi tidak ada jeda antara flush dan commit
+# tempat lookup lain bisa menyimpan ulang isi lama. Dua jalur pencatatan:
+# - write ORM PackingManifest / PackedBox / PackedItem -> otomatis lewat mapper event,
+# - write Core (`update(PackedItem)` di backfill, dst.) -> service memanggil
+#   `mark_manifests_changed` / `mark_boxes_changed`.
+# Lookup yang mulai membaca DB sebelum invalidasi tidak menyimpan hasilnya (`generation`
+# berubah), sama seperti versi di lookup_cache.py.
+# Cache per worker; TTL membatasi data basi dari write di proses lain.
+
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+
+BOX_CACHE_MAX_ENTRIES = 10_000
+BOX_CACHE_TTL_SECONDS = 300.0
+
+_PENDING_MANIFESTS_KEY = "box_cache_pending_manifests"
+_PENDING_BOXES_KEY = "box_cache_pending_boxes"
+
+
+class BoxLookupCache:
+    """
+    LRU terbatas: sscc -> (manifest_id, box_id, expires_at, body JSON).
+    Tidak pakai lock: semua akses terjadi di event loop yang sama dan tidak ada `await` di dalamnya.
+    """
+
+    def __init__(self, max_entries: int = BOX_CACHE_MAX_ENTRIES, ttl_seconds: float = BOX_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[int, int, float, bytes]]" = OrderedDict()
+        # Naik setiap invalidasi; body yang dibaca sebelum kenaikan tidak boleh disimpan
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sscc: str) -> Optional[bytes]:
+        entry = self._entries.get(sscc)
+        if entry is None or entry[2] < time.monotonic():
+            if entry is not None:
+                del self._entries[sscc]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(sscc)
+        self.hits += 1
+        return entry[3]
+
+    def put(self, sscc: str, manifest_id: int, box_id: int, body: bytes, generation: int) -> None:
+        """`generation` = nilai `self.generation` saat body mulai dibaca dari DB."""
+        if generation != self.generation:
+            return
+        self._entries[sscc] = (manifest_id, box_id, time.monotonic() + self.ttl_seconds, body)
+        self._entries.move_to_end(sscc)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, manifest_ids: Iterable[int] = (), box_ids: Iterable[int] = ()) -> None:
+        """Buang semua entry milik manifest/box tersebut, satu kali lewat LRU."""
+        manifest_ids, box_ids = set(manifest_ids), set(box_ids)
+        if not manifest_ids and not box_ids:
+            return
+        self.generation += 1
+        stale = [
+            sscc for sscc, entry in self._entries.items()
+            if entry[0] in manifest_ids or entry[1] in box_ids
+        ]
+        for sscc in stale:
+            del self._entries[sscc]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+box_lookup_cache = BoxLookupCache()
+
+
+def _pending(info: dict, key: str) -> Set[int]:
+    return info.setdefault(key, set())
+
+
+def mark_manifests_changed(db: AsyncSession, manifest_ids: Iterable[int]) -> None:
+    """Panggil setelah write Core ke packing_manifests; dibuang dari cache saat commit."""
+    _pending(db.info, _PENDING_MANIFESTS_KEY).update(manifest_ids)
+
+
+def mark_boxes_changed(db: AsyncSession, box_ids: Iterable[int]) -> None:
+    """Panggil setelah write Core ke packed_boxes / packed_items (id box-nya); dibuang saat commit."""
+    _pending(db.info, _PENDING_BOXES_KEY).update(box_ids)
+
+
+def _mark_from_event(target, key: str, ids: Iterable[int]) -> None:
+    ids = [entity_id for entity_id in ids if entity_id is not None]
+    session = object_session(target)
+    if session is None:
+        if key == _PENDING_MANIFESTS_KEY:
+            box_lookup_cache.invalidate(manifest_ids=ids)
+        else:
+            box_lookup_cache.invalidate(box_ids=ids)
+        return
+    _pending(session.info, key).update(ids)
+
+
+@event.listens_for(PackingManifest, "after_update")
+@event.listens_for(PackingManifest, "after_delete")
+def _mark_manifest(mapper, connection, target: PackingManifest):
+    _mark_from_event(target, _PENDING_MANIFESTS_KEY, [target.id])
+
+
+@event.listens_for(PackedBox, "after_update")
+@event.listens_for(PackedBox, "after_delete")
+def _mark_box(mapper, connection, target: PackedBox):
+    _mark_from_event(target, _PENDING_BOXES_KEY, [target.id])
+
+
+@event.listens_for(PackedItem, "after_insert")
+@event.listens_for(PackedItem, "after_update")
+@event.listens_for(PackedItem, "after_delete")
+def _mark_item_box(mapper, connection, target: PackedItem):
+    # Item yang dipindah box: box lama juga berubah isinya
+    previous_box_ids = inspect(target).attrs.box_id.history.deleted or ()
+    _mark_from_event(target, _PENDING_BOXES_KEY, [target.box_id, *previous_box_ids])
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session: Session) -> None:
+    box_lookup_cache.invalidate(
+        manifest_ids=session.info.pop(_PENDING_MANIFESTS_KEY, ()),
+        box_ids=session.info.pop(_PENDING_BOXES_KEY, ()),
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_MANIFESTS_KEY, None)
+    session.info.pop(_PENDING_BOXES_KEY, None)
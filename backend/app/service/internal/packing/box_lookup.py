@@ -0,0 +1,156 @@
+# file: app/service/internal/packing/box_lookup.py
+#
+# Lookup scan SSCC di dock: SSCC -> box + item + header manifest tujuan.
+# Satu query lewat index unik `packed_boxes.sscc`, hasilnya disimpan sebagai
+# bytes JSON siap kirim di LRU in-process, jadi scan ulang box yang sama
+# tidak menyentuh database maupun Pydantic sama sekali.
+#
+# Bentuk JSON = `BoxScanResponse` (FeResBase: created_at, updated_at, public_id dulu).
+# LRU + invalidasinya (setelah commit) ada di box_cache.py.
+
+from typing import Dict, List, Tuple
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+from app.models.users.customer import Location
+from app.core.exceptions import NotFoundException
+from app.service.internal.packing.box_cache import box_lookup_cache
+from app.service.internal.packing.manifest_json import ORJSON_OPTIONS
+
+
+async def _load_box_bodies(db: AsyncSession, ssccs: List[str]) -> Dict[str, Tuple[int, int, bytes]]:
+    """Muat box untuk `ssccs` (2 query: box+manifest, lalu item), hasil: sscc -> (manifest_id, box_id, body)."""
+    box_rows = (await db.execute(
+        select(
+            PackedBox.id,
+            PackedBox.manifest_id,
+            PackedBox.created_at,
+            PackedBox.updated_at,
+            PackedBox.public_id,
+            PackedBox.box_number,
+            PackedBox.sscc,
+            PackedBox.gtin,
+            PackedBox.petugas,
+            PackedBox.berat,
+            PackingManifest.public_id.label("manifest_public_id"),
+            Location.public_id.label("location_public_id"),
+            PackingManifest.tujuan_kirim,
+            PackingManifest.packing_slip,
+            PackingManifest.total_boxes,
+        )
+        .join(PackingManifest, PackingManifest.id == PackedBox.manifest_id)
+        .join(Location, Location.id == PackingManifest.location_id)
+        .where(PackedBox.sscc.in_(ssccs))
+    )).all()
+    if not box_rows:
+        return {}
+
+    item_rows = (await db.execute(
+        select(
+            PackedItem.box_id,
+            PackedItem.product,
+            PackedItem.batch,
+            PackedItem.expire_date,
+            PackedItem.quantity,
+            PackedItem.unit,
+        )
+        .where(PackedItem.box_id.in_([row.id for row in box_rows]))
+        .order_by(PackedItem.id)
+    )).all()
+    items_by_box: Dict[int, List[dict]] = {}
+    for item in item_rows:
+        items_by_box.setdefault(item.box_id, []).append({
+            "product": item.product,
+            "batch": item.batch,
+            "expire_date": item.expire_date,
+            "quantity": item.quantity,
+            "unit": item.unit,
+        })
+
+    bodies = {}
+    for row in box_rows:
+        box = {
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "public_id": row.public_id,
+            "box_number": row.box_number,
+            "sscc": row.sscc,
+            "gtin": row.gtin,
+            "petugas": row.petugas,
+            "berat": row.berat,
+            "packed_items": items_by_box.get(row.id, []),
+            "manifest": {
+                "public_id": row.manifest_public_id,
+                "location_public_id": row.location_public_id,
+                "tujuan_kirim": row.tujuan_kirim,
+                "packing_slip": row.packing_slip,
+                "total_boxes": row.total_boxes,
+            },
+        }
+        bodies[row.sscc] = (row.manifest_id, row.id, orjson.dumps(box, option=ORJSON_OPTIONS))
+    return bodies
+
+
+async def get_box_json_by_sscc(db: AsyncSession, sscc: str) -> bytes:
+    """Body JSON satu box untuk hasil scan. Dari cache kalau ada, kalau tidak 2 query kecil."""
+    body = box_lookup_cache.get(sscc)
+    if body is not None:
+        return body
+    generation = box_lookup_cache.generation
+    loaded = await _load_box_bodies(db, [sscc])
+    if sscc not in loaded:
+        raise NotFoundException(f"Box with SSCC {sscc} not found.")
+    manifest_id, box_id, body = loaded[sscc]
+    box_lookup_cache.put(sscc, manifest_id, box_id, body, generation)
+    return body
+
+
+async def get_boxes_json_by_sscc_batch(db: AsyncSession, ssccs: List[str]) -> bytes:
+    """
+    Versi batch: SSCC yang belum ada di cache dimuat sekaligus (satu IN query).
+    Urutan hasil sama dengan input; SSCC yang tidak ada ditandai `not_found`.
+    """
+    unique_ssccs = list(dict.fromkeys(ssccs))
+    bodies: Dict[str, bytes] = {}
+    missing = []
+    for sscc in unique_ssccs:
+        body = box_lookup_cache.get(sscc)
+        if body is None:
+            missing.append(sscc)
+        else:
+            bodies[sscc] = body
+    if missing:
+        generation = box_lookup_cache.generation
+        for sscc, (manifest_id, box_id, body) in (await _load_box_bodies(db, missing)).items():
+            box_lookup_cache.put(sscc, manifest_id, box_id, body, generation)
+            bodies[sscc] = body
+
+    results = []
+    for sscc in ssccs:
+        body = bodies.get(sscc)
+        if body is None:
+            results.append({"sscc": sscc, "status": "not_found", "data": None})
+        else:
+            # Fragment: bytes cache disisipkan apa adanya, tidak di-parse/di-encode ulang
+            results.append({"sscc": sscc, "status": "ok", "data": orjson.Fragment(body)})
+    found_count = sum(1 for result in results if result["status"] == "ok")
+    return orjson.dumps({
+        "results": results,
+        "found_count": found_count,
+        "missing_count": len(results) - found_count,
+    })
+
+
+def get_box_cache_stats() -> dict:
+    cache = box_lookup_cache
+    lookups = cache.hits + cache.misses
+    return {
+        "entries": len(cache._entries),
+        "max_entries": cache.max_entries,
+        "ttl_seconds": cache.ttl_seconds,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "hit_ratio": cache.hits / lookups if lookups else 0.0,
+    }
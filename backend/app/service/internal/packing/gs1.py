@@ -0,0 +1,78 @@
+# file: app/service/internal/packing/gs1.py
+#
+# Perhitungan check digit GS1 (Modulo 10, bobot 3-1-3-1 dari kanan) untuk
+# BANYAK kode sekaligus pakai NumPy. Dipakai untuk rekonsiliasi scan SSCC
+# dan untuk generate SSCC satu manifest sekaligus.
+
+from typing import Dict, List, Sequence
+import numpy as np
+
+# Panjang kode GS1 yang kita kenal: GTIN-8, GTIN-12, GTIN-13, GTIN-14, SSCC-18
+GS1_CODE_LENGTHS = frozenset({8, 12, 13, 14, 18})
+
+_ASCII_ZERO = ord("0")
+
+
+def _weights(body_length: int) -> np.ndarray:
+    """Bobot 3-1-3-1... dihitung dari digit paling kanan body."""
+    from_right = np.arange(body_length)[::-1]
+    return np.where(from_right % 2 == 0, 3, 1).astype(np.int64)
+
+
+def _to_digit_matrix(codes: Sequence[str], length: int) -> np.ndarray:
+    """
+    Ubah list string dengan panjang SAMA jadi matriks (n, length) berisi nilai digit.
+    Karakter non-digit jadi nilai di luar 0..9, jadi bisa dideteksi pemanggil.
+    """
+    # latin-1 + replace menjamin 1 karakter = 1 byte, jadi reshape selalu pas
+    buffer = "".join(codes).encode("latin-1", errors="replace")
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(codes), length).astype(np.int16) - _ASCII_ZERO
+
+
+def _check_digits_from_matrix(body: np.ndarray) -> np.ndarray:
+    total = body.astype(np.int64) @ _weights(body.shape[1])
+    return (10 - total % 10) % 10
+
+
+def compute_check_digits(bodies: Sequence[str]) -> np.ndarray:
+    """
+    Menghitung check digit untuk banyak body kode sekaligus.
+    Semua body harus berisi digit dan panjangnya sama (mis. 17 digit untuk SSCC).
+    """
+    if not bodies:
+        return np.empty(0, dtype=np.int64)
+    length = len(bodies[0])
+    if any(len(body) != length for body in bodies):
+        raise ValueError("Semua body kode harus punya panjang yang sama.")
+    matrix = _to_digit_matrix(bodies, length)
+    if ((matrix < 0) | (matrix > 9)).any():
+        raise ValueError("Body kode hanya boleh berisi digit 0-9.")
+    return _check_digits_from_matrix(matrix)
+
+
+def append_check_digits(bodies: Sequence[str]) -> List[str]:
+    """Mengembalikan kode lengkap (body + check digit) untuk setiap body."""
+    check_digits = compute_check_digits(bodies)
+    return [f"{body}{digit}" for body, digit in zip(bodies, check_digits.tolist())]
+
+
+def validate_codes(codes: Sequence[str]) -> np.ndarray:
+    """
+    Validasi banyak kode GS1 lengkap sekaligus. Kode boleh campur panjang.
+    Mengembalikan array boolean yang urutannya sama dengan input.
+    Kode dengan panjang tidak dikenal atau berisi non-digit dianggap tidak valid.
+    """
+    valid = np.zeros(len(codes), dtype=bool)
+
+    indices_by_length: Dict[int, List[int]] = {}
+    for index, code in enumerate(codes):
+        if len(code) in GS1_CODE_LENGTHS:
+            indices_by_length.setdefault(len(code), []).append(index)
+
+    for length, indices in indices_by_length.items():
+        matrix = _to_digit_matrix([codes[i] for i in indices], length)
+        all_digits = ((matrix >= 0) & (matrix <= 9)).all(axis=1)
+        expected = _check_digits_from_matrix(matrix[:, :-1])
+        valid[indices] = all_digits & (expected == matrix[:, -1])
+
+    return valid
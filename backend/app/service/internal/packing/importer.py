@@ -0,0 +1,337 @@
+# file: app/service/internal/packing/importer.py
+#
+# Import massal manifest dari file partner (NDJSON atau CSV).
+# File dibaca per baris (stream), dikumpulkan per chunk manifest, lalu tiap chunk:
+#   1. resolve semua location public_id dalam SATU query,
+#   2. insert manifest multi-row ... RETURNING id,
+#   3. alokasi SSCC & id box sekaligus,
+#   4. box dan item masuk lewat COPY,
+#   5. rollup dashboard di-upsert sekali per chunk.
+# Memori hanya sebesar satu chunk + daftar error, berapapun ukuran filenya.
+# Tiap chunk punya session + transaksi sendiri: error DB di satu chunk hanya menggagalkan
+# chunk itu (baris-barisnya dilaporkan di `errors`), chunk lain tetap masuk.
+#
+# NDJSON: satu baris = satu body `POST /manifests` (PackingManifestCreate, pakai alias yang sama).
+# CSV   : satu baris = satu item, header wajib, kolom:
+#   manifest_ref, locations_id, tujuan_kirim, packing_slip, total_box,
+#   box_id, petugas, berat, product, batch, expire_date, quantity, unit
+#   Baris satu manifest harus berurutan (dikelompokkan per `manifest_ref`),
+#   field di dalam kutip tidak boleh berisi baris baru.
+
+import csv
+import enum
+import json
+import logging
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+from pydantic import ValidationError
+import psycopg
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import AsyncSessionLocal
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+from app.models.users.customer import Location
+from app.schema.internal.packing.packing_manifest import PackingManifestCreate
+from app.service.internal.file_lines import validation_detail
+from app.service.internal.packing import measures
+from app.service.internal.packing import stats as stats_service
+from app.service.internal.packing.packing import (
+    _generate_sscc_batch,
+    _generate_gtin8,
+    _process_shipping_address_for_label,
+)
+from app.service.internal.packing.sscc import sscc_serial_allocator
+from app.service.internal.user.public_ids import resolve_many
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 200
+
+CSV_COLUMNS = (
+    "manifest_ref", "locations_id", "tujuan_kirim", "packing_slip", "total_box",
+    "box_id", "petugas", "berat", "product", "batch", "expire_date", "quantity", "unit",
+)
+
+BOX_COPY_COLUMNS = ("id", "manifest_id", "box_number", "sscc", "gtin", "petugas", "berat", "berat_kg")
+ITEM_COPY_COLUMNS = ("box_id", "product", "batch", "expire_date", "quantity", "unit", "quantity_units", "expire_on")
+
+
+class ManifestImportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportReport:
+    """Ringkasan hasil import. Yang disimpan per baris hanya error-nya."""
+
+    def __init__(self):
+        self.imported_count = 0
+        self.box_count = 0
+        self.item_count = 0
+        self.errors: List[dict] = []
+        # Diisi kalau import dihentikan sebelum file habis (mis. serial SSCC habis)
+        self.stopped_reason: Optional[str] = None
+
+    def add_error(self, row: int, ref: Optional[str], detail: str) -> None:
+        self.errors.append({"row": row, "ref": ref, "detail": detail})
+
+    def as_dict(self) -> dict:
+        return {
+            "imported_count": self.imported_count,
+            "box_count": self.box_count,
+            "item_count": self.item_count,
+            "error_count": len(self.errors),
+            "errors": self.errors,
+            "stopped_reason": self.stopped_reason,
+        }
+
+
+# Record hasil parsing: (nomor baris, ref manifest, dict mentah ATAU pesan error)
+RawRecord = Tuple[int, Optional[str], object]
+
+
+# =============================================================================
+# PARSER RECORD
+# =============================================================================
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[RawRecord]:
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row, None, f"JSON tidak valid: {exc.msg}"
+            continue
+        content = raw.get("content") if isinstance(raw, dict) else None
+        ref = content.get("packing_slip") if isinstance(content, dict) else None
+        # ref masuk ke report (Optional[str]); packing_slip non-string tidak dipakai sebagai ref
+        if not isinstance(ref, str):
+            ref = None
+        yield row, ref, raw
+
+
+def _csv_manifest(rows: List[dict]) -> dict:
+    """Rakit baris-baris CSV satu manifest jadi dict berbentuk body `POST /manifests`."""
+    first = rows[0]
+    boxes = {}
+    for csv_row in rows:
+        box = boxes.setdefault(csv_row["box_id"], {
+            "id": csv_row["box_id"],
+            "petugas": csv_row["petugas"] or None,
+            "berat": csv_row["berat"] or None,
+            "items": [],
+        })
+        box["items"].append({
+            "product": csv_row["product"],
+            "batch": csv_row["batch"],
+            "expire_date": csv_row["expire_date"],
+            "quantity": csv_row["quantity"],
+            "unit": csv_row["unit"],
+        })
+    return {
+        "locations": {"locations_id": first["locations_id"], "tujuan_kirim": first["tujuan_kirim"]},
+        "content": {
+            "total_box": first["total_box"] or len(boxes),
+            "packing_slip": first["packing_slip"] or None,
+            "box_number": list(boxes.values()),
+        },
+    }
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[RawRecord]:
+    header: Optional[List[str]] = None
+    group: List[dict] = []
+    group_row, group_ref = 0, None
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            missing = [column for column in CSV_COLUMNS if column not in header]
+            if missing:
+                yield row, None, f"Header CSV tidak lengkap, kolom hilang: {', '.join(missing)}"
+                return
+            continue
+        if len(values) != len(header):
+            yield row, None, f"Jumlah kolom {len(values)}, seharusnya {len(header)}."
+            continue
+        csv_row = {column: value.strip() for column, value in zip(header, values)}
+        ref = csv_row["manifest_ref"]
+        if group and ref != group_ref:
+            yield group_row, group_ref, _csv_manifest(group)
+            group = []
+        if not group:
+            group_row, group_ref = row, ref
+        group.append(csv_row)
+    if group:
+        yield group_row, group_ref, _csv_manifest(group)
+
+
+# =============================================================================
+# LOADER PER CHUNK
+# =============================================================================
+
+async def _copy_rows(db: AsyncSession, table: str, columns: Tuple[str, ...], rows: Iterable[tuple]) -> None:
+    """COPY ... FROM STDIN lewat koneksi psycopg milik session (transaksi yang sama)."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    async with driver_connection.cursor() as cursor:
+        async with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                await copy.write_row(row)
+
+
+async def _insert_chunk(db: AsyncSession, valid: List[Tuple[int, PackingManifestCreate]]) -> Tuple[int, int]:
+    """Insert manifest + box + item + rollup untuk `valid` = [(location_id, payload)]. Hasil: (box, item)."""
+    manifest_rows = []
+    for location_id, payload in valid:
+        manifest = PackingManifest(
+            location_id=location_id,
+            tujuan_kirim=payload.locations.tujuan_kirim,
+            packing_slip=payload.content.packing_slip,
+            total_boxes=payload.content.total_box,
+            shipping_address_details=payload.locations.model_dump(mode='json'),
+        )
+        manifest_rows.append({
+            "location_id": manifest.location_id,
+            "tujuan_kirim": manifest.tujuan_kirim,
+            "packing_slip": manifest.packing_slip,
+            "total_boxes": manifest.total_boxes,
+            "shipping_address_details": manifest.shipping_address_details,
+            "label_address": _process_shipping_address_for_label(manifest).model_dump(),
+        })
+    result = await db.execute(
+        insert(PackingManifest).returning(PackingManifest.id, sort_by_parameter_order=True),
+        manifest_rows,
+    )
+    manifest_ids = result.scalars().all()
+
+    box_count = sum(len(payload.content.boxes) for _, payload in valid)
+    item_count = 0
+    if box_count:
+        serials = await sscc_serial_allocator.allocate(db, box_count)
+        ssccs = _generate_sscc_batch(serials)
+        gtin = _generate_gtin8()
+        # Id box diambil duluan dari sequence supaya item bisa di-COPY tanpa RETURNING
+        box_ids = (await db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('packed_boxes', 'id')) FROM generate_series(1, :n)"),
+            {"n": box_count},
+        )).scalars().all()
+
+        box_copy_rows, item_copy_rows = [], []
+        box_index = 0
+        for manifest_id, (_, payload) in zip(manifest_ids, valid):
+            for box_data in payload.content.boxes:
+                box_id = box_ids[box_index]
+                box_copy_rows.append((
+                    box_id, manifest_id, box_data.box_number, ssccs[box_index], gtin,
+                    box_data.petugas, box_data.berat, measures.parse_weight_kg(box_data.berat),
+                ))
+                for item_data in box_data.items:
+                    typed = measures.typed_item_values(item_data.quantity, item_data.expire_date)
+                    item_copy_rows.append((
+                        box_id, item_data.product, item_data.batch, item_data.expire_date,
+                        item_data.quantity, item_data.unit, typed["quantity_units"], typed["expire_on"],
+                    ))
+                box_index += 1
+
+        await _copy_rows(db, PackedBox.__tablename__, BOX_COPY_COLUMNS, box_copy_rows)
+        await _copy_rows(db, PackedItem.__tablename__, ITEM_COPY_COLUMNS, item_copy_rows)
+        item_count = len(item_copy_rows)
+
+    await stats_service.record_manifests(db, valid)
+    return box_count, item_count
+
+
+async def _load_chunk(
+    chunk: List[Tuple[int, Optional[str], PackingManifestCreate]], report: ImportReport, dry_run: bool
+) -> None:
+    """Satu chunk = satu session + satu transaksi. Gagal di DB -> seluruh chunk dilaporkan gagal."""
+    valid: List[Tuple[int, Optional[str], int, PackingManifestCreate]] = []
+    async with AsyncSessionLocal() as session:
+        try:
+            # Location yang sudah pernah di-resolve tidak di-query lagi (LRU public_id)
+            location_id_by_public_id = await resolve_many(
+                session, Location, (payload.locations.location_public_id for _, _, payload in chunk)
+            )
+
+            for row, ref, payload in chunk:
+                location_id = location_id_by_public_id.get(payload.locations.location_public_id)
+                if location_id is None:
+                    report.add_error(row, ref, f"Location with public_id {payload.locations.location_public_id} not found.")
+                    continue
+                valid.append((row, ref, location_id, payload))
+            if not valid:
+                await session.rollback()
+                return
+            box_count, item_count = await _insert_chunk(
+                session, [(location_id, payload) for _, _, location_id, payload in valid]
+            )
+            if dry_run:
+                await session.rollback()
+            else:
+                await session.commit()
+        except (SQLAlchemyError, psycopg.Error) as exc:
+            # Mis. angka di luar jangkauan kolom, atau constraint yang ditolak di tengah COPY
+            await session.rollback()
+            logger.warning("Chunk import manifest gagal: %s", exc)
+            detail = f"Chunk gagal disimpan, tidak ada yang masuk: {getattr(exc, 'orig', None) or exc}"
+            for row, ref, *_ in valid or chunk:
+                report.add_error(row, ref, detail)
+            return
+        except ValueError as exc:
+            # Ruang serial SSCC habis (`_sscc_body`): chunk berikutnya pasti gagal juga, jadi berhenti
+            await session.rollback()
+            logger.error("Import manifest dihentikan: %s", exc)
+            for row, ref, *_ in valid or chunk:
+                report.add_error(row, ref, f"Chunk gagal disimpan, tidak ada yang masuk: {exc}")
+            report.stopped_reason = f"{exc} Baris setelah baris {chunk[-1][0]} tidak diproses."
+            return
+    report.imported_count += len(valid)
+    report.box_count += box_count
+    report.item_count += item_count
+
+
+async def import_manifests(
+    lines: AsyncIterator[str],
+    file_format: ManifestImportFormat,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> ImportReport:
+    """
+    Import manifest dari baris-baris file. Baris yang gagal (format, skema, lokasi tidak
+    dikenal, chunk yang ditolak DB) dicatat di report dan dilewati; sisanya tetap masuk.
+    Transaksi diatur per chunk di sini, jadi tidak menerima session dari pemanggil.
+    `dry_run=True`: semua chunk di-ROLLBACK (cek error saja).
+    Kalau import harus berhenti di tengah, chunk yang sudah commit tetap tersimpan dan
+    alasannya ada di `report.stopped_reason`.
+    """
+    records = _ndjson_records(lines) if file_format == ManifestImportFormat.NDJSON else _csv_records(lines)
+    report = ImportReport()
+    chunk: List[Tuple[int, Optional[str], PackingManifestCreate]] = []
+    async for row, ref, raw in records:
+        if isinstance(raw, str):
+            report.add_error(row, ref, raw)
+            continue
+        try:
+            payload = PackingManifestCreate.model_validate(raw)
+        except ValidationError as exc:
+            report.add_error(row, ref, validation_detail(exc))
+            continue
+        chunk.append((row, ref or payload.content.packing_slip, payload))
+        if len(chunk) >= chunk_size:
+            await _load_chunk(chunk, report, dry_run)
+            chunk = []
+            if report.stopped_reason:
+                return report
+    if chunk:
+        await _load_chunk(chunk, report, dry_run)
+    return report
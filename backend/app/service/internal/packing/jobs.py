@@ -0,0 +1,237 @@
+# file: app/service/internal/packing/jobs.py
+#
+# Pembuatan manifest besar secara async (POST /manifests?async=true).
+# - Request cuma validasi + simpan payload ke `packing_manifest_jobs` (202 + job id).
+# - Tiap proses API menjalankan pool worker kecil (MANIFEST_JOB_WORKERS) yang
+#   meng-claim job pakai `FOR UPDATE SKIP LOCKED`, jadi banyak proses/worker
+#   tidak akan pernah mengambil job yang sama.
+# - Manifest + status `done` di-commit di SATU transaksi; progres box ditulis lewat
+#   transaksi pendek terpisah supaya bisa dibaca endpoint status selama proses.
+# - Job `running` yang heartbeat-nya basi (worker mati) diambil ulang, maksimal MAX_ATTEMPTS.
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import update, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException
+from app.database.database import AsyncSessionLocal
+from app.models.packing.job import PackingManifestJob, ManifestJobStatus
+from app.models.packing.manifest import PackingManifest
+from app.models.users.customer import Location
+from app.schema.internal.packing.packing_manifest import PackingManifestCreate
+from app.service.internal.user.public_ids import resolve_id
+from app.service.internal.packing import packing as packing_service
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Progres (dan heartbeat) ditulis setiap chunk box sebanyak ini
+JOB_BOX_CHUNK_SIZE = 200
+
+
+# =============================================================================
+# API SERVICE (dipanggil router)
+# =============================================================================
+
+async def enqueue_manifest_job(db: AsyncSession, payload: PackingManifestCreate) -> PackingManifestJob:
+    """Simpan payload yang sudah valid ke antrian. Lokasi dicek di sini supaya salah input langsung 404."""
+    await resolve_id(db, Location, payload.locations.location_public_id)
+    job = PackingManifestJob(
+        status=ManifestJobStatus.QUEUED.value,
+        payload=payload.model_dump(mode='json', by_alias=True),
+        total_boxes=len(payload.content.boxes),
+        processed_boxes=0,
+        attempts=0,
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job
+
+async def get_manifest_job(db: AsyncSession, public_id: uuid.UUID) -> dict:
+    """Status satu job, plus public_id manifest kalau sudah selesai."""
+    result = await db.execute(
+        select(PackingManifestJob, PackingManifest.public_id)
+        .outerjoin(PackingManifest, PackingManifest.id == PackingManifestJob.manifest_id)
+        .where(PackingManifestJob.public_id == public_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise NotFoundException(f"Manifest job with public_id {public_id} not found.")
+    job, manifest_public_id = row
+    return job_to_dict(job, manifest_public_id)
+
+def job_to_dict(job: PackingManifestJob, manifest_public_id: Optional[uuid.UUID] = None) -> dict:
+    if job.total_boxes:
+        progress = job.processed_boxes / job.total_boxes
+    else:
+        progress = 1.0 if job.status == ManifestJobStatus.DONE.value else 0.0
+    return {
+        "public_id": job.public_id,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "status": job.status,
+        "total_boxes": job.total_boxes,
+        "processed_boxes": job.processed_boxes,
+        "progress": progress,
+        "attempts": job.attempts,
+        "error": job.error,
+        "manifest_public_id": manifest_public_id,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+async def _claim_job(worker_id: str) -> Optional[tuple]:
+    """Ambil satu job (transaksi pendek). Mengembalikan (id, payload, total_boxes) atau None."""
+    stale_before = func.now() - func.make_interval(0, 0, 0, 0, 0, 0, settings.MANIFEST_JOB_STALE_SECONDS)
+    is_stale = and_(
+        PackingManifestJob.status == ManifestJobStatus.RUNNING.value,
+        PackingManifestJob.heartbeat_at < stale_before,
+    )
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            # Job yang workernya mati berkali-kali: berhenti dicoba
+            await session.execute(
+                update(PackingManifestJob)
+                .where(is_stale, PackingManifestJob.attempts >= MAX_ATTEMPTS)
+                .values(
+                    status=ManifestJobStatus.FAILED.value,
+                    error="Worker berhenti di tengah proses terlalu sering.",
+                    finished_at=func.now(),
+                )
+            )
+            candidate = (
+                select(PackingManifestJob.id)
+                .where(or_(PackingManifestJob.status == ManifestJobStatus.QUEUED.value, is_stale))
+                .order_by(PackingManifestJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                update(PackingManifestJob)
+                .where(PackingManifestJob.id == candidate)
+                .values(
+                    status=ManifestJobStatus.RUNNING.value,
+                    locked_by=worker_id,
+                    attempts=PackingManifestJob.attempts + 1,
+                    processed_boxes=0,
+                    error=None,
+                    started_at=func.now(),
+                    heartbeat_at=func.now(),
+                )
+                .returning(PackingManifestJob.id, PackingManifestJob.payload, PackingManifestJob.total_boxes)
+            )
+            return result.one_or_none()
+
+async def _update_own_job(job_id: int, worker_id: str, **values) -> int:
+    """UPDATE job di transaksi sendiri, hanya kalau job masih dipegang worker ini."""
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            result = await session.execute(
+                update(PackingManifestJob)
+                .where(PackingManifestJob.id == job_id, PackingManifestJob.locked_by == worker_id)
+                .values(**values)
+            )
+            return result.rowcount
+
+async def _process_job(job_id: int, payload_data: dict, total_boxes: int, worker_id: str) -> None:
+    async def report_progress(processed_boxes: int) -> None:
+        await _update_own_job(job_id, worker_id, processed_boxes=processed_boxes, heartbeat_at=func.now())
+
+    try:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                payload = PackingManifestCreate.model_validate(payload_data)
+                manifest_id = await packing_service.insert_manifest_bulk(
+                    session, payload, box_chunk_size=JOB_BOX_CHUNK_SIZE, on_progress=report_progress
+                )
+                # Status `done` ikut transaksi manifest: keduanya commit, atau keduanya batal
+                result = await session.execute(
+                    update(PackingManifestJob)
+                    .where(PackingManifestJob.id == job_id, PackingManifestJob.locked_by == worker_id)
+                    .values(
+                        status=ManifestJobStatus.DONE.value,
+                        manifest_id=manifest_id,
+                        processed_boxes=total_boxes,
+                        finished_at=func.now(),
+                    )
+                )
+                if result.rowcount != 1:
+                    # Job sudah diambil ulang worker lain (kita dianggap mati), batalkan hasil kita
+                    raise RuntimeError(f"Job {job_id} tidak lagi dipegang {worker_id}.")
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        logger.exception("Manifest job %s gagal", job_id)
+        await _update_own_job(
+            job_id, worker_id,
+            status=ManifestJobStatus.FAILED.value,
+            error=str(detail)[:2000],
+            finished_at=func.now(),
+        )
+
+
+class ManifestJobWorkerPool:
+    """Sejumlah kecil task asyncio per proses. Jumlahnya = batas koneksi DB yang dipakai job."""
+
+    def __init__(self, size: int, poll_seconds: float):
+        self.size = size
+        self.poll_seconds = poll_seconds
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._stopping = False
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._run(f"{prefix}:{n}")) for n in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Dipanggil setelah enqueue supaya job langsung diambil tanpa menunggu poll berikutnya."""
+        self._wakeup.set()
+
+    async def _run(self, worker_id: str) -> None:
+        while not self._stopping:
+            try:
+                claimed = await _claim_job(worker_id)
+                if claimed is not None:
+                    await _process_job(claimed.id, claimed.payload, claimed.total_boxes, worker_id)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Worker job manifest %s error", worker_id)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+manifest_job_pool = ManifestJobWorkerPool(
+    size=settings.MANIFEST_JOB_WORKERS,
+    poll_seconds=settings.MANIFEST_JOB_POLL_SECONDS,
+)
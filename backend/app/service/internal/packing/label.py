@@ -0,0 +1,161 @@
+# file: app/service/internal/packing/label.py
+#
+# Mesin render label ZPL di server. Template di-compile SEKALI jadi potongan
+# literal + nama field, jadi render per box cuma join string tanpa parsing ulang.
+
+import os
+from string import Formatter
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.configuration.type import DocumentType
+from app.models.packing.manifest import PackingManifest, PackedBox
+from app.schema.internal.packing.packing_manifest import LabelAddressData
+
+# Nama DocumentType yang template_path-nya (kalau diisi) menimpa template bawaan
+SHIPPING_LABEL_DOCUMENT_TYPE = "SHIPPING_LABEL_ZPL"
+
+# Maksimal produk per box (aturan bisnis), jadi slot item di label juga 6
+MAX_ITEMS_PER_LABEL = 6
+
+LABEL_FIELDS = frozenset(
+    [
+        "sscc", "gtin", "box_number", "total_boxes", "packing_slip", "tujuan_kirim",
+        "line_1", "line_2", "line_3", "city", "province", "pic_contact",
+        "petugas", "berat",
+    ]
+    + [f"item_{n}" for n in range(1, MAX_ITEMS_PER_LABEL + 1)]
+)
+
+# Label 100x150 mm @ 203 dpi. Semua ^FD didahului ^FH supaya karakter ^ ~ _ di data aman.
+DEFAULT_SHIPPING_LABEL_TEMPLATE = """^XA
+^CI28
+^PW812
+^LL1218
+^FO40,40^A0N,40,40^FH^FD{tujuan_kirim}^FS
+^FO40,95^A0N,28,28^FH^FD{line_1}^FS
+^FO40,130^A0N,28,28^FH^FD{line_2}^FS
+^FO40,165^A0N,28,28^FH^FD{line_3}^FS
+^FO40,200^A0N,28,28^FH^FD{city}, {province}^FS
+^FO40,235^A0N,28,28^FH^FDPIC: {pic_contact}^FS
+^FO40,285^GB732,3,3^FS
+^FO40,305^A0N,30,30^FH^FDPacking Slip: {packing_slip}^FS
+^FO40,345^A0N,30,30^FH^FDBox {box_number} / {total_boxes}^FS
+^FO420,345^A0N,30,30^FH^FDBerat: {berat}^FS
+^FO40,385^A0N,26,26^FH^FDPetugas: {petugas}^FS
+^FO40,425^GB732,3,3^FS
+^FO40,445^A0N,24,24^FH^FD{item_1}^FS
+^FO40,480^A0N,24,24^FH^FD{item_2}^FS
+^FO40,515^A0N,24,24^FH^FD{item_3}^FS
+^FO40,550^A0N,24,24^FH^FD{item_4}^FS
+^FO40,585^A0N,24,24^FH^FD{item_5}^FS
+^FO40,620^A0N,24,24^FH^FD{item_6}^FS
+^FO40,670^GB732,3,3^FS
+^FO80,700^BY3^BCN,220,Y,N,N^FH^FD>;>800{sscc}^FS
+^FO40,1010^A0N,24,24^FH^FDGTIN: {gtin}^FS
+^XZ
+"""
+
+
+def _zpl_escape(value: str) -> str:
+    """Escape data field untuk ^FH (hex indicator default '_')."""
+    return value.replace("_", "_5F").replace("^", "_5E").replace("~", "_7E")
+
+
+class CompiledLabelTemplate:
+    """
+    Template ZPL yang sudah di-parse. Placeholder pakai sintaks `{nama_field}`
+    dan harus salah satu dari `LABEL_FIELDS`; field asing ditolak saat compile,
+    bukan saat mencetak.
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, source: str):
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field_name, _format_spec, _conversion in Formatter().parse(source):
+            if field_name is not None and field_name not in LABEL_FIELDS:
+                raise ValueError(f"Field label '{field_name}' tidak dikenal.")
+            parts.append((literal, field_name))
+        self._parts = tuple(parts)
+
+    def render(self, context: Mapping[str, str]) -> str:
+        chunks = []
+        for literal, field_name in self._parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(_zpl_escape(context.get(field_name, "")))
+        return "".join(chunks)
+
+
+# Template bawaan di-compile sekali waktu modul di-import (startup)
+DEFAULT_SHIPPING_LABEL = CompiledLabelTemplate(DEFAULT_SHIPPING_LABEL_TEMPLATE)
+
+# Cache template dari file: path -> (mtime, template)
+_compiled_file_templates: Dict[str, Tuple[float, CompiledLabelTemplate]] = {}
+
+
+def _compile_template_file(path: str) -> CompiledLabelTemplate:
+    """Compile template dari file, di-cache per path dan di-compile ulang hanya kalau file berubah."""
+    mtime = os.path.getmtime(path)
+    cached = _compiled_file_templates.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding="utf-8") as template_file:
+        template = CompiledLabelTemplate(template_file.read())
+    _compiled_file_templates[path] = (mtime, template)
+    return template
+
+
+async def get_shipping_label_template(db: AsyncSession) -> CompiledLabelTemplate:
+    """
+    Ambil template label pengiriman. Kalau DocumentType `SHIPPING_LABEL_ZPL`
+    punya `template_path` yang valid, pakai file itu; kalau tidak, pakai template bawaan.
+    """
+    result = await db.execute(
+        select(DocumentType.template_path).where(DocumentType.name == SHIPPING_LABEL_DOCUMENT_TYPE)
+    )
+    template_path = result.scalar_one_or_none()
+    if template_path and os.path.isfile(template_path):
+        return _compile_template_file(template_path)
+    return DEFAULT_SHIPPING_LABEL
+
+
+def _item_line(item) -> str:
+    return f"{item.product} | {item.batch} | ED {item.expire_date} | {item.quantity} {item.unit}"
+
+
+def render_manifest_labels(
+    manifest: PackingManifest,
+    address: LabelAddressData,
+    template: CompiledLabelTemplate,
+) -> Iterator[str]:
+    """
+    Generator: satu label ZPL per PackedBox. Bagian yang sama untuk semua box
+    (alamat, packing slip) disiapkan sekali; dokumen utuh tidak pernah dirakit di memori.
+    """
+    manifest_context = {
+        "total_boxes": str(manifest.total_boxes),
+        "packing_slip": manifest.packing_slip or "",
+        "tujuan_kirim": manifest.tujuan_kirim or "",
+        "line_1": address.line_1,
+        "line_2": address.line_2 or "",
+        "line_3": address.line_3 or "",
+        "city": address.city,
+        "province": address.province,
+        "pic_contact": address.pic_contact,
+    }
+    boxes: List[PackedBox] = sorted(manifest.packed_boxes, key=lambda box: box.box_number)
+    for box in boxes:
+        context = dict(manifest_context)
+        context.update(
+            sscc=box.sscc,
+            gtin=box.gtin,
+            box_number=str(box.box_number),
+            petugas=box.petugas or "",
+            berat=box.berat or "",
+        )
+        for n, item in enumerate(box.packed_items[:MAX_ITEMS_PER_LABEL], start=1):
+            context[f"item_{n}"] = _item_line(item)
+        yield template.render(context)
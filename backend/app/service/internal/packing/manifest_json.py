@@ -0,0 +1,142 @@
+# file: app/service/internal/packing/manifest_json.py
+#
+# Jalur cepat serialisasi manifest: proyeksi kolom lewat Core `select()`,
+# dirakit jadi dict biasa lalu langsung di-dump ke bytes JSON pakai orjson.
+# Tidak ada objek ORM, tidak ada validasi Pydantic dua kali (from_attributes + response_model).
+#
+# Bentuk & urutan key HARUS sama persis dengan `PackingManifestResponse`
+# (FeResBase: created_at, updated_at, public_id, lalu field milik skema).
+
+import uuid
+from typing import Dict, List, Optional, Tuple
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+from app.models.users.customer import Location
+from app.core.exceptions import NotFoundException
+from app.service.internal.packing.packing import _latest_manifests_page_query, _split_page
+
+# OPT_UTC_Z: datetime UTC ditulis "...Z", sama seperti output Pydantic v2
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+async def _manifest_dicts(db: AsyncSession, manifest_ids: List[int]) -> List[dict]:
+    """
+    Rakit list dict `PackingManifestResponse` untuk `manifest_ids` (urutan dipertahankan).
+    Tepat 3 query (manifest, box, item) berapapun jumlah manifest-nya.
+    """
+    if not manifest_ids:
+        return []
+
+    manifest_rows = (await db.execute(
+        select(
+            PackingManifest.id,
+            PackingManifest.created_at,
+            PackingManifest.updated_at,
+            PackingManifest.public_id,
+            Location.public_id.label("location_public_id"),
+            PackingManifest.tujuan_kirim,
+            PackingManifest.packing_slip,
+            PackingManifest.total_boxes,
+        )
+        .join(Location, Location.id == PackingManifest.location_id)
+        .where(PackingManifest.id.in_(manifest_ids))
+    )).all()
+
+    box_rows = (await db.execute(
+        select(
+            PackedBox.id,
+            PackedBox.manifest_id,
+            PackedBox.created_at,
+            PackedBox.updated_at,
+            PackedBox.public_id,
+            PackedBox.box_number,
+            PackedBox.sscc,
+            PackedBox.gtin,
+            PackedBox.petugas,
+            PackedBox.berat,
+        )
+        .where(PackedBox.manifest_id.in_(manifest_ids))
+        .order_by(PackedBox.id)
+    )).all()
+
+    item_rows = (await db.execute(
+        select(
+            PackedItem.box_id,
+            PackedItem.product,
+            PackedItem.batch,
+            PackedItem.expire_date,
+            PackedItem.quantity,
+            PackedItem.unit,
+        )
+        .join(PackedBox, PackedBox.id == PackedItem.box_id)
+        .where(PackedBox.manifest_id.in_(manifest_ids))
+        .order_by(PackedItem.id)
+    )).all()
+
+    items_by_box: Dict[int, List[dict]] = {}
+    for item in item_rows:
+        items_by_box.setdefault(item.box_id, []).append({
+            "product": item.product,
+            "batch": item.batch,
+            "expire_date": item.expire_date,
+            "quantity": item.quantity,
+            "unit": item.unit,
+        })
+
+    boxes_by_manifest: Dict[int, List[dict]] = {}
+    for box in box_rows:
+        boxes_by_manifest.setdefault(box.manifest_id, []).append({
+            "created_at": box.created_at,
+            "updated_at": box.updated_at,
+            "public_id": box.public_id,
+            "box_number": box.box_number,
+            "sscc": box.sscc,
+            "gtin": box.gtin,
+            "petugas": box.petugas,
+            "berat": box.berat,
+            "packed_items": items_by_box.get(box.id, []),
+        })
+
+    manifests_by_id = {
+        row.id: {
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "public_id": row.public_id,
+            "location_public_id": row.location_public_id,
+            "tujuan_kirim": row.tujuan_kirim,
+            "packing_slip": row.packing_slip,
+            "total_boxes": row.total_boxes,
+            "packed_boxes": boxes_by_manifest.get(row.id, []),
+        }
+        for row in manifest_rows
+    }
+    return [manifests_by_id[manifest_id] for manifest_id in manifest_ids if manifest_id in manifests_by_id]
+
+
+async def get_latest_manifests_json(
+    db: AsyncSession, limit: int = 25, cursor: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Sama dengan `get_latest_manifests` + serialisasi router, tapi langsung jadi bytes JSON.
+    Mengembalikan (body, next_cursor).
+    """
+    page_query = _latest_manifests_page_query(limit, cursor).with_only_columns(
+        PackingManifest.id, PackingManifest.created_at
+    )
+    page, next_cursor = _split_page((await db.execute(page_query)).all(), limit)
+    manifests = await _manifest_dicts(db, [row.id for row in page])
+    return orjson.dumps(manifests, option=ORJSON_OPTIONS), next_cursor
+
+
+async def get_manifest_json_by_public_id(db: AsyncSession, public_id: uuid.UUID) -> bytes:
+    """Sama dengan `get_manifest_by_public_id` + serialisasi router, tapi langsung jadi bytes JSON."""
+    manifest_id = (await db.execute(
+        select(PackingManifest.id).where(PackingManifest.public_id == public_id)
+    )).scalar_one_or_none()
+    if manifest_id is None:
+        raise NotFoundException(f"Packing Manifest with public_id {public_id} not found.")
+    manifests = await _manifest_dicts(db, [manifest_id])
+    return orjson.dumps(manifests[0], option=ORJSON_OPTIONS)
@@ -0,0 +1,90 @@
+# file: app/service/internal/packing/measures.py
+#
+# Parsing kolom teks dari form packing ke kolom bertipe:
+#   PackedItem.quantity    -> quantity_units (BIGINT)
+#   PackedItem.expire_date -> expire_on      (DATE)
+#   PackedBox.berat        -> berat_kg       (NUMERIC)
+# Dipakai saat create (ORM & bulk), import, dan backfill supaya aturannya satu.
+# Teks yang tidak bisa dibaca -> None (kolom teks aslinya tetap disimpan apa adanya).
+# Angka di luar jangkauan kolomnya juga -> None, supaya tidak overflow saat insert.
+
+import calendar
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+# Bilangan bulat saja, boleh pakai titik ribuan, boleh diikuti satuan ("1.000 pcs", "12 box").
+# "2 x 10" / "1,5" / "1.5" tidak cocok -> None, bukan digit yang digabung jadi 210 / 15.
+# Polanya dipakai juga oleh `stats._UNITS_SQL` (regex PostgreSQL), jadi hanya pakai sintaks yang sama di keduanya.
+QUANTITY_PATTERN = r"^\s*(\d{1,3}(?:\.\d{3})+|\d+)\s*\D*$"
+_QUANTITY = re.compile(QUANTITY_PATTERN, re.ASCII)
+_WEIGHT = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*(kg|g|gr|gram)?\s*$", re.IGNORECASE)
+
+# Format ED yang pernah muncul di form: tanggal lengkap, atau bulan saja (-> akhir bulan)
+_FULL_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+_MONTH_FORMATS = ("%Y-%m", "%m/%Y", "%m-%Y", "%b %Y", "%B %Y")
+
+# BIGINT muat semua angka 18 digit (maks 9.223.372.036.854.775.807); dipakai juga oleh `stats._UNITS_SQL`
+MAX_QUANTITY_DIGITS = 18
+# Batas PackedBox.berat_kg NUMERIC(10, 3)
+MAX_WEIGHT_KG = Decimal("9999999.999")
+
+
+def parse_quantity_units(quantity: Optional[str]) -> Optional[int]:
+    """"1.000 pcs" -> 1000. None kalau bukan QUANTITY_PATTERN atau tidak muat di BIGINT."""
+    match = _QUANTITY.match(quantity or "")
+    if not match:
+        return None
+    digits = match.group(1).replace(".", "")
+    if len(digits.lstrip("0")) > MAX_QUANTITY_DIGITS:
+        return None
+    return int(digits)
+
+
+def parse_units(quantity: Optional[str]) -> int:
+    """Seperti `parse_quantity_units`, tapi 0 kalau tidak terbaca. Harus sama dengan `stats._UNITS_SQL`."""
+    return parse_quantity_units(quantity) or 0
+
+
+def parse_weight_kg(berat: Optional[str]) -> Optional[Decimal]:
+    """'25 kg' / '15,5' / '500 g' -> Decimal dalam kg. Tanpa satuan dianggap kg."""
+    match = _WEIGHT.match(berat or "")
+    if not match:
+        return None
+    try:
+        value = Decimal(match.group(1).replace(",", "."))
+        unit = (match.group(2) or "kg").lower()
+        if unit != "kg":
+            value = value / 1000
+        value = value.quantize(Decimal("0.001"))
+    except InvalidOperation:
+        # Angka terlalu panjang untuk presisi Decimal
+        return None
+    return value if value <= MAX_WEIGHT_KG else None
+
+
+def parse_expire_on(expire_date: Optional[str]) -> Optional[date]:
+    """'2027-03-31', '31/03/2027', '03/2027', 'Mar 2027' -> date (bulan saja = tanggal terakhir)."""
+    text = (expire_date or "").strip()
+    if not text:
+        return None
+    for fmt in _FULL_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    for fmt in _MONTH_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return date(parsed.year, parsed.month, calendar.monthrange(parsed.year, parsed.month)[1])
+    return None
+
+
+def typed_item_values(quantity: Optional[str], expire_date: Optional[str]) -> dict:
+    return {
+        "quantity_units": parse_quantity_units(quantity),
+        "expire_on": parse_expire_on(expire_date),
+    }
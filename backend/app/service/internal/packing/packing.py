@@ -1,17 +1,35 @@
 # file: app/services/packing_service.py
 
+import base64
+import json
 import uuid
-from typing import List
+from datetime import datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import insert, update, event, inspect, any_, bindparam, String, func, distinct, tuple_, or_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
 from app.schema.internal.packing.packing_manifest import PackingManifestCreate
-from app.service.internal.user.customer import _get_location_by_public_id
+from app.service.internal.user.public_ids import resolve_id
 from app.core.exceptions import BadRequestException, NotFoundException
 from app.schema.internal.packing.packing_manifest import LabelAddressData # Impor skema baru
 from app.models.users.customer import Location
+from app.service.internal.packing import gs1
+from app.service.internal.packing.box_cache import mark_boxes_changed, mark_manifests_changed
+from app.service.internal.packing import measures
+from app.service.internal.packing import label as label_service
+from app.service.internal.packing import stats as stats_service
+from app.service.internal.packing.sscc import (
+    sscc_serial_allocator,
+    SSCC_EXTENSION_DIGIT,
+    SSCC_COMPANY_PREFIX,
+    SSCC_SERIAL_DIGITS,
+    SSCC_MAX_SERIAL,
+)
 
 
 # --- FUNGSI HELPER UNTUK GENERATOR ID ---
@@ -26,18 +44,27 @@ def _calculate_check_digit(number_string: str) -> int:
     check_digit = (10 - (total % 10)) % 10
     return check_digit
 
-def _generate_sscc(box_id: int) -> str:
-    """Generate SSCC-18 berdasarkan ID unik dari kotak."""
-    extension_digit = "1"
-    company_prefix = "8994957"
-    serial_reference = str(box_id).zfill(9)
-    
-    sscc_17_digits = f"{extension_digit}{company_prefix}{serial_reference}"
+def _sscc_body(serial: int) -> str:
+    """17 digit pertama SSCC (tanpa check digit) untuk satu serial."""
+    if not 0 < serial <= SSCC_MAX_SERIAL:
+        # Jangan pernah dipotong diam-diam, nanti SSCC-nya bisa dobel
+        raise ValueError(f"Serial SSCC {serial} di luar rentang 1..{SSCC_MAX_SERIAL}.")
+    serial_reference = str(serial).zfill(SSCC_SERIAL_DIGITS)
+    return f"{SSCC_EXTENSION_DIGIT}{SSCC_COMPANY_PREFIX}{serial_reference}"
+
+def _generate_sscc(serial: int) -> str:
+    """Generate SSCC-18 dari serial yang dialokasikan `sscc_serial_allocator`."""
+    sscc_17_digits = _sscc_body(serial)
     
     check_digit = _calculate_check_digit(sscc_17_digits)
     
     return f"{sscc_17_digits}{check_digit}"
 
+def _generate_sscc_batch(serials: List[int]) -> List[str]:
+    """Sama dengan `_generate_sscc`, tapi check digit semua box dihitung sekaligus (NumPy)."""
+    return gs1.append_check_digits([_sscc_body(serial) for serial in serials])
+
+@lru_cache(maxsize=None)
 def _generate_gtin8() -> str:
     """Generate GTIN-8 statis."""
     indicator_digit = "1"
@@ -55,103 +82,245 @@ def _generate_gtin8() -> str:
 # --- FUNGSI SERVICE UTAMA ---
 
 async def create_packing_manifest(db: AsyncSession, payload: PackingManifestCreate) -> PackingManifest:
-    location = await _get_location_by_public_id(db, payload.locations.location_public_id)
+    # Cukup id location (FK); dari cache public_id kalau sudah pernah di-resolve
+    location_id = await resolve_id(db, Location, payload.locations.location_public_id)
     
     new_manifest = PackingManifest(
-        location_id=location.id,
+        location_id=location_id,
         tujuan_kirim=payload.locations.tujuan_kirim,
         packing_slip=payload.content.packing_slip,
         total_boxes=payload.content.total_box,
         shipping_address_details=payload.locations.model_dump(mode='json')
     )
+    # Alamat label diolah SEKALI di sini, print-data tinggal baca kolomnya
+    new_manifest.label_address = _process_shipping_address_for_label(new_manifest).model_dump()
     db.add(new_manifest)
     await db.flush() # Flush untuk mendapatkan manifest.id
 
-    for box_data in payload.content.boxes:
-        # Buat dulu objek box tanpa SSCC/GTIN
+    # Serial SSCC diambil dari blok yang di-lease worker, nggak perlu flush per box lagi
+    serials = await sscc_serial_allocator.allocate(db, len(payload.content.boxes))
+
+    ssccs = _generate_sscc_batch(serials)
+
+    for sscc, box_data in zip(ssccs, payload.content.boxes):
         new_box = PackedBox(
             manifest_id=new_manifest.id,
             box_number=box_data.box_number,
             petugas=box_data.petugas,
             berat=box_data.berat,
-            sscc="", # Placeholder
-            gtin=""  # Placeholder
+            berat_kg=measures.parse_weight_kg(box_data.berat),
+            sscc=sscc,
+            gtin=_generate_gtin8(),
+            packed_items=[
+                PackedItem(
+                    **item_data.model_dump(),
+                    **measures.typed_item_values(item_data.quantity, item_data.expire_date),
+                )
+                for item_data in box_data.items
+            ]
         )
         db.add(new_box)
-        await db.flush() # Flush untuk mendapatkan new_box.id yang unik
-
-        # SEKARANG BARU GENERATE SSCC PAKE ID YANG UDAH PASTI UNIK
-        new_box.sscc = _generate_sscc(new_box.id)
-        new_box.gtin = _generate_gtin8()
-        
-        for item_data in box_data.items:
-            new_item = PackedItem(
-                box_id=new_box.id,
-                **item_data.model_dump()
-            )
-            db.add(new_item)
             
     await db.flush()
+
+    # Rollup dashboard ikut di transaksi yang sama
+    await stats_service.record_manifest(db, location_id, payload)
     
-    # Eager load semua relasi untuk response
+    return await _load_manifest_for_response(db, new_manifest.id)
+
+async def create_packing_manifest_bulk(db: AsyncSession, payload: PackingManifestCreate) -> PackingManifest:
+    """
+    Versi bulk dari `create_packing_manifest` dengan hasil yang identik
+    (format SSCC sama, response nested sama), tapi jumlah round trip ke DB tetap
+    berapapun jumlah box-nya:
+    - Serial SSCC diambil dari `sscc_serial_allocator` (di memori, tanpa query per box).
+    - Semua box masuk lewat SATU INSERT multi-row ... RETURNING id.
+    - Semua item masuk lewat SATU executemany (di-batch otomatis oleh SQLAlchemy).
+    """
+    manifest_id = await insert_manifest_bulk(db, payload)
+    return await _load_manifest_for_response(db, manifest_id)
+
+async def insert_manifest_bulk(
+    db: AsyncSession,
+    payload: PackingManifestCreate,
+    box_chunk_size: Optional[int] = None,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> int:
+    """
+    Inti `create_packing_manifest_bulk`, mengembalikan id manifest tanpa memuat ulang relasinya.
+    Dengan `box_chunk_size`, box & item di-insert per chunk dan `on_progress(jumlah_box_selesai)`
+    dipanggil setelah tiap chunk (dipakai job async untuk laporan progres).
+    """
+    # Cukup id location (FK); dari cache public_id kalau sudah pernah di-resolve
+    location_id = await resolve_id(db, Location, payload.locations.location_public_id)
+    
+    new_manifest = PackingManifest(
+        location_id=location_id,
+        tujuan_kirim=payload.locations.tujuan_kirim,
+        packing_slip=payload.content.packing_slip,
+        total_boxes=payload.content.total_box,
+        shipping_address_details=payload.locations.model_dump(mode='json')
+    )
+    # Alamat label diolah SEKALI di sini, print-data tinggal baca kolomnya
+    new_manifest.label_address = _process_shipping_address_for_label(new_manifest).model_dump()
+    db.add(new_manifest)
+    await db.flush() # Flush untuk mendapatkan manifest.id
+
+    boxes = payload.content.boxes
+    if boxes:
+        serials = await sscc_serial_allocator.allocate(db, len(boxes))
+        ssccs = _generate_sscc_batch(serials)
+        gtin = _generate_gtin8()
+
+        chunk_size = box_chunk_size or len(boxes)
+        for start in range(0, len(boxes), chunk_size):
+            chunk_boxes = boxes[start:start + chunk_size]
+            box_rows = [
+                {
+                    "manifest_id": new_manifest.id,
+                    "box_number": box_data.box_number,
+                    "petugas": box_data.petugas,
+                    "berat": box_data.berat,
+                    "berat_kg": measures.parse_weight_kg(box_data.berat),
+                    "sscc": sscc,
+                    "gtin": gtin,
+                }
+                for sscc, box_data in zip(ssccs[start:start + chunk_size], chunk_boxes)
+            ]
+            result = await db.execute(
+                insert(PackedBox).values(box_rows).returning(PackedBox.id, PackedBox.sscc)
+            )
+            # Urutan RETURNING nggak dijamin Postgres, jadi petakan balik lewat SSCC (unik)
+            box_id_by_sscc = {sscc: box_id for box_id, sscc in result.all()}
+
+            item_rows = [
+                {
+                    "box_id": box_id_by_sscc[box_row["sscc"]],
+                    **item_data.model_dump(),
+                    **measures.typed_item_values(item_data.quantity, item_data.expire_date),
+                }
+                for box_row, box_data in zip(box_rows, chunk_boxes)
+                for item_data in box_data.items
+            ]
+            if item_rows:
+                await db.execute(insert(PackedItem), item_rows)
+            if on_progress is not None:
+                await on_progress(start + len(chunk_boxes))
+
+    await stats_service.record_manifest(db, location_id, payload)
+
+    return new_manifest.id
+
+async def _load_manifest_for_response(db: AsyncSession, manifest_id: int) -> PackingManifest:
+    """Eager load semua relasi manifest yang baru dibuat untuk response."""
     result = await db.execute(
         select(PackingManifest)
-        .where(PackingManifest.id == new_manifest.id)
+        .where(PackingManifest.id == manifest_id)
         .options(
             selectinload(PackingManifest.location),
             selectinload(PackingManifest.packed_boxes)
             .selectinload(PackedBox.packed_items)
         )
+        # Box & item dari jalur bulk ditulis lewat Core, jadi session belum tahu isinya
+        .execution_options(populate_existing=True)
     )
     return result.scalar_one()
 
 # file: app/services/packing_service.py
 
-async def get_latest_manifests(db: AsyncSession, limit: int = 25) -> List[PackingManifest]:
+def _encode_manifest_cursor(manifest_created_at: datetime, manifest_id: int) -> str:
+    """Bungkus posisi keyset (created_at, id) jadi token opaque untuk client."""
+    raw = json.dumps([manifest_created_at.isoformat(), manifest_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_manifest_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at_iso, manifest_id = json.loads(raw)
+        return datetime.fromisoformat(created_at_iso), int(manifest_id)
+    except (ValueError, TypeError):
+        raise BadRequestException("Cursor manifest tidak valid.")
+
+def _latest_manifests_page_query(limit: int, cursor: Optional[str]):
     """
-    Mengambil daftar manifest packing terbaru, lengkap dengan semua
-    kotak dan item di dalamnya (nested).
+    Query dasar keyset pagination: urut (created_at, id) DESC, ambil `limit + 1`
+    baris supaya ketahuan masih ada halaman berikutnya atau tidak.
     """
-    print("\n--- [INTEROGASI SERVICE DIMULAI] ---")
-    print(">>> Membangun query `get_latest_manifests`...")
     query = (
         select(PackingManifest)
-        .options(
-            selectinload(PackingManifest.location),
-            selectinload(PackingManifest.packed_boxes)
-            .selectinload(PackedBox.packed_items)
+        .order_by(PackingManifest.created_at.desc(), PackingManifest.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        cursor_created_at, cursor_id = _decode_manifest_cursor(cursor)
+        query = query.where(
+            tuple_(PackingManifest.created_at, PackingManifest.id) < tuple_(cursor_created_at, cursor_id)
         )
-        .order_by(PackingManifest.created_at.desc())
-        .limit(limit)
+    return query
+
+def _split_page(rows: Sequence, limit: int) -> Tuple[list, Optional[str]]:
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    last = page[-1]
+    return page, _encode_manifest_cursor(last.created_at, last.id)
+
+async def get_latest_manifests(
+    db: AsyncSession, limit: int = 25, cursor: Optional[str] = None
+) -> Tuple[List[PackingManifest], Optional[str]]:
+    """
+    Mengambil satu halaman manifest packing terbaru, lengkap dengan semua
+    kotak dan item di dalamnya (nested). Dipakai untuk drill-down.
+    Mengembalikan (manifests, next_cursor); next_cursor None kalau sudah halaman terakhir.
+    """
+    query = _latest_manifests_page_query(limit, cursor).options(
+        selectinload(PackingManifest.location),
+        selectinload(PackingManifest.packed_boxes)
+        .selectinload(PackedBox.packed_items)
     )
-    print(">>> Query selesai dibangun. Mengeksekusi ke DB...")
-    
     result = await db.execute(query)
-    manifests = result.scalars().all()
-    
-    print(f"<<< Query selesai. Ditemukan {len(manifests)} manifest.")
-
-    # --- BAGIAN INTEROGASI PALING PENTING ---
-    if manifests:
-        print("\n--- MENGINSPEKSI MANIFEST PERTAMA ---")
-        first_manifest = manifests[0]
-        print(f"--- Tipe objek: {type(first_manifest)}")
-        print(f"--- ID Manifest: {first_manifest.id}")
-        
-        print("--- Mengecek `first_manifest.location`...")
-        if first_manifest.location:
-            print("✅ `location` ADA.")
-            print(f"--- Tipe location: {type(first_manifest.location)}")
-            print(f"--- ID Location: {first_manifest.location.id}")
-            print(f"--- Public ID Location: {first_manifest.location.public_id}")
-        else:
-            print("❌❌❌ ANJING! `location` TERNYATA KOSONG (None)! INI BIANG KEROKNYA! ❌❌❌")
-    else:
-        print("--- Tidak ada manifest untuk diinspeksi.")
-        
-    print("--- [INTEROGASI SERVICE SELESAI] ---\n")
-    
-    return manifests
+    return _split_page(result.scalars().all(), limit)
+
+async def get_latest_manifest_summaries(
+    db: AsyncSession, limit: int = 25, cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Versi ringan `get_latest_manifests` untuk tabel daftar manifest.
+    Jumlah box, item, unit, dan berat dihitung di DB dalam SATU query agregat,
+    tanpa memuat `packed_boxes` / `packed_items` ke Python.
+    """
+    page = _latest_manifests_page_query(limit, cursor).with_only_columns(PackingManifest.id).subquery()
+
+    query = (
+        select(
+            PackingManifest.id,
+            PackingManifest.public_id,
+            PackingManifest.created_at,
+            PackingManifest.updated_at,
+            Location.public_id.label("location_public_id"),
+            PackingManifest.tujuan_kirim,
+            PackingManifest.packing_slip,
+            PackingManifest.total_boxes,
+            func.count(distinct(PackedBox.id)).label("box_count"),
+            func.count(PackedItem.id).label("item_count"),
+            # Aturan sama dengan rollup: baris yang belum di-backfill dihitung dari teks quantity
+            func.coalesce(func.sum(stats_service._UNITS_SQL), 0).label("unit_count"),
+            # Berat di level box: dijumlah di subquery sendiri supaya tidak terduplikasi join item
+            select(func.sum(PackedBox.berat_kg))
+            .where(PackedBox.manifest_id == PackingManifest.id)
+            .correlate(PackingManifest)
+            .scalar_subquery()
+            .label("total_weight_kg"),
+        )
+        .join(page, page.c.id == PackingManifest.id)
+        .join(Location, Location.id == PackingManifest.location_id)
+        .outerjoin(PackedBox, PackedBox.manifest_id == PackingManifest.id)
+        .outerjoin(PackedItem, PackedItem.box_id == PackedBox.id)
+        .group_by(PackingManifest.id, Location.public_id)
+        .order_by(PackingManifest.created_at.desc(), PackingManifest.id.desc())
+    )
+    result = await db.execute(query)
+    return _split_page(result.all(), limit)
 
 async def get_manifest_by_public_id(db: AsyncSession, public_id: uuid.UUID) -> PackingManifest:
     """Mengambil satu manifest spesifik berdasarkan public_id-nya."""
@@ -241,30 +410,223 @@ def _process_shipping_address_for_label(manifest: PackingManifest) -> LabelAddre
         pic_contact=pic_info
     )
 
-# --- FUNGSI SERVICE UTAMA (SEDIKIT PERUBAHAN) ---
+def _get_label_address(manifest: PackingManifest) -> LabelAddressData:
+    """
+    Ambil alamat label yang sudah diolah saat manifest dibuat.
+    Manifest lama yang belum di-backfill tetap dihitung on the fly.
+    """
+    if manifest.label_address:
+        return LabelAddressData.model_validate(manifest.label_address)
+    return _process_shipping_address_for_label(manifest)
 
-async def get_data_for_label_printing(db: AsyncSession, manifest_public_id: uuid.UUID) -> dict:
+@event.listens_for(PackingManifest, "before_update")
+def _recompute_label_address_on_change(mapper, connection, target: PackingManifest):
+    """Kalau alamat tujuan berubah lewat ORM, hitung ulang `label_address` di flush yang sama."""
+    state = inspect(target)
+    if (
+        state.attrs.shipping_address_details.history.has_changes()
+        or state.attrs.tujuan_kirim.history.has_changes()
+    ):
+        target.label_address = _process_shipping_address_for_label(target).model_dump()
+
+async def backfill_label_address_batch(
+    db: AsyncSession, after_id: int = 0, batch_size: int = 500, force: bool = False
+) -> Tuple[Optional[int], int]:
     """
-    Mengambil semua data manifest dan mengolahnya menjadi format
-    yang siap dikirim sebagai JSON untuk dicetak.
+    Isi `label_address` untuk satu batch manifest (urut id, mulai setelah `after_id`).
+    Mengembalikan (id terakhir yang diproses, jumlah baris); id None kalau sudah tidak ada sisa.
+    Dengan `force`, manifest yang sudah terisi ikut dihitung ulang.
     """
-    manifest = await get_manifest_by_public_id(db=db, public_id=manifest_public_id)
-    
-    # ✅ PANGGIL HELPER YANG BARU
-    shipping_address_data = _process_shipping_address_for_label(manifest)
+    query = (
+        select(PackingManifest.id, PackingManifest.shipping_address_details, PackingManifest.tujuan_kirim)
+        .where(PackingManifest.id > after_id)
+        .order_by(PackingManifest.id)
+        .limit(batch_size)
+    )
+    if not force:
+        query = query.where(PackingManifest.label_address.is_(None))
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return None, 0
+
+    # Row punya atribut yang sama dengan yang dibaca helper, jadi bisa langsung dipakai
+    await db.execute(
+        update(PackingManifest),
+        [
+            {"id": row.id, "label_address": _process_shipping_address_for_label(row).model_dump()}
+            for row in rows
+        ]
+    )
+    # Write Core tidak lewat mapper event; cache scan SSCC dibuang saat commit
+    mark_manifests_changed(db, (row.id for row in rows))
+    return rows[-1].id, len(rows)
+
+async def backfill_item_measures_batch(
+    db: AsyncSession, after_id: int = 0, batch_size: int = 1000
+) -> Tuple[Optional[int], int]:
+    """
+    Isi `quantity_units` / `expire_on` untuk satu batch PackedItem lama (urut id, setelah `after_id`).
+    Satu batch = satu transaksi pendek; yang terkunci hanya baris di batch itu.
+    Mengembalikan (id terakhir yang dibaca, jumlah baris yang di-update); id None kalau sudah habis.
+    """
+    rows = (await db.execute(
+        select(PackedItem.id, PackedItem.box_id, PackedItem.quantity, PackedItem.expire_date)
+        .where(PackedItem.id > after_id)
+        .where(or_(PackedItem.quantity_units.is_(None), PackedItem.expire_on.is_(None)))
+        .order_by(PackedItem.id)
+        .limit(batch_size)
+    )).all()
+    if not rows:
+        return None, 0
+
+    # Teks yang memang tidak bisa dibaca tetap NULL, tidak perlu ditulis ulang
+    updates, box_ids = [], set()
+    for row in rows:
+        values = measures.typed_item_values(row.quantity, row.expire_date)
+        if any(value is not None for value in values.values()):
+            updates.append({"id": row.id, **values})
+            box_ids.add(row.box_id)
+    if updates:
+        await db.execute(update(PackedItem), updates)
+        mark_boxes_changed(db, box_ids)
+    return rows[-1].id, len(updates)
+
+async def backfill_box_weight_batch(
+    db: AsyncSession, after_id: int = 0, batch_size: int = 1000
+) -> Tuple[Optional[int], int]:
+    """Sama seperti `backfill_item_measures_batch`, untuk `PackedBox.berat_kg`."""
+    rows = (await db.execute(
+        select(PackedBox.id, PackedBox.berat)
+        .where(PackedBox.id > after_id)
+        .where(PackedBox.berat_kg.is_(None))
+        .where(PackedBox.berat.is_not(None))
+        .order_by(PackedBox.id)
+        .limit(batch_size)
+    )).all()
+    if not rows:
+        return None, 0
+
+    updates = []
+    for row in rows:
+        weight = measures.parse_weight_kg(row.berat)
+        if weight is not None:
+            updates.append({"id": row.id, "berat_kg": weight})
+    if updates:
+        await db.execute(update(PackedBox), updates)
+        mark_boxes_changed(db, (row["id"] for row in updates))
+    return rows[-1].id, len(updates)
+
+# --- FUNGSI SERVICE UTAMA (SEDIKIT PERUBAHAN) ---
+
+def _build_label_data(manifest: PackingManifest) -> dict:
+    """Rakit payload print-data (bentuk `LabelDataResponse`) dari manifest yang sudah dimuat."""
+    # Alamat sudah diolah waktu manifest dibuat, di sini cuma baca
+    shipping_address_data = _get_label_address(manifest)
     
-    label_data = {
+    return {
         "public_id": manifest.public_id,
         "created_at": manifest.created_at,
         "updated_at": manifest.updated_at,        
         "manifest_public_id": manifest.public_id,
         "packing_slip": manifest.packing_slip,
         "tujuan_kirim": manifest.tujuan_kirim,
-        
-        # ✅ GANTI NAMA FIELD INI
         "shipping_address": shipping_address_data,
-        
         "packed_boxes": manifest.packed_boxes
     }
-    
-    return label_data
\ No newline at end of file
+
+async def get_data_for_label_printing(db: AsyncSession, manifest_public_id: uuid.UUID) -> dict:
+    """
+    Mengambil semua data manifest dan mengolahnya menjadi format
+    yang siap dikirim sebagai JSON untuk dicetak.
+    """
+    manifest = await get_manifest_by_public_id(db=db, public_id=manifest_public_id)
+    return _build_label_data(manifest)
+
+async def get_data_for_label_printing_batch(db: AsyncSession, manifest_public_ids: List[uuid.UUID]) -> List[dict]:
+    """
+    Versi batch `get_data_for_label_printing` untuk cetak akhir shift.
+    Semua manifest dimuat sekaligus: satu query IN untuk manifest, lalu satu
+    query IN per level relasi (box, item). Hasil mengikuti urutan request;
+    public_id yang tidak ditemukan dilaporkan per baris, bukan menggagalkan semuanya.
+    """
+    unique_ids = list(dict.fromkeys(manifest_public_ids))
+    query = (
+        select(PackingManifest)
+        .where(PackingManifest.public_id.in_(unique_ids))
+        .options(
+            selectinload(PackingManifest.packed_boxes)
+            .selectinload(PackedBox.packed_items)
+        )
+    )
+    result = await db.execute(query)
+    manifests_by_public_id = {manifest.public_id: manifest for manifest in result.scalars().all()}
+
+    results = []
+    for public_id in manifest_public_ids:
+        manifest = manifests_by_public_id.get(public_id)
+        if manifest is None:
+            results.append({
+                "manifest_public_id": public_id,
+                "status": "not_found",
+                "detail": f"Packing Manifest with public_id {public_id} not found.",
+                "data": None,
+            })
+        else:
+            results.append({
+                "manifest_public_id": public_id,
+                "status": "ok",
+                "detail": None,
+                "data": _build_label_data(manifest),
+            })
+    return results
+
+async def get_zpl_labels_for_manifest(
+    db: AsyncSession, manifest_public_id: uuid.UUID
+) -> Tuple[PackingManifest, Iterator[str]]:
+    """
+    Menyiapkan label ZPL untuk semua box di satu manifest.
+    Semua data dimuat di sini; iterator yang dikembalikan cuma me-render
+    satu label per box dari objek yang sudah ada di memori (tanpa query lagi).
+    """
+    manifest = await get_manifest_by_public_id(db=db, public_id=manifest_public_id)
+    template = await label_service.get_shipping_label_template(db)
+    shipping_address_data = _get_label_address(manifest)
+    return manifest, label_service.render_manifest_labels(manifest, shipping_address_data, template)
+
+# Batas jumlah SSCC per query `= ANY(array)` waktu cek ke tabel packed_boxes
+_REGISTERED_LOOKUP_CHUNK = 50_000
+
+async def validate_barcodes(db: AsyncSession, codes: List[str], check_registered: bool = False) -> dict:
+    """
+    Validasi check digit banyak kode GS1 sekaligus (vektorisasi NumPy).
+    Kalau `check_registered` aktif, SSCC yang valid juga dicocokkan ke
+    `packed_boxes.sscc` untuk rekonsiliasi hasil scan.
+    """
+    valid_mask = gs1.validate_codes(codes)
+    invalid_codes = [code for code, is_valid in zip(codes, valid_mask.tolist()) if not is_valid]
+
+    unregistered_codes = None
+    if check_registered:
+        valid_ssccs = list({code for code, is_valid in zip(codes, valid_mask.tolist()) if is_valid and len(code) == 18})
+        registered = set()
+        for start in range(0, len(valid_ssccs), _REGISTERED_LOOKUP_CHUNK):
+            chunk = valid_ssccs[start:start + _REGISTERED_LOOKUP_CHUNK]
+            result = await db.execute(
+                select(PackedBox.sscc).where(
+                    PackedBox.sscc == any_(bindparam("ssccs", value=chunk, type_=ARRAY(String)))
+                )
+            )
+            registered.update(result.scalars().all())
+        unregistered_codes = [
+            code for code, is_valid in zip(codes, valid_mask.tolist())
+            if is_valid and len(code) == 18 and code not in registered
+        ]
+
+    valid_count = int(valid_mask.sum())
+    return {
+        "total": len(codes),
+        "valid_count": valid_count,
+        "invalid_count": len(codes) - valid_count,
+        "invalid_codes": invalid_codes,
+        "unregistered_codes": unregistered_codes,
+    }
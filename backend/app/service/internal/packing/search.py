@@ -0,0 +1,112 @@
+# file: app/service/internal/packing/search.py
+
+from typing import List, Optional, Tuple
+from sqlalchemy import func, distinct, exists, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+from app.models.users.customer import Location
+from app.core.exceptions import BadRequestException
+from app.service.internal.packing.packing import _latest_manifests_page_query, _split_page
+from app.service.internal.text_search import MIN_SEARCH_LENGTH, contains_ilike
+
+
+async def search_manifests(
+    db: AsyncSession,
+    product: Optional[str] = None,
+    batch: Optional[str] = None,
+    packing_slip: Optional[str] = None,
+    tujuan_kirim: Optional[str] = None,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Cari manifest berdasarkan produk, batch (lot), packing slip, dan/atau tujuan kirim.
+    Semua filter digabung AND. Hasil urut terbaru dengan keyset pagination (created_at, id).
+
+    Query 1: halaman manifest (filter item lewat EXISTS, jadi manifest tidak dobel).
+    Query 2: detail item yang cocok (jumlah & SSCC box) hanya untuk manifest di halaman itu.
+    """
+    filters = {"product": product, "batch": batch, "packing_slip": packing_slip, "tujuan_kirim": tujuan_kirim}
+    active = {name: value.strip() for name, value in filters.items() if value and value.strip()}
+    if not active:
+        raise BadRequestException("Minimal satu filter pencarian harus diisi.")
+    too_short = [name for name, value in active.items() if len(value) < MIN_SEARCH_LENGTH]
+    if too_short:
+        raise BadRequestException(
+            f"Filter {', '.join(too_short)} minimal {MIN_SEARCH_LENGTH} karakter."
+        )
+
+    item_conditions = []
+    if "product" in active:
+        item_conditions.append(contains_ilike(PackedItem.product, active["product"]))
+    if "batch" in active:
+        item_conditions.append(contains_ilike(PackedItem.batch, active["batch"]))
+
+    page_query = _latest_manifests_page_query(limit, cursor).with_only_columns(
+        PackingManifest.id, PackingManifest.created_at
+    )
+    if "packing_slip" in active:
+        page_query = page_query.where(contains_ilike(PackingManifest.packing_slip, active["packing_slip"]))
+    if "tujuan_kirim" in active:
+        page_query = page_query.where(contains_ilike(PackingManifest.tujuan_kirim, active["tujuan_kirim"]))
+    if item_conditions:
+        page_query = page_query.where(
+            exists()
+            .where(PackedBox.manifest_id == PackingManifest.id)
+            .where(PackedItem.box_id == PackedBox.id)
+            .where(and_(*item_conditions))
+        )
+
+    page, next_cursor = _split_page((await db.execute(page_query)).all(), limit)
+    manifest_ids = [row.id for row in page]
+    if not manifest_ids:
+        return [], None
+
+    header_rows = (await db.execute(
+        select(
+            PackingManifest.id,
+            PackingManifest.public_id,
+            PackingManifest.created_at,
+            Location.public_id.label("location_public_id"),
+            PackingManifest.tujuan_kirim,
+            PackingManifest.packing_slip,
+            PackingManifest.total_boxes,
+        )
+        .join(Location, Location.id == PackingManifest.location_id)
+        .where(PackingManifest.id.in_(manifest_ids))
+    )).all()
+
+    matched_by_manifest = {}
+    if item_conditions:
+        match_rows = (await db.execute(
+            select(
+                PackedBox.manifest_id,
+                func.count(PackedItem.id).label("matched_item_count"),
+                func.array_agg(distinct(PackedBox.sscc)).label("matched_ssccs"),
+            )
+            .select_from(PackedItem)
+            .join(PackedBox, PackedBox.id == PackedItem.box_id)
+            .where(PackedBox.manifest_id.in_(manifest_ids))
+            .where(and_(*item_conditions))
+            .group_by(PackedBox.manifest_id)
+        )).all()
+        matched_by_manifest = {row.manifest_id: row for row in match_rows}
+
+    headers_by_id = {row.id: row for row in header_rows}
+    hits = []
+    for manifest_id in manifest_ids:
+        header = headers_by_id[manifest_id]
+        match = matched_by_manifest.get(manifest_id)
+        hits.append({
+            "public_id": header.public_id,
+            "created_at": header.created_at,
+            "location_public_id": header.location_public_id,
+            "tujuan_kirim": header.tujuan_kirim,
+            "packing_slip": header.packing_slip,
+            "total_boxes": header.total_boxes,
+            "matched_item_count": match.matched_item_count if match else 0,
+            "matched_ssccs": sorted(match.matched_ssccs) if match else [],
+        })
+    return hits, next_cursor
@@ -0,0 +1,89 @@
+# file: app/service/internal/packing/sscc.py
+
+import asyncio
+from typing import List
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.packing.manifest import sscc_serial_seq, SSCC_SERIAL_BLOCK_SIZE
+from app.core.exceptions import UnprocessableEntityException
+
+SSCC_EXTENSION_DIGIT = "1"
+SSCC_COMPANY_PREFIX = "8994957"
+# 1 (extension) + 7 (prefix) + 9 (serial) + 1 (check digit) = 18 digit
+SSCC_SERIAL_DIGITS = 17 - len(SSCC_EXTENSION_DIGIT) - len(SSCC_COMPANY_PREFIX)
+SSCC_MAX_SERIAL = 10 ** SSCC_SERIAL_DIGITS - 1
+
+
+class SSCCSerialAllocator:
+    """
+    Pembagi serial reference SSCC berbasis lease blok.
+
+    Setiap `nextval('sscc_serial_seq')` mengembalikan awal satu blok sebesar
+    `SSCC_SERIAL_BLOCK_SIZE`. Blok itu disimpan di memori worker dan dibagikan
+    tanpa query sampai habis. Karena sequence Postgres tidak pernah mengulang
+    nilai (juga saat rollback atau restart), dua worker uvicorn tidak akan
+    pernah memegang blok yang sama. Sisa blok yang belum terpakai saat worker
+    mati cuma jadi celah, bukan duplikat.
+    """
+
+    def __init__(self, block_size: int = SSCC_SERIAL_BLOCK_SIZE, max_serial: int = SSCC_MAX_SERIAL):
+        self.block_size = block_size
+        self.max_serial = max_serial
+        self._next = 1
+        self._end = 0 # Inklusif. _next > _end artinya belum punya blok.
+        self._lock = asyncio.Lock()
+
+    @property
+    def remaining_in_block(self) -> int:
+        return max(0, self._end - self._next + 1)
+
+    async def _lease_block(self, db: AsyncSession) -> None:
+        start = await db.scalar(select(sscc_serial_seq.next_value()))
+        if start > self.max_serial:
+            raise UnprocessableEntityException(
+                f"Serial SSCC untuk company prefix {SSCC_COMPANY_PREFIX} sudah habis."
+            )
+        self._next = start
+        self._end = min(start + self.block_size - 1, self.max_serial)
+
+    async def allocate(self, db: AsyncSession, count: int) -> List[int]:
+        """Mengambil `count` serial unik. Query ke DB hanya saat blok habis."""
+        serials: List[int] = []
+        async with self._lock:
+            while len(serials) < count:
+                if self._next > self._end:
+                    await self._lease_block(db)
+                take = min(count - len(serials), self._end - self._next + 1)
+                serials.extend(range(self._next, self._next + take))
+                self._next += take
+        return serials
+
+
+# Satu allocator per proses worker
+sscc_serial_allocator = SSCCSerialAllocator()
+
+
+async def get_sscc_serial_space(db: AsyncSession) -> dict:
+    """
+    Melaporkan sisa ruang serial SSCC untuk company prefix saat ini,
+    dibaca langsung dari state `sscc_serial_seq`.
+    """
+    result = await db.execute(text(f"SELECT last_value, is_called FROM {sscc_serial_seq.name}"))
+    last_value, is_called = result.one()
+
+    # Kalau is_called False, nextval() berikutnya mengembalikan last_value itu sendiri
+    next_block_start = last_value + SSCC_SERIAL_BLOCK_SIZE if is_called else last_value
+    remaining = max(0, SSCC_MAX_SERIAL - next_block_start + 1)
+
+    return {
+        "extension_digit": SSCC_EXTENSION_DIGIT,
+        "company_prefix": SSCC_COMPANY_PREFIX,
+        "max_serial": SSCC_MAX_SERIAL,
+        "block_size": SSCC_SERIAL_BLOCK_SIZE,
+        "next_block_start": next_block_start,
+        "remaining_serials": remaining,
+        "remaining_blocks": -(-remaining // SSCC_SERIAL_BLOCK_SIZE),
+        "used_ratio": round(1 - remaining / SSCC_MAX_SERIAL, 6),
+        "worker_leased_remaining": sscc_serial_allocator.remaining_in_block,
+    }
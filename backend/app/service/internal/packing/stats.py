@@ -0,0 +1,287 @@
+# file: app/service/internal/packing/stats.py
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import uuid
+from sqlalchemy import func, text, case, Date, cast, BigInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.packing.manifest import PackingManifest, PackedBox, PackedItem
+from app.models.packing.stats import PackingLocationDailyStat, PackingProductDailyStat
+from app.models.users.customer import Location
+from app.schema.internal.packing.packing_manifest import PackingManifestCreate
+from app.service.internal.packing.measures import MAX_QUANTITY_DIGITS, QUANTITY_PATTERN, parse_units, parse_weight_kg
+
+# =============================================================================
+# UNIT & BERAT
+# Sumber utamanya kolom bertipe `PackedItem.quantity_units` / `PackedBox.berat_kg`
+# (diisi saat create, baris lama lewat `db backfill-packing-measures`).
+# Untuk baris yang belum di-backfill, unit masih dihitung dari teks dengan aturan
+# yang sama dengan `measures.parse_units` (QUANTITY_PATTERN, titik ribuan dibuang).
+# =============================================================================
+
+# substring(teks, pola) = isi grup pertama; NULL kalau tidak cocok
+_QUANTITY_DIGITS = func.regexp_replace(
+    func.substring(PackedItem.quantity, QUANTITY_PATTERN), r"\.", "", "g"
+)
+_UNITS_SQL = func.coalesce(
+    PackedItem.quantity_units,
+    # Angka yang tidak muat BIGINT dianggap tidak terbaca (0), sama seperti parse_quantity_units
+    case(
+        (func.length(func.ltrim(_QUANTITY_DIGITS, "0")) <= MAX_QUANTITY_DIGITS,
+         cast(func.nullif(_QUANTITY_DIGITS, ""), BigInteger)),
+        else_=None,
+    ),
+    0,
+)
+
+# =============================================================================
+# UPDATE INKREMENTAL (dipanggil dari create_packing_manifest)
+# =============================================================================
+
+def _upsert_add(model, rows: List[dict], key_columns: List[str], counter_columns: List[str]):
+    """INSERT ... ON CONFLICT DO UPDATE yang MENAMBAHKAN counter ke baris yang sudah ada."""
+    stmt = pg_insert(model).values(rows)
+    table = model.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            **{col: table.c[col] + stmt.excluded[col] for col in counter_columns},
+            "updated_at": func.now(),
+        },
+    )
+
+async def record_manifest(db: AsyncSession, location_id: int, payload: PackingManifestCreate) -> None:
+    """
+    Tambahkan satu manifest baru ke tabel rollup, di transaksi yang sama.
+    Angka dihitung dari payload (tanpa query ke packed_items). `day` pakai
+    CURRENT_DATE transaksi, sama dengan `created_at::date` manifest yang baru dibuat.
+    """
+    await record_manifests(db, [(location_id, payload)])
+
+async def record_manifests(db: AsyncSession, manifests: List[Tuple[int, PackingManifestCreate]]) -> None:
+    """
+    Versi banyak manifest sekaligus (dipakai import massal): diagregasi dulu per lokasi
+    dan per (lokasi, produk), jadi tetap 2 upsert berapapun jumlah manifest-nya.
+    """
+    if not manifests:
+        return
+    location_totals: Dict[int, Dict[str, object]] = {}
+    product_totals: Dict[Tuple[int, str], Dict[str, int]] = {}
+    for location_id, payload in manifests:
+        boxes = payload.content.boxes
+        totals = location_totals.setdefault(location_id, {
+            "manifest_count": 0, "box_count": 0, "item_count": 0, "unit_count": 0, "weight_kg": Decimal(0),
+        })
+        totals["manifest_count"] += 1
+        totals["box_count"] += len(boxes)
+        for box_data in boxes:
+            totals["weight_kg"] += parse_weight_kg(box_data.berat) or Decimal(0)
+            for item_data in box_data.items:
+                units = parse_units(item_data.quantity)
+                totals["item_count"] += 1
+                totals["unit_count"] += units
+                product = product_totals.setdefault((location_id, item_data.product), {"item_count": 0, "unit_count": 0})
+                product["item_count"] += 1
+                product["unit_count"] += units
+
+    today = func.current_date()
+    await db.execute(_upsert_add(
+        PackingLocationDailyStat,
+        [
+            {"day": today, "location_id": location_id, **totals}
+            for location_id, totals in location_totals.items()
+        ],
+        key_columns=["day", "location_id"],
+        counter_columns=["manifest_count", "box_count", "item_count", "unit_count", "weight_kg"],
+    ))
+    if product_totals:
+        await db.execute(_upsert_add(
+            PackingProductDailyStat,
+            [
+                {"day": today, "location_id": location_id, "product": product, **totals}
+                for (location_id, product), totals in product_totals.items()
+            ],
+            key_columns=["day", "location_id", "product"],
+            counter_columns=["item_count", "unit_count"],
+        ))
+
+# =============================================================================
+# REBUILD PENUH (manage.py db rebuild-packing-stats)
+# =============================================================================
+
+async def rebuild_rollups(db: AsyncSession) -> None:
+    """Kosongkan tabel rollup lalu hitung ulang semuanya dari packed_boxes/packed_items."""
+    await db.execute(text(
+        f"TRUNCATE {PackingLocationDailyStat.__tablename__}, {PackingProductDailyStat.__tablename__}"
+    ))
+
+    manifest_day = cast(PackingManifest.created_at, Date)
+
+    box_counts = (
+        select(
+            PackedBox.manifest_id,
+            func.count(PackedBox.id).label("box_count"),
+            func.sum(PackedBox.berat_kg).label("weight_kg"),
+        )
+        .group_by(PackedBox.manifest_id)
+        .subquery()
+    )
+    item_counts = (
+        select(
+            PackedBox.manifest_id,
+            func.count(PackedItem.id).label("item_count"),
+            func.sum(_UNITS_SQL).label("unit_count"),
+        )
+        .select_from(PackedItem)
+        .join(PackedBox, PackedBox.id == PackedItem.box_id)
+        .group_by(PackedBox.manifest_id)
+        .subquery()
+    )
+    location_select = (
+        select(
+            manifest_day.label("day"),
+            PackingManifest.location_id,
+            func.count(PackingManifest.id),
+            func.coalesce(func.sum(box_counts.c.box_count), 0),
+            func.coalesce(func.sum(item_counts.c.item_count), 0),
+            func.coalesce(func.sum(item_counts.c.unit_count), 0),
+            func.coalesce(func.sum(box_counts.c.weight_kg), 0),
+        )
+        .outerjoin(box_counts, box_counts.c.manifest_id == PackingManifest.id)
+        .outerjoin(item_counts, item_counts.c.manifest_id == PackingManifest.id)
+        .group_by(manifest_day, PackingManifest.location_id)
+    )
+    await db.execute(
+        pg_insert(PackingLocationDailyStat).from_select(
+            ["day", "location_id", "manifest_count", "box_count", "item_count", "unit_count", "weight_kg"],
+            location_select,
+        )
+    )
+
+    product_select = (
+        select(
+            manifest_day.label("day"),
+            PackingManifest.location_id,
+            PackedItem.product,
+            func.count(PackedItem.id),
+            func.sum(_UNITS_SQL),
+        )
+        .select_from(PackedItem)
+        .join(PackedBox, PackedBox.id == PackedItem.box_id)
+        .join(PackingManifest, PackingManifest.id == PackedBox.manifest_id)
+        .group_by(manifest_day, PackingManifest.location_id, PackedItem.product)
+    )
+    await db.execute(
+        pg_insert(PackingProductDailyStat).from_select(
+            ["day", "location_id", "product", "item_count", "unit_count"],
+            product_select,
+        )
+    )
+
+# =============================================================================
+# QUERY DASHBOARD (hanya baca tabel rollup)
+# =============================================================================
+
+async def get_boxes_per_day(
+    db: AsyncSession, date_from: date, date_to: date, location_public_id: Optional[uuid.UUID] = None
+) -> List[dict]:
+    """Total manifest, box, unit, dan berat per hari (opsional difilter satu lokasi tujuan)."""
+    stat = PackingLocationDailyStat
+    query = (
+        select(
+            stat.day,
+            func.sum(stat.manifest_count).label("manifest_count"),
+            func.sum(stat.box_count).label("box_count"),
+            func.sum(stat.unit_count).label("unit_count"),
+            func.sum(stat.weight_kg).label("weight_kg"),
+        )
+        .where(stat.day.between(date_from, date_to))
+        .group_by(stat.day)
+        .order_by(stat.day)
+    )
+    if location_public_id:
+        query = query.join(Location, Location.id == stat.location_id).where(Location.public_id == location_public_id)
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
+
+async def get_manifests_per_destination(
+    db: AsyncSession, date_from: date, date_to: date, limit: int = 20
+) -> List[dict]:
+    """Lokasi tujuan dengan manifest terbanyak di rentang tanggal."""
+    stat = PackingLocationDailyStat
+    manifest_count = func.sum(stat.manifest_count).label("manifest_count")
+    query = (
+        select(
+            Location.public_id.label("location_public_id"),
+            Location.name.label("location_name"),
+            manifest_count,
+            func.sum(stat.box_count).label("box_count"),
+        )
+        .join(Location, Location.id == stat.location_id)
+        .where(stat.day.between(date_from, date_to))
+        .group_by(Location.id)
+        .order_by(manifest_count.desc())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
+
+async def get_units_per_product(
+    db: AsyncSession, date_from: date, date_to: date, limit: int = 20
+) -> List[dict]:
+    """Produk dengan unit terkirim terbanyak di rentang tanggal."""
+    stat = PackingProductDailyStat
+    unit_count = func.sum(stat.unit_count).label("unit_count")
+    query = (
+        select(
+            stat.product,
+            unit_count,
+            func.sum(stat.item_count).label("item_count"),
+        )
+        .where(stat.day.between(date_from, date_to))
+        .group_by(stat.product)
+        .order_by(unit_count.desc())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
+
+# =============================================================================
+# QUERY LANGSUNG KE KOLOM BERTIPE (bukan rollup)
+# =============================================================================
+
+async def get_expiring_shipments(
+    db: AsyncSession, expire_from: date, expire_to: date, limit: int = 100
+) -> List[dict]:
+    """
+    Batch yang sudah dikirim dengan ED di rentang tanggal, per produk/batch/lokasi tujuan.
+    Filter pakai index `packed_items.expire_on`; jumlah unit dihitung di SQL.
+    """
+    unit_count = func.sum(_UNITS_SQL).label("unit_count")
+    query = (
+        select(
+            PackedItem.product,
+            PackedItem.batch,
+            PackedItem.expire_on,
+            Location.public_id.label("location_public_id"),
+            Location.name.label("location_name"),
+            unit_count,
+            func.count(func.distinct(PackedBox.id)).label("box_count"),
+            func.count(func.distinct(PackingManifest.id)).label("manifest_count"),
+            func.max(PackingManifest.created_at).label("last_shipped_at"),
+        )
+        .select_from(PackedItem)
+        .join(PackedBox, PackedBox.id == PackedItem.box_id)
+        .join(PackingManifest, PackingManifest.id == PackedBox.manifest_id)
+        .join(Location, Location.id == PackingManifest.location_id)
+        .where(PackedItem.expire_on.between(expire_from, expire_to))
+        .group_by(PackedItem.product, PackedItem.batch, PackedItem.expire_on, Location.id)
+        .order_by(PackedItem.expire_on, unit_count.desc())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,12 @@
+# file: app/service/internal/text_search.py
+#
+# Helper pencarian teks bersama (pg_trgm): dipakai /packing/search dan /customers/search.
+
+# Trigram butuh minimal 3 karakter supaya index benar-benar terpakai
+MIN_SEARCH_LENGTH = 3
+
+
+def contains_ilike(column, value: str):
+    """ILIKE '%value%' dengan wildcard dari input user di-escape (dilayani index gin/gist_trgm_ops)."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
@@ -0,0 +1,257 @@
+# file: app/service/internal/user/credit.py
+#
+# Reservasi kredit customer saat order masuk: kurangi / kembalikan kredit tersedia
+# dengan SATU `UPDATE ... WHERE sisa >= jumlah RETURNING`, tanpa baca-hitung-tulis di Python.
+# Kalau kreditnya kurang, UPDATE tidak mengenai baris apa pun -> 422, saldo tidak pernah minus.
+# Sebaliknya release ditolak (422) kalau kredit tersedia jadi melebihi `default_credit_limit`.
+#
+# Dua mode ledger per customer (`CustomerSpecification.credit_shard_count`):
+# - 0 (default): kredit tersedia = current_credit_limit (NULL = default_credit_limit).
+# - N: kredit dipecah ke N baris `customer_credit_shards`. Reservasi memilih shard acak yang
+#   cukup dan tidak sedang dikunci (SKIP LOCKED), jadi order bersamaan untuk distributor besar
+#   tidak antre di satu baris. Saldo = current_credit_limit + SUM(shard), dihitung saat baca.
+#   Kalau tidak ada satu shard pun yang cukup tapi totalnya cukup, jumlahnya diambil
+#   berurutan dari beberapa shard sekaligus (semua shard customer itu dikunci).
+
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import update, delete, insert, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.exceptions import NotFoundException, UnprocessableEntityException
+from app.models.users.customer import Customer, CustomerSpecification, CustomerCreditShard
+from app.service.internal.user.public_ids import resolve_id
+
+_MAIN_AVAILABLE = func.coalesce(
+    CustomerSpecification.current_credit_limit, CustomerSpecification.default_credit_limit, 0
+)
+# Batas atas kredit tersedia: release tidak boleh membuat kredit melebihi limit customer
+_CREDIT_LIMIT = func.coalesce(CustomerSpecification.default_credit_limit, 0)
+
+# Ambil `amount` dari beberapa shard berurutan (shard_no), hanya kalau totalnya cukup
+_SPREAD_RESERVE_SQL = text("""
+WITH locked AS (
+    SELECT shard_no, available FROM customer_credit_shards
+    WHERE customer_id = :customer_id
+    ORDER BY shard_no
+    FOR UPDATE
+), plan AS (
+    SELECT shard_no,
+           least(available, greatest(:amount - (sum(available) OVER (ORDER BY shard_no) - available), 0)) AS take,
+           sum(available) OVER () AS total
+    FROM locked
+)
+UPDATE customer_credit_shards AS shard
+SET available = shard.available - plan.take
+FROM plan
+WHERE shard.customer_id = :customer_id
+  AND shard.shard_no = plan.shard_no
+  AND plan.total >= :amount
+  AND plan.take > 0
+RETURNING shard.shard_no, shard.available
+""")
+
+
+def _pick_shard(customer_id: int, min_available: Decimal, skip_locked: bool):
+    """Subquery: satu shard acak milik customer dengan sisa >= min_available, langsung dikunci."""
+    return (
+        select(CustomerCreditShard.shard_no)
+        .where(CustomerCreditShard.customer_id == customer_id, CustomerCreditShard.available >= min_available)
+        .order_by(func.random())
+        .limit(1)
+        .with_for_update(skip_locked=skip_locked)
+        .scalar_subquery()
+    )
+
+
+async def _update_one_shard(db: AsyncSession, customer_id: int, delta: Decimal, min_available: Decimal):
+    """
+    Tambah `delta` (negatif = reservasi) ke satu shard. Coba shard yang tidak sedang dikunci
+    dulu; kalau semua yang cukup sedang dipakai transaksi lain, baru menunggu salah satunya.
+    """
+    for skip_locked in (True, False):
+        row = (await db.execute(
+            update(CustomerCreditShard)
+            .where(
+                CustomerCreditShard.customer_id == customer_id,
+                CustomerCreditShard.shard_no == _pick_shard(customer_id, min_available, skip_locked),
+                CustomerCreditShard.available + delta >= 0,
+            )
+            .values(available=CustomerCreditShard.available + delta)
+            .returning(CustomerCreditShard.shard_no, CustomerCreditShard.available)
+        )).first()
+        if row is not None:
+            return row
+    return None
+
+
+async def _require_specification(db: AsyncSession, customer_id: int, customer_public_id: uuid.UUID) -> int:
+    """Dipanggil hanya di jalur gagal: bedakan 'tidak punya spesifikasi' (404) dari kredit kurang."""
+    shard_count = await db.scalar(
+        select(CustomerSpecification.credit_shard_count).where(CustomerSpecification.customer_id == customer_id)
+    )
+    if shard_count is None:
+        raise NotFoundException(f"Customer with public_id {customer_public_id} has no credit specification.")
+    return shard_count
+
+
+def _reservation_result(customer_public_id: uuid.UUID, amount: Decimal, ledger: str,
+                        shard_no: Optional[int], remaining) -> dict:
+    return {
+        "customer_public_id": customer_public_id,
+        "amount": float(amount),
+        "ledger": ledger,
+        "shard_no": shard_no,
+        "ledger_remaining": float(remaining),
+    }
+
+
+async def reserve_credit(db: AsyncSession, customer_public_id: uuid.UUID, amount: Decimal) -> dict:
+    """
+    Kurangi kredit tersedia sebesar `amount`, atomik. Raise 422 kalau kredit tidak cukup.
+    Customer biasa: tepat satu UPDATE. Customer ber-shard: satu UPDATE ke satu shard (jalur umum).
+    """
+    customer_id = await resolve_id(db, Customer, customer_public_id)
+
+    remaining = (await db.execute(
+        update(CustomerSpecification)
+        .where(
+            CustomerSpecification.customer_id == customer_id,
+            CustomerSpecification.credit_shard_count == 0,
+            _MAIN_AVAILABLE >= amount,
+        )
+        .values(current_credit_limit=_MAIN_AVAILABLE - amount)
+        .returning(CustomerSpecification.current_credit_limit)
+    )).scalar_one_or_none()
+    if remaining is not None:
+        return _reservation_result(customer_public_id, amount, "main", None, remaining)
+
+    row = await _update_one_shard(db, customer_id, -amount, amount)
+    if row is not None:
+        return _reservation_result(customer_public_id, amount, "shard", row.shard_no, row.available)
+
+    if await _require_specification(db, customer_id, customer_public_id):
+        rows = (await db.execute(_SPREAD_RESERVE_SQL, {"customer_id": customer_id, "amount": amount})).all()
+        if rows:
+            return _reservation_result(customer_public_id, amount, "shards", None, sum(row.available for row in rows))
+    raise UnprocessableEntityException(f"Kredit customer {customer_public_id} tidak cukup untuk {amount}.")
+
+
+async def release_credit(db: AsyncSession, customer_public_id: uuid.UUID, amount: Decimal) -> dict:
+    """
+    Kembalikan kredit hasil `reserve_credit` (order batal / lunas). Raise 422 kalau hasilnya
+    melebihi limit customer (`default_credit_limit`): release tidak bisa menciptakan kredit.
+    Customer biasa: satu UPDATE bersyarat. Customer ber-shard: spesifikasi dikunci dulu supaya
+    release bersamaan tidak sama-sama lolos cek total (reservasi hanya mengurangi, aman).
+    """
+    customer_id = await resolve_id(db, Customer, customer_public_id)
+
+    remaining = (await db.execute(
+        update(CustomerSpecification)
+        .where(
+            CustomerSpecification.customer_id == customer_id,
+            CustomerSpecification.credit_shard_count == 0,
+            _MAIN_AVAILABLE + amount <= _CREDIT_LIMIT,
+        )
+        .values(current_credit_limit=_MAIN_AVAILABLE + amount)
+        .returning(CustomerSpecification.current_credit_limit)
+    )).scalar_one_or_none()
+    if remaining is not None:
+        return _reservation_result(customer_public_id, amount, "main", None, remaining)
+
+    spec = (await db.execute(
+        select(
+            CustomerSpecification.credit_shard_count,
+            _MAIN_AVAILABLE.label("main_available"),
+            _CREDIT_LIMIT.label("credit_limit"),
+        )
+        .where(CustomerSpecification.customer_id == customer_id)
+        .with_for_update()
+    )).first()
+    if spec is None:
+        raise NotFoundException(f"Customer with public_id {customer_public_id} has no credit specification.")
+    if spec.credit_shard_count > 0:
+        shard_total = await db.scalar(
+            select(func.coalesce(func.sum(CustomerCreditShard.available), 0))
+            .where(CustomerCreditShard.customer_id == customer_id)
+        )
+        if spec.main_available + shard_total + amount <= spec.credit_limit:
+            row = await _update_one_shard(db, customer_id, amount, Decimal(0))
+            if row is not None:
+                return _reservation_result(customer_public_id, amount, "shard", row.shard_no, row.available)
+            raise UnprocessableEntityException(
+                f"Sub-ledger kredit customer {customer_public_id} kosong, set ulang jumlah shard."
+            )
+    raise UnprocessableEntityException(
+        f"Release {amount} membuat kredit customer {customer_public_id} melebihi limit {spec.credit_limit}."
+    )
+
+
+async def get_credit_balance(db: AsyncSession, customer_public_id: uuid.UUID) -> dict:
+    """Kredit tersedia = ledger utama + jumlah semua shard. Satu query."""
+    customer_id = await resolve_id(db, Customer, customer_public_id)
+    shard_total = (
+        select(func.coalesce(func.sum(CustomerCreditShard.available), 0))
+        .where(CustomerCreditShard.customer_id == customer_id)
+        .scalar_subquery()
+    )
+    row = (await db.execute(
+        select(
+            CustomerSpecification.default_credit_limit,
+            CustomerSpecification.credit_shard_count,
+            (_MAIN_AVAILABLE + shard_total).label("available_credit"),
+        )
+        .where(CustomerSpecification.customer_id == customer_id)
+    )).first()
+    if row is None:
+        raise NotFoundException(f"Customer with public_id {customer_public_id} has no credit specification.")
+    return {
+        "customer_public_id": customer_public_id,
+        "credit_limit": float(row.default_credit_limit or 0),
+        "available_credit": float(row.available_credit),
+        "credit_shard_count": row.credit_shard_count,
+    }
+
+
+def _split_evenly(total: Decimal, parts: int) -> List[Decimal]:
+    """Bagi rata per sen; sisa pembagian diberikan ke shard awal."""
+    cents = int(total * 100)
+    base, remainder = divmod(cents, parts)
+    return [Decimal(base + (1 if index < remainder else 0)) / 100 for index in range(parts)]
+
+
+async def set_credit_shards(db: AsyncSession, customer_public_id: uuid.UUID, shard_count: int) -> dict:
+    """
+    Aktifkan / ubah / matikan (0) sub-ledger. Seluruh kredit tersedia dikumpulkan lalu dibagi rata
+    ulang. Operasi admin yang jarang: spesifikasi & semua shard customer dikunci selama prosesnya.
+    """
+    customer_id = await resolve_id(db, Customer, customer_public_id)
+    main_available = (await db.execute(
+        select(_MAIN_AVAILABLE)
+        .where(CustomerSpecification.customer_id == customer_id)
+        .with_for_update()
+    )).scalar_one_or_none()
+    if main_available is None:
+        raise NotFoundException(f"Customer with public_id {customer_public_id} has no credit specification.")
+    shard_values = (await db.execute(
+        select(CustomerCreditShard.available)
+        .where(CustomerCreditShard.customer_id == customer_id)
+        .order_by(CustomerCreditShard.shard_no)
+        .with_for_update()
+    )).scalars().all()
+    total = Decimal(main_available) + sum((Decimal(value) for value in shard_values), Decimal(0))
+
+    await db.execute(delete(CustomerCreditShard).where(CustomerCreditShard.customer_id == customer_id))
+    if shard_count > 0:
+        await db.execute(insert(CustomerCreditShard), [
+            {"customer_id": customer_id, "shard_no": shard_no, "available": available}
+            for shard_no, available in enumerate(_split_evenly(total, shard_count))
+        ])
+    await db.execute(
+        update(CustomerSpecification)
+        .where(CustomerSpecification.customer_id == customer_id)
+        .values(current_credit_limit=0 if shard_count > 0 else total, credit_shard_count=shard_count)
+    )
+    return await get_credit_balance(db, customer_public_id)
@@ -1,18 +1,23 @@
 # file: app/services/customer_service.py
 
-from typing import List, Optional
+import base64
+import json
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, literal, insert, delete, text, union_all, values, column, Integer, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, load_only
+from sqlalchemy.orm import selectinload, joinedload, load_only, aliased
 import uuid
 
 # Impor model yang relevan
 from app.models.users.customer import (
     Customer, 
     Branch, 
+    BranchClosure,
     Location, 
     CustomerDetails, 
-    CustomerSpecification
+    CustomerSpecification,
+    CustomerTypeEnum
 )
 
 # Impor skema yang sudah kita finalisasi
@@ -23,6 +28,9 @@ from app.schema.internal.user.customer import (
     BranchNestedCreate
 )
 
+from app.service.internal.user.lookup_cache import mark_lookup_dirty
+from app.service.internal.user.public_ids import get_by_public_id, resolve_id
+
 # Impor exception kustom
 from app.core.exceptions import NotFoundException, BadRequestException
 
@@ -32,66 +40,157 @@ from app.core.exceptions import NotFoundException, BadRequestException
 
 async def _get_customer_by_public_id(db: AsyncSession, public_id: uuid.UUID) -> Customer:
     """Helper untuk mengambil customer berdasarkan public_id, raise error jika tidak ada."""
-    query = select(Customer).where(Customer.public_id == public_id)
-    result = await db.execute(query)
-    customer = result.scalar_one_or_none()
-    if not customer:
-        raise NotFoundException(f"Customer with public_id {public_id} not found.")
-    return customer
+    return await get_by_public_id(db, Customer, public_id)
 
 async def _get_branch_by_public_id(db: AsyncSession, public_id: uuid.UUID) -> Branch:
     """Helper untuk mengambil branch berdasarkan public_id, raise error jika tidak ada."""
-    query = select(Branch).where(Branch.public_id == public_id)
-    result = await db.execute(query)
-    branch = result.scalar_one_or_none()
-    if not branch:
-        raise NotFoundException(f"Branch with public_id {public_id} not found.")
-    return branch
+    return await get_by_public_id(db, Branch, public_id)
 
 async def _get_location_by_public_id(db: AsyncSession, public_id: uuid.UUID) -> Location:
     """Helper untuk mengambil location berdasarkan public_id, raise error jika tidak ada."""
-    query = select(Location).where(Location.public_id == public_id)
-    result = await db.execute(query)
-    location = result.scalar_one_or_none()
-    if not location:
-        raise NotFoundException(f"Location with public_id {public_id} not found.")
-    return location    
+    return await get_by_public_id(db, Location, public_id)
+
+# =============================================================================
+# CLOSURE TABLE BRANCH (ancestor, descendant, depth)
+# Setiap operasi yang mengubah `Branch.parent_id` WAJIB lewat helper di sini.
+# Delete tidak perlu: baris closure ikut terhapus lewat FK ON DELETE CASCADE.
+# =============================================================================
+
+async def _lock_branch_hierarchy(db: AsyncSession, customer_ids: Iterable[int]) -> None:
+    """
+    Serialisasi penulisan hierarki branch per customer (pindah branch, tambah branch di bawah
+    parent yang sudah ada). Tanpa ini dua pemindahan bersamaan (A ke bawah B, B ke bawah A)
+    sama-sama lolos cek turunan dan meninggalkan siklus. Urut id supaya tidak deadlock.
+    FOR NO KEY UPDATE: tidak menghalangi insert biasa yang cuma butuh FK ke customer.
+    """
+    ids = sorted(set(customer_ids))
+    if ids:
+        await db.execute(
+            select(Customer.id).where(Customer.id.in_(ids)).order_by(Customer.id).with_for_update(key_share=True)
+        )
+
+async def _insert_branch_closure(db: AsyncSession, links: List[Tuple[int, Optional[int]]]) -> None:
+    """
+    Daftarkan branch-branch BARU (belum punya anak) dalam satu statement:
+    baris diri sendiri + semua ancestor parent-nya. `links` = [(branch_id, parent_id), ...];
+    parent harus sudah terdaftar lebih dulu (level sebelumnya).
+    """
+    if not links:
+        return
+    new_branches = values(
+        column("branch_id", Integer), column("parent_id", Integer), name="new_branches"
+    ).data(links)
+    rows = union_all(
+        select(
+            new_branches.c.branch_id.label("ancestor_id"),
+            new_branches.c.branch_id.label("descendant_id"),
+            literal(0).label("depth"),
+        ),
+        select(BranchClosure.ancestor_id, new_branches.c.branch_id, BranchClosure.depth + 1)
+        .join(new_branches, BranchClosure.descendant_id == new_branches.c.parent_id),
+    )
+    await db.execute(
+        insert(BranchClosure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+    )
+
+async def _move_branch_closure(db: AsyncSession, branch_id: int, new_parent_id: Optional[int]) -> None:
+    """
+    Pindahkan subtree `branch_id` ke bawah `new_parent_id` (None = jadi root).
+    Putus hubungan subtree dengan ancestor lamanya, lalu sambungkan ke ancestor baru.
+    """
+    subtree = select(BranchClosure.descendant_id).where(BranchClosure.ancestor_id == branch_id)
+    old_ancestors = select(BranchClosure.ancestor_id).where(
+        BranchClosure.descendant_id == branch_id, BranchClosure.ancestor_id != branch_id
+    )
+    await db.execute(
+        delete(BranchClosure).where(
+            BranchClosure.descendant_id.in_(subtree),
+            BranchClosure.ancestor_id.in_(old_ancestors),
+        )
+    )
+    if new_parent_id is None:
+        return
+    above = aliased(BranchClosure)
+    below = aliased(BranchClosure)
+    await db.execute(
+        insert(BranchClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, below.ancestor_id == branch_id)
+            .where(above.descendant_id == new_parent_id),
+        )
+    )
+
+async def rebuild_branch_closure(db: AsyncSession) -> int:
+    """Bangun ulang seluruh closure table dari `branches.parent_id` (manage.py db rebuild-branch-closure)."""
+    await db.execute(text(f"TRUNCATE {BranchClosure.__tablename__}"))
+    result = await db.execute(text(f"""
+        WITH RECURSIVE pairs(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM branches
+            UNION ALL
+            SELECT pairs.ancestor_id, branches.id, pairs.depth + 1
+            FROM pairs JOIN branches ON branches.parent_id = pairs.descendant_id
+        )
+        INSERT INTO {BranchClosure.__tablename__} (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM pairs
+    """))
+    return result.rowcount
+
+async def _insert_branch_levels(
+    db: AsyncSession,
+    roots: List[Tuple[BranchNestedCreate, int, Optional[int]]]
+) -> Tuple[int, int]:
+    """
+    Membuat pohon branch dan location, level demi level (breadth-first).
+    `roots` = [(branch_data, customer_id, parent_id), ...]; boleh campur beberapa customer
+    sekaligus (dipakai onboarding massal). Per level: satu INSERT multi-row ... RETURNING id
+    untuk branch + satu insert closure. Semua location masuk di akhir lewat satu executemany.
+    Round trip = 2 x kedalaman pohon + 1, tidak tergantung jumlah branch.
+    Mengembalikan (jumlah branch, jumlah location).
+    """
+    # Menempel ke parent yang sudah ada: closure parent-nya dibaca, jadi kunci dulu
+    await _lock_branch_hierarchy(db, (customer_id for _, customer_id, parent_id in roots if parent_id is not None))
+    level = roots
+    branch_count = 0
+    location_rows = []
+    while level:
+        result = await db.execute(
+            insert(Branch).returning(Branch.id, sort_by_parameter_order=True),
+            [
+                {"name": branch_data.name, "customer_id": customer_id, "parent_id": parent_id}
+                for branch_data, customer_id, parent_id in level
+            ]
+        )
+        branch_ids = result.scalars().all()
+        await _insert_branch_closure(
+            db, [(branch_id, parent_id) for branch_id, (_, _, parent_id) in zip(branch_ids, level)]
+        )
+        branch_count += len(branch_ids)
+
+        next_level = []
+        for branch_id, (branch_data, customer_id, _) in zip(branch_ids, level):
+            # Langsung unpack skema ke model karena namanya sudah konsisten
+            location_rows.extend({**loc_data.model_dump(), "branch_id": branch_id} for loc_data in branch_data.locations)
+            next_level.extend((child_data, customer_id, branch_id) for child_data in branch_data.children)
+        level = next_level
+
+    if location_rows:
+        await db.execute(insert(Location), location_rows)
+    mark_lookup_dirty(db)
+    return branch_count, len(location_rows)
 
-async def _create_branch_hierarchy_recursive(
+async def _create_branch_hierarchy(
     db: AsyncSession, 
     branch_data_list: List[BranchNestedCreate], 
     customer: Customer, 
     parent_branch: Optional[Branch] = None
 ):
-    """
-    Fungsi rekursif privat untuk membuat seluruh pohon branch dan location.
-    Ini adalah inti dari orkestrasi.
-    """
-    for branch_data in branch_data_list:
-        # 1. Buat objek Branch
-        new_branch = Branch(
-            name=branch_data.name,
-            customer_id=customer.id,
-            parent_id=parent_branch.id if parent_branch else None
-        )
-        
-        # 2. Buat semua Location untuk branch ini
-        for loc_data in branch_data.locations:
-            # Langsung unpack skema ke model karena namanya sudah konsisten
-            new_loc = Location(**loc_data.model_dump())
-            new_branch.locations.append(new_loc)
-            
-        db.add(new_branch)
-        await db.flush() # Flush untuk mendapatkan ID branch baru
-
-        # 3. Panggil fungsi ini lagi untuk semua anak cabang (rekursi)
-        if branch_data.children:
-            await _create_branch_hierarchy_recursive(
-                db, 
-                branch_data.children, 
-                customer, 
-                parent_branch=new_branch
-            )
+    """Membuat seluruh pohon branch dan location milik satu customer (lihat `_insert_branch_levels`)."""
+    parent_id = parent_branch.id if parent_branch else None
+    await _insert_branch_levels(
+        db, [(branch_data, customer.id, parent_id) for branch_data in branch_data_list]
+    )
 
 # =============================================================================
 # FUNGSI SERVICE UTAMA (PUBLIK)
@@ -115,8 +214,8 @@ async def onboard_customer(db: AsyncSession, payload: CustomerOnboard) -> Custom
     db.add(new_customer)
     await db.flush() # Penting untuk mendapatkan ID customer sebelum membuat branch
 
-    # 2. Panggil helper rekursif untuk membuat seluruh struktur di bawahnya
-    await _create_branch_hierarchy_recursive(
+    # 2. Panggil helper untuk membuat seluruh struktur di bawahnya (per level)
+    await _create_branch_hierarchy(
         db, 
         payload.branches, 
         customer=new_customer
@@ -147,9 +246,9 @@ async def add_branch_to_customer(
     # 1. Cari customer yang dituju
     customer = await _get_customer_by_public_id(db, customer_public_id)
     
-    # 2. Panggil helper rekursif untuk membuat struktur branch
+    # 2. Panggil helper untuk membuat struktur branch
     # Kita mengirimkan list berisi satu item karena payload-nya hanya satu branch_data
-    await _create_branch_hierarchy_recursive(
+    await _create_branch_hierarchy(
         db, 
         [payload.branch_data], 
         customer=customer
@@ -167,53 +266,167 @@ async def add_location_to_branch(
     """
     SKENARIO 3: Menambahkan satu Location baru ke Branch yang sudah ada.
     """
-    # 1. Cari branch yang dituju
-    branch = await _get_branch_by_public_id(db, branch_public_id)
+    # 1. Cari branch yang dituju (cukup id-nya, biasanya dari cache)
+    branch_id = await resolve_id(db, Branch, branch_public_id)
     
     # 2. Buat objek Location baru
-    new_location = Location(**payload.model_dump(), branch_id=branch.id)
+    new_location = Location(**payload.model_dump(), branch_id=branch_id)
     db.add(new_location)
     await db.flush()
     await db.refresh(new_location)
     
     return new_location
 
-async def get_all_customers(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Customer]:
+def _encode_customer_cursor(name: str, customer_id: int) -> str:
+    """Bungkus posisi keyset (name, id) jadi token opaque untuk client."""
+    raw = json.dumps([name, customer_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_customer_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, customer_id = json.loads(raw)
+        return str(name), int(customer_id)
+    except (ValueError, TypeError):
+        raise BadRequestException("Cursor customer tidak valid.")
+
+async def _estimated_customer_count(db: AsyncSession) -> Optional[int]:
     """
-    Mengambil daftar semua customer (data dasar, tanpa relasi berat).
-    Bagus untuk halaman list/tabel utama.
+    Perkiraan jumlah baris dari statistik planner (pg_class.reltuples), O(1).
+    None kalau tabel belum pernah di-ANALYZE / VACUUM (reltuples = -1).
     """
-    query = select(Customer).offset(skip).limit(limit).order_by(Customer.name)
-    result = await db.execute(query)
-    return result.scalars().all()
+    estimate = (await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'customers'::regclass")
+    )).scalar()
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+async def get_all_customers(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    customer_types: Optional[Sequence[CustomerTypeEnum]] = None,
+) -> Tuple[List[Customer], Optional[str], int, bool]:
+    """
+    Satu halaman customer (data dasar, tanpa relasi berat) untuk list/tabel utama.
+    Keyset pagination di (name, id): biaya tiap halaman sama, sejauh apa pun halamannya.
+    Mengembalikan (customers, next_cursor, total, total_is_estimate):
+    - tanpa filter : total = perkiraan planner (tabel tidak di-count tiap request)
+    - dengan filter: total = COUNT exact lewat index (customer_type, name, id)
+    """
+    filters = [Customer.customer_type.in_(customer_types)] if customer_types else []
+    query = select(Customer).where(*filters).order_by(Customer.name, Customer.id).limit(limit + 1)
+    if cursor:
+        cursor_name, cursor_id = _decode_customer_cursor(cursor)
+        query = query.where(tuple_(Customer.name, Customer.id) > tuple_(cursor_name, cursor_id))
+    rows = (await db.execute(query)).scalars().all()
 
-async def get_customer_with_full_hierarchy(db: AsyncSession, customer_public_id: uuid.UUID) -> Optional[Customer]:
+    customers = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_customer_cursor(customers[-1].name, customers[-1].id)
+
+    total = None if filters else await _estimated_customer_count(db)
+    total_is_estimate = total is not None
+    if total_is_estimate and not cursor:
+        # Statistik bisa tertinggal dari isi tabel; jangan sampai lebih kecil dari halaman pertama
+        total = max(total, len(rows))
+    if total is None:
+        total = (await db.execute(select(func.count()).select_from(Customer).where(*filters))).scalar_one()
+    return customers, next_cursor, total, total_is_estimate
+
+def _branch_tree_cte(root_condition):
+    """
+    CTE `WITH RECURSIVE` untuk seluruh pohon branch di bawah `root_condition`
+    (mis. `Branch.parent_id.is_(None)` + customer_id, atau satu branch tertentu).
+    Kolom: id, parent_id, depth (root = 0). Berapapun kedalamannya tetap satu query.
+    """
+    anchor = (
+        select(Branch.id, Branch.parent_id, literal(0).label("depth"))
+        .where(root_condition)
+        .cte("branch_tree", recursive=True)
+    )
+    child = aliased(Branch)
+    return anchor.union_all(
+        select(child.id, child.parent_id, (anchor.c.depth + 1).label("depth"))
+        .join(anchor, child.parent_id == anchor.c.id)
+    )
+
+async def _load_branch_tree(db: AsyncSession, root_condition) -> List[dict]:
+    """
+    Muat satu pohon branch lengkap dengan location-nya dalam DUA query
+    (branch via CTE rekursif, lalu semua location-nya), lalu rakit di Python O(n).
+    Hasil: list node root berbentuk `BranchResponse` (dict; location tetap objek ORM).
+    """
+    tree = _branch_tree_cte(root_condition)
+    branch_rows = (await db.execute(
+        select(
+            Branch.id,
+            Branch.public_id,
+            Branch.created_at,
+            Branch.updated_at,
+            Branch.name,
+            tree.c.parent_id,
+            tree.c.depth,
+        )
+        .join(tree, tree.c.id == Branch.id)
+        .order_by(tree.c.depth, Branch.id)
+    )).all()
+    if not branch_rows:
+        return []
+
+    locations = (await db.execute(
+        select(Location)
+        .where(Location.branch_id.in_([row.id for row in branch_rows]))
+        .order_by(Location.id)
+    )).scalars().all()
+
+    nodes = {}
+    roots = []
+    for row in branch_rows:
+        node = {
+            "public_id": row.public_id,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "name": row.name,
+            "locations": [],
+            "children": [],
+        }
+        nodes[row.id] = node
+        # Urut depth: parent pasti sudah ada di `nodes`, kecuali untuk root
+        parent = nodes.get(row.parent_id) if row.depth > 0 else None
+        (parent["children"] if parent is not None else roots).append(node)
+    for location in locations:
+        nodes[location.branch_id]["locations"].append(location)
+    return roots
+
+async def get_customer_with_full_hierarchy(db: AsyncSession, customer_public_id: uuid.UUID) -> dict:
     """
     Mengambil SATU customer LENGKAP dengan seluruh hierarki branch dan location-nya.
-    Ini adalah query yang berat, gunakan hanya untuk halaman detail.
+    Jumlah query tetap 3 (customer + detail, CTE branch, location) berapapun kedalaman pohonnya.
+    `branches` berisi branch root saja; turunannya ada di `children` masing-masing.
     """
-    customer = await _get_customer_by_public_id(db, customer_public_id)
-    query = (
+    result = await db.execute(
         select(Customer)
-        .where(Customer.id == customer.id)
-        .options(
-            # Muat relasi 1-to-1
-            selectinload(Customer.details),
-            selectinload(Customer.specification),
-            selectinload(Customer.branches)
-            .selectinload(Branch.locations),
-            selectinload(Customer.branches)
-            .selectinload(Branch.children)
-            .selectinload(Branch.locations), # Anak level 1
-            selectinload(Customer.branches)
-            .selectinload(Branch.children)
-            .selectinload(Branch.children)
-            .selectinload(Branch.locations) # Anak level 2
-        )
+        .where(Customer.public_id == customer_public_id)
+        .options(joinedload(Customer.details), joinedload(Customer.specification))
     )
-    
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    customer = result.scalar_one_or_none()
+    if not customer:
+        raise NotFoundException(f"Customer with public_id {customer_public_id} not found.")
+
+    branches = await _load_branch_tree(
+        db, and_(Branch.customer_id == customer.id, Branch.parent_id.is_(None))
+    )
+    return {
+        "public_id": customer.public_id,
+        "created_at": customer.created_at,
+        "updated_at": customer.updated_at,
+        "name": customer.name,
+        "customer_type": customer.customer_type,
+        "details": customer.details,
+        "specification": customer.specification,
+        "branches": branches,
+    }
 
 async def get_branch_with_locations(db: AsyncSession, branch_public_id: uuid.UUID) -> Optional[Branch]:
     """
@@ -235,6 +448,116 @@ async def get_branch_with_locations(db: AsyncSession, branch_public_id: uuid.UUI
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
+async def move_branch(
+    db: AsyncSession, branch_public_id: uuid.UUID, new_parent_public_id: Optional[uuid.UUID]
+) -> Branch:
+    """
+    Pindahkan branch (beserta seluruh turunannya) ke parent lain di customer yang sama,
+    atau jadikan root kalau `new_parent_public_id` kosong. Closure table ikut diperbarui.
+    """
+    branch = await _get_branch_by_public_id(db, branch_public_id)
+    await _lock_branch_hierarchy(db, [branch.customer_id])
+    # Baca ulang setelah dapat lock: parent bisa sudah diubah transaksi yang baru selesai
+    await db.refresh(branch, ["parent_id"])
+    new_parent_id = None
+    if new_parent_public_id is not None:
+        new_parent = await _get_branch_by_public_id(db, new_parent_public_id)
+        if new_parent.customer_id != branch.customer_id:
+            raise BadRequestException("Branch hanya bisa dipindah di dalam customer yang sama.")
+        is_descendant = await db.scalar(
+            select(BranchClosure.depth).where(
+                BranchClosure.ancestor_id == branch.id, BranchClosure.descendant_id == new_parent.id
+            )
+        )
+        if is_descendant is not None:
+            raise BadRequestException("Branch tidak bisa dipindah ke bawah dirinya sendiri atau turunannya.")
+        new_parent_id = new_parent.id
+
+    if branch.parent_id != new_parent_id:
+        branch.parent_id = new_parent_id
+        await db.flush()
+        await _move_branch_closure(db, branch.id, new_parent_id)
+    return await get_branch_with_locations(db, branch_public_id)
+
+async def _branch_closure_lookup(db: AsyncSession, branch_public_id: uuid.UUID, query) -> list:
+    """Jalankan query closure; kalau kosong, bedakan 'branch tidak ada' (404) dari 'memang kosong'."""
+    rows = (await db.execute(query)).all()
+    if not rows:
+        await _get_branch_by_public_id(db, branch_public_id)
+    return rows
+
+async def get_branch_subtree(db: AsyncSession, branch_public_id: uuid.UUID) -> List[dict]:
+    """Branch ini + semua turunannya (flat, urut kedalaman). Satu lookup index closure."""
+    root = aliased(Branch)
+    parent = aliased(Branch)
+    query = (
+        select(
+            Branch.public_id,
+            Branch.name,
+            BranchClosure.depth,
+            parent.public_id.label("parent_public_id"),
+        )
+        .select_from(BranchClosure)
+        .join(root, root.id == BranchClosure.ancestor_id)
+        .join(Branch, Branch.id == BranchClosure.descendant_id)
+        .outerjoin(parent, parent.id == Branch.parent_id)
+        .where(root.public_id == branch_public_id)
+        .order_by(BranchClosure.depth, Branch.id)
+    )
+    rows = await _branch_closure_lookup(db, branch_public_id, query)
+    return [dict(row._mapping) for row in rows]
+
+async def get_branch_subtree_locations(db: AsyncSession, branch_public_id: uuid.UUID) -> List[Location]:
+    """Semua location di bawah branch ini (termasuk cabang-cabang turunannya)."""
+    root = aliased(Branch)
+    query = (
+        select(Location)
+        .join(BranchClosure, BranchClosure.descendant_id == Location.branch_id)
+        .join(root, root.id == BranchClosure.ancestor_id)
+        .where(root.public_id == branch_public_id)
+        .order_by(BranchClosure.depth, Location.id)
+    )
+    rows = await _branch_closure_lookup(db, branch_public_id, query)
+    return [row[0] for row in rows]
+
+def _ancestor_path_query(descendant_condition):
+    """Ancestor dari satu branch, urut dari root sampai branch itu sendiri."""
+    parent = aliased(Branch)
+    return (
+        select(
+            Branch.public_id,
+            Branch.name,
+            BranchClosure.depth,
+            parent.public_id.label("parent_public_id"),
+        )
+        .select_from(BranchClosure)
+        .join(Branch, Branch.id == BranchClosure.ancestor_id)
+        .outerjoin(parent, parent.id == Branch.parent_id)
+        .where(descendant_condition)
+        .order_by(BranchClosure.depth.desc())
+    )
+
+async def get_branch_ancestors(db: AsyncSession, branch_public_id: uuid.UUID) -> List[dict]:
+    """Jalur root -> ... -> branch ini. `depth` = jarak ke branch ini (root paling besar)."""
+    leaf = aliased(Branch)
+    query = _ancestor_path_query(
+        BranchClosure.descendant_id == select(leaf.id).where(leaf.public_id == branch_public_id).scalar_subquery()
+    )
+    rows = await _branch_closure_lookup(db, branch_public_id, query)
+    return [dict(row._mapping) for row in rows]
+
+async def get_location_branch_path(db: AsyncSession, location_public_id: uuid.UUID) -> List[dict]:
+    """Jalur branch sebuah location, dari root branch sampai branch pemilik location."""
+    query = _ancestor_path_query(
+        BranchClosure.descendant_id == select(Location.branch_id)
+        .where(Location.public_id == location_public_id)
+        .scalar_subquery()
+    )
+    rows = (await db.execute(query)).all()
+    if not rows:
+        raise NotFoundException(f"Location with public_id {location_public_id} not found.")
+    return [dict(row._mapping) for row in rows]
+
 async def get_location_details(db: AsyncSession, location_public_id: uuid.UUID) -> Optional[Location]:
     """
     Mengambil detail SATU lokasi.
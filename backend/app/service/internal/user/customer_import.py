@@ -0,0 +1,377 @@
+# file: app/service/internal/user/customer_import.py
+#
+# Onboarding customer massal dari export spreadsheet (NDJSON atau CSV).
+# File dibaca per baris (stream), divalidasi jadi `CustomerOnboard`, dikumpulkan per chunk,
+# lalu tiap chunk masuk di SATU transaksi sendiri:
+#   1. cek duplikat `customers.name` & `customer_details.npwp` ke DB (2 query per chunk),
+#   2. insert customer multi-row ... RETURNING id,
+#   3. details & spesifikasi lewat executemany,
+#   4. branch + closure per level, location sekaligus (`_insert_branch_levels`).
+# Chunk yang sudah commit tetap tersimpan walaupun chunk berikutnya gagal.
+# Chunk yang ditolak DB diulang per record (SAVEPOINT per record), jadi yang dilaporkan
+# gagal hanya record penyebabnya.
+#
+# NDJSON: satu baris = satu body `POST /customers/onboard` (CustomerOnboard).
+# CSV   : satu baris = satu location, header wajib. Kolom wajib:
+#   customer_name, customer_type, branch_path, location_name, state_province, city
+#   Kolom opsional: npwp, bank, rekening, default_credit_limit, current_credit_limit,
+#   default_payment_terms_days, dan field LocationCreate lain (location_type, country,
+#   postal_code, addr_line_1..3, longitude, latitude, is_default, is_active, location_pic,
+#   location_pic_contact, minimal_order_value, delivery_instructions).
+#   `branch_path` = nama branch dari root, dipisah " > " (mis. "Dinkes Jabar > Puskesmas Cimahi").
+#   Baris satu customer harus berurutan (dikelompokkan per `customer_name`),
+#   field di dalam kutip tidak boleh berisi baris baru.
+
+import csv
+import enum
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database.database import AsyncSessionLocal
+from app.models.users.customer import Customer, CustomerDetails, CustomerSpecification
+from app.schema.internal.user.customer import CustomerOnboard
+from app.service.internal.file_lines import validation_detail
+from app.service.internal.user.customer import _insert_branch_levels
+from app.service.internal.user.lookup_cache import mark_lookup_dirty
+
+logger = logging.getLogger(__name__)
+
+ONBOARD_CHUNK_SIZE = 100
+
+BRANCH_PATH_SEPARATOR = ">"
+
+CSV_REQUIRED_COLUMNS = (
+    "customer_name", "customer_type", "branch_path", "location_name", "state_province", "city",
+)
+CSV_DETAIL_COLUMNS = ("npwp", "bank", "rekening")
+CSV_SPEC_COLUMNS = ("default_credit_limit", "current_credit_limit", "default_payment_terms_days")
+CSV_LOCATION_COLUMNS = (
+    "location_type", "country", "state_province", "postal_code", "city",
+    "addr_line_1", "addr_line_2", "addr_line_3", "longitude", "latitude",
+    "is_default", "is_active", "location_pic", "location_pic_contact",
+    "minimal_order_value", "delivery_instructions",
+)
+# Field LocationCreate yang wajib ada di payload tapi boleh null: sel kosong -> None
+CSV_LOCATION_NULLABLE = (
+    "addr_line_1", "addr_line_2", "addr_line_3", "location_pic", "location_pic_contact", "delivery_instructions",
+)
+
+
+class CustomerImportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class OnboardReport:
+    """
+    Ringkasan hasil onboarding massal. Yang disimpan per record hanya error-nya.
+    `dry_run=True`: semua count adalah yang AKAN dibuat; tidak ada yang tersimpan.
+    """
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.created_count = 0
+        self.branch_count = 0
+        self.location_count = 0
+        self.errors: List[dict] = []
+        self.elapsed_seconds = 0.0
+
+    def add_error(self, row: int, ref: Optional[str], detail: str) -> None:
+        self.errors.append({"row": row, "ref": ref, "detail": detail})
+
+    @property
+    def customers_per_second(self) -> float:
+        return self.created_count / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "created_count": self.created_count,
+            "branch_count": self.branch_count,
+            "location_count": self.location_count,
+            "error_count": len(self.errors),
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "customers_per_second": round(self.customers_per_second, 1),
+        }
+
+
+# Record hasil parsing: (nomor baris, nama customer, dict mentah ATAU pesan error)
+RawRecord = Tuple[int, Optional[str], object]
+ChunkRecord = Tuple[int, str, CustomerOnboard]
+
+
+# =============================================================================
+# PARSER RECORD
+# =============================================================================
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[RawRecord]:
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row, None, f"JSON tidak valid: {exc.msg}"
+            continue
+        ref = raw.get("name") if isinstance(raw, dict) else None
+        # ref masuk ke report (Optional[str]); name non-string tidak dipakai sebagai ref
+        if not isinstance(ref, str):
+            ref = None
+        yield row, ref, raw
+
+
+def _csv_location(csv_row: dict) -> dict:
+    location = {"name": csv_row["location_name"]}
+    for column in CSV_LOCATION_COLUMNS:
+        value = csv_row.get(column)
+        if value:
+            location[column] = value
+        elif column in CSV_LOCATION_NULLABLE:
+            location[column] = None
+    return location
+
+
+def _csv_customer(rows: List[Tuple[int, dict]]) -> object:
+    """Rakit baris-baris CSV satu customer jadi dict berbentuk body `POST /customers/onboard`."""
+    first = rows[0][1]
+    roots: List[dict] = []
+    branches: Dict[Tuple[str, ...], dict] = {}
+    for row, csv_row in rows:
+        path = tuple(part.strip() for part in csv_row["branch_path"].split(BRANCH_PATH_SEPARATOR))
+        if not all(path):
+            return f"Baris {row}: branch_path '{csv_row['branch_path']}' tidak valid."
+        # Branch perantara yang belum punya baris location sendiri tetap dibuat (validasi min 1 location menyusul)
+        siblings = roots
+        for depth in range(1, len(path) + 1):
+            key = path[:depth]
+            if key not in branches:
+                branches[key] = {"name": key[-1], "locations": [], "children": []}
+                siblings.append(branches[key])
+            siblings = branches[key]["children"]
+        branches[path]["locations"].append(_csv_location(csv_row))
+    return {
+        "name": first["customer_name"],
+        "customer_type": first["customer_type"],
+        "details": {column: first.get(column) or None for column in CSV_DETAIL_COLUMNS},
+        "specification": {column: first[column] for column in CSV_SPEC_COLUMNS if first.get(column)},
+        "branches": roots,
+    }
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[RawRecord]:
+    header: Optional[List[str]] = None
+    group: List[Tuple[int, dict]] = []
+    group_ref = None
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            missing = [column for column in CSV_REQUIRED_COLUMNS if column not in header]
+            if missing:
+                yield row, None, f"Header CSV tidak lengkap, kolom hilang: {', '.join(missing)}"
+                return
+            continue
+        if len(values) != len(header):
+            yield row, None, f"Jumlah kolom {len(values)}, seharusnya {len(header)}."
+            continue
+        csv_row = {column: value.strip() for column, value in zip(header, values)}
+        ref = csv_row["customer_name"]
+        if group and ref != group_ref:
+            yield group[0][0], group_ref, _csv_customer(group)
+            group = []
+        group_ref = ref
+        group.append((row, csv_row))
+    if group:
+        yield group[0][0], group_ref, _csv_customer(group)
+
+
+# =============================================================================
+# LOADER PER CHUNK
+# =============================================================================
+
+async def _find_duplicates(db: AsyncSession, chunk: List[ChunkRecord]) -> Tuple[Set[str], Set[str]]:
+    """Nama & NPWP di chunk yang sudah ada di DB. Dua query IN, keduanya kena unique index."""
+    names = [payload.name for _, _, payload in chunk]
+    npwps = [payload.details.npwp for _, _, payload in chunk if payload.details.npwp]
+    existing_names = set((await db.execute(
+        select(Customer.name).where(Customer.name.in_(names))
+    )).scalars().all())
+    existing_npwps = set()
+    if npwps:
+        existing_npwps = set((await db.execute(
+            select(CustomerDetails.npwp).where(CustomerDetails.npwp.in_(npwps))
+        )).scalars().all())
+    return existing_names, existing_npwps
+
+
+async def _insert_chunk(db: AsyncSession, chunk: List[ChunkRecord]) -> Tuple[int, int]:
+    """Insert customer satu chunk beserta seluruh turunannya. Mengembalikan (jumlah branch, jumlah location)."""
+    result = await db.execute(
+        insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+        [{"name": payload.name, "customer_type": payload.customer_type} for _, _, payload in chunk],
+    )
+    customer_ids = result.scalars().all()
+    mark_lookup_dirty(db)
+    await db.execute(
+        insert(CustomerDetails),
+        [
+            {**payload.details.model_dump(), "customer_id": customer_id}
+            for customer_id, (_, _, payload) in zip(customer_ids, chunk)
+        ],
+    )
+    await db.execute(
+        insert(CustomerSpecification),
+        [
+            {**payload.specification.model_dump(), "customer_id": customer_id}
+            for customer_id, (_, _, payload) in zip(customer_ids, chunk)
+        ],
+    )
+    return await _insert_branch_levels(
+        db,
+        [
+            (branch_data, customer_id, None)
+            for customer_id, (_, _, payload) in zip(customer_ids, chunk)
+            for branch_data in payload.branches
+        ],
+    )
+
+
+def _db_error_detail(exc: SQLAlchemyError) -> str:
+    return str(getattr(exc, "orig", None) or exc)
+
+
+async def _finish(session: AsyncSession, dry_run: bool) -> None:
+    if dry_run:
+        await session.rollback()
+    else:
+        await session.commit()
+
+
+def _count_created(report: OnboardReport, created: int, branch_count: int, location_count: int) -> None:
+    report.created_count += created
+    report.branch_count += branch_count
+    report.location_count += location_count
+
+
+async def _load_records_one_by_one(records: List[ChunkRecord], report: OnboardReport, dry_run: bool) -> None:
+    """
+    Jalur lambat setelah chunk ditolak DB: tiap record di SAVEPOINT sendiri, satu transaksi.
+    Record yang ditolak dilaporkan dengan error-nya sendiri, sisanya tetap masuk.
+    """
+    created, branch_count, location_count = 0, 0, 0
+    async with AsyncSessionLocal() as session:
+        try:
+            for record in records:
+                row, ref, _ = record
+                try:
+                    async with session.begin_nested():
+                        branches, locations = await _insert_chunk(session, [record])
+                except SQLAlchemyError as exc:
+                    report.add_error(row, ref, _db_error_detail(exc))
+                    continue
+                created += 1
+                branch_count += branches
+                location_count += locations
+            await _finish(session, dry_run)
+        except SQLAlchemyError as exc:
+            await session.rollback()
+            logger.warning("Onboarding customer per record gagal: %s", exc)
+            detail = f"Gagal disimpan, tidak ada yang masuk: {_db_error_detail(exc)}"
+            for row, ref, _ in records:
+                report.add_error(row, ref, detail)
+            return
+    _count_created(report, created, branch_count, location_count)
+
+
+async def _load_chunk(chunk: List[ChunkRecord], report: OnboardReport, dry_run: bool) -> None:
+    """Satu chunk = satu session + satu transaksi. Ditolak DB -> diulang per record."""
+    valid: List[ChunkRecord] = []
+    async with AsyncSessionLocal() as session:
+        try:
+            existing_names, existing_npwps = await _find_duplicates(session, chunk)
+            for row, ref, payload in chunk:
+                if payload.name in existing_names:
+                    report.add_error(row, ref, f"Customer dengan nama '{payload.name}' sudah ada.")
+                elif payload.details.npwp and payload.details.npwp in existing_npwps:
+                    report.add_error(row, ref, f"NPWP {payload.details.npwp} sudah terdaftar.")
+                else:
+                    valid.append((row, ref, payload))
+            if not valid:
+                await session.rollback()
+                return
+            branch_count, location_count = await _insert_chunk(session, valid)
+            await _finish(session, dry_run)
+        except SQLAlchemyError as exc:
+            # Mis. customer yang sama masuk lewat request lain di antara cek duplikat & insert
+            await session.rollback()
+            logger.warning("Chunk onboarding customer gagal, diulang per record: %s", exc)
+            failed = valid or chunk
+        else:
+            failed = None
+    if failed is not None:
+        await _load_records_one_by_one(failed, report, dry_run)
+        return
+    _count_created(report, len(valid), branch_count, location_count)
+
+
+async def onboard_customers_bulk(
+    lines: AsyncIterator[str],
+    file_format: CustomerImportFormat,
+    chunk_size: int = ONBOARD_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> OnboardReport:
+    """
+    Onboard customer dari baris-baris file. Record yang gagal (format, skema, duplikat di
+    file maupun di DB) dicatat di report dan dilewati; sisanya tetap masuk.
+    Transaksi diatur per chunk di sini, jadi tidak menerima session dari pemanggil.
+    `dry_run=True`: semua chunk di-ROLLBACK (cek error saja); count di report = yang akan dibuat.
+    """
+    started = time.perf_counter()
+    records = _ndjson_records(lines) if file_format == CustomerImportFormat.NDJSON else _csv_records(lines)
+    report = OnboardReport(dry_run=dry_run)
+    # Duplikat di dalam file sendiri: cukup dicek di memori, DB baru tahu setelah commit
+    seen_names: Set[str] = set()
+    seen_npwps: Set[str] = set()
+    chunk: List[ChunkRecord] = []
+    async for row, ref, raw in records:
+        if isinstance(raw, str):
+            report.add_error(row, ref, raw)
+            continue
+        try:
+            payload = CustomerOnboard.model_validate(raw)
+        except ValidationError as exc:
+            report.add_error(row, ref, validation_detail(exc))
+            continue
+        npwp = payload.details.npwp
+        if payload.name in seen_names:
+            report.add_error(row, payload.name, "Nama customer duplikat di dalam file.")
+            continue
+        if npwp and npwp in seen_npwps:
+            report.add_error(row, payload.name, f"NPWP {npwp} duplikat di dalam file.")
+            continue
+        seen_names.add(payload.name)
+        if npwp:
+            seen_npwps.add(npwp)
+        chunk.append((row, payload.name, payload))
+        if len(chunk) >= chunk_size:
+            await _load_chunk(chunk, report, dry_run)
+            chunk = []
+    if chunk:
+        await _load_chunk(chunk, report, dry_run)
+    report.elapsed_seconds = time.perf_counter() - started
+    report.errors.sort(key=lambda error: error["row"])
+    return report
@@ -0,0 +1,192 @@
+# file: app/service/internal/user/geo.py
+#
+# Query spasial `Location` tanpa PostGIS: "k lokasi terdekat" dan "semua dalam radius X km".
+# Kolom generated `locations.geo_cell` (grid 0.1 derajat, B-tree) dipakai untuk mengambil
+# kandidat per kotak sel; jarak haversine yang akurat hanya dihitung untuk kandidat itu.
+#
+# - Radius : satu query untuk sel-sel yang menutupi seluruh lingkaran radius (rentang lintang/bujur
+#            dihitung langsung; lingkaran yang mencapai kutub memakai baris lintang penuh).
+# - kNN    : kotak diperlebar bertahap (cincin demi cincin, lebarnya berlipat) sampai
+#            k kandidat terdekat sudah pasti berada di dalam area yang sudah diperiksa.
+# Tidak menangani wrap di antimeridian (bujur +-180); wilayah operasional jauh dari situ.
+
+import math
+import uuid
+from typing import List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.exceptions import BadRequestException
+from app.models.users.customer import Location, GEO_GRID_CELLS_PER_DEGREE, GEO_GRID_COLUMNS
+from app.service.internal.user.customer import _get_location_by_public_id
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GEO_GRID_ROWS = 180 * GEO_GRID_CELLS_PER_DEGREE
+# Setengah lebar kotak (dalam sel) tiap langkah kNN; 64 sel ~ 700 km
+KNN_HALF_SIZES = (0, 1, 2, 4, 8, 16, 32, 64)
+MAX_RADIUS_KM = 500.0
+# Jarak ke tepi kotak dihitung sepanjang lingkaran lintang; sedikit dikurangi supaya tetap batas bawah
+_COVERED_SAFETY = 0.995
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _grid_position(lat: float, lon: float) -> Tuple[int, int]:
+    """(baris, kolom) sel, aturannya sama dengan GEO_CELL_SQL."""
+    row = math.floor((lat + 90) * GEO_GRID_CELLS_PER_DEGREE)
+    col = min(math.floor((lon + 180) * GEO_GRID_CELLS_PER_DEGREE), GEO_GRID_COLUMNS - 1)
+    return row, col
+
+def _band_ranges(row: int, col: int, inner: int, outer: int) -> List[Tuple[int, int]]:
+    """
+    Range nomor sel untuk kotak setengah-lebar `outer` di sekitar (row, col), minus kotak
+    `inner` yang sudah diperiksa (inner = -1: kotak penuh). Satu baris lintang = 1-2 range.
+    """
+    col_lo, col_hi = max(col - outer, 0), min(col + outer, GEO_GRID_COLUMNS - 1)
+    ranges = []
+    for band_row in range(max(row - outer, 0), min(row + outer, GEO_GRID_ROWS - 1) + 1):
+        base = band_row * GEO_GRID_COLUMNS
+        if inner < 0 or abs(band_row - row) > inner:
+            ranges.append((base + col_lo, base + col_hi))
+            continue
+        if col - inner - 1 >= col_lo:
+            ranges.append((base + col_lo, base + col - inner - 1))
+        if col + inner + 1 <= col_hi:
+            ranges.append((base + col + inner + 1, base + col_hi))
+    return ranges
+
+def _covered_km(lat: float, lon: float, row: int, col: int, half: int) -> float:
+    """Jarak minimum dari titik ke luar kotak setengah-lebar `half`: semua yang lebih dekat pasti ada di dalamnya."""
+    lat_lo = (row - half) / GEO_GRID_CELLS_PER_DEGREE - 90
+    lat_hi = (row + half + 1) / GEO_GRID_CELLS_PER_DEGREE - 90
+    lon_lo = (col - half) / GEO_GRID_CELLS_PER_DEGREE - 180
+    lon_hi = (col + half + 1) / GEO_GRID_CELLS_PER_DEGREE - 180
+    north_south = min(lat - lat_lo, lat_hi - lat) * KM_PER_DEGREE
+    # Tepi timur/barat paling sempit di sisi kotak yang paling dekat ke kutub
+    poleward = min(max(abs(lat_lo), abs(lat_hi)), 90.0)
+    east_west = min(lon - lon_lo, lon_hi - lon) * KM_PER_DEGREE * math.cos(math.radians(poleward))
+    return min(north_south, east_west) * _COVERED_SAFETY
+
+def _radius_ranges(lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+    """
+    Range sel yang menutupi seluruh lingkaran radius, dihitung langsung dari rentang
+    lintang/bujur lingkaran (tanpa loop, aman sampai kutub).
+    """
+    # Dilebarkan sedikit (_COVERED_SAFETY) supaya titik tepat di tepi tidak lolos karena pembulatan
+    radius_rad = min(radius_km / EARTH_RADIUS_KM / _COVERED_SAFETY, math.pi)
+    d_lat = math.degrees(radius_rad)
+    lat_lo, lat_hi = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+    # Lebar bujur maksimum lingkaran di bola: asin(sin(r) / cos(lat)). Kalau lingkarannya
+    # mencapai kutub (atau rasionya >= 1), semua bujur bisa masuk -> baris lintang penuh.
+    cos_lat = math.cos(math.radians(lat))
+    full_rows = lat + d_lat >= 90 or lat - d_lat <= -90 or math.sin(radius_rad) >= cos_lat
+    if full_rows:
+        col_lo, col_hi = 0, GEO_GRID_COLUMNS - 1
+    else:
+        d_lon = math.degrees(math.asin(math.sin(radius_rad) / cos_lat))
+        col_lo = max(math.floor((lon - d_lon + 180) * GEO_GRID_CELLS_PER_DEGREE), 0)
+        col_hi = min(math.floor((lon + d_lon + 180) * GEO_GRID_CELLS_PER_DEGREE), GEO_GRID_COLUMNS - 1)
+    # Baris GEO_GRID_ROWS hanya berisi lintang tepat 90 (aturan floor di GEO_CELL_SQL)
+    row_lo = max(math.floor((lat_lo + 90) * GEO_GRID_CELLS_PER_DEGREE), 0)
+    row_hi = min(math.floor((lat_hi + 90) * GEO_GRID_CELLS_PER_DEGREE), GEO_GRID_ROWS)
+    if full_rows:
+        # Baris penuh yang berurutan = satu range nomor sel
+        return [(row_lo * GEO_GRID_COLUMNS, row_hi * GEO_GRID_COLUMNS + GEO_GRID_COLUMNS - 1)]
+    return [
+        (band_row * GEO_GRID_COLUMNS + col_lo, band_row * GEO_GRID_COLUMNS + col_hi)
+        for band_row in range(row_lo, row_hi + 1)
+    ]
+
+async def _fetch_candidates(
+    db: AsyncSession,
+    ranges: List[Tuple[int, int]],
+    location_type: Optional[str],
+    active_only: bool,
+    exclude_id: Optional[int],
+) -> list:
+    if not ranges:
+        return []
+    query = (
+        select(
+            Location.id, Location.public_id, Location.name, Location.location_type, Location.city,
+            Location.latitude, Location.longitude, Location.is_active,
+        )
+        .where(or_(*[Location.geo_cell.between(lo, hi) for lo, hi in ranges]))
+    )
+    if location_type:
+        query = query.where(Location.location_type == location_type)
+    if active_only:
+        query = query.where(Location.is_active.is_(True))
+    if exclude_id is not None:
+        query = query.where(Location.id != exclude_id)
+    return (await db.execute(query)).all()
+
+def _with_distance(rows: list, lat: float, lon: float) -> List[Tuple[float, object]]:
+    return [(haversine_km(lat, lon, float(row.latitude), float(row.longitude)), row) for row in rows]
+
+def _to_dict(distance_km: float, row) -> dict:
+    return {
+        "public_id": row.public_id,
+        "name": row.name,
+        "location_type": row.location_type,
+        "city": row.city,
+        "latitude": float(row.latitude),
+        "longitude": float(row.longitude),
+        "is_active": row.is_active,
+        "distance_km": round(distance_km, 3),
+    }
+
+async def find_nearby_locations(
+    db: AsyncSession,
+    lat: float,
+    lon: float,
+    k: int = 10,
+    radius_km: Optional[float] = None,
+    location_type: Optional[str] = None,
+    active_only: bool = True,
+    exclude_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Maksimal `k` lokasi terdekat dari (lat, lon), urut jarak. Dengan `radius_km`:
+    hanya yang di dalam radius (satu query). Tanpa radius: kNN bertahap, pencarian
+    berhenti di KNN_HALF_SIZES terakhir (~700 km) kalau kandidat masih kurang.
+    """
+    row, col = _grid_position(lat, lon)
+    if radius_km is not None:
+        rows = await _fetch_candidates(db, _radius_ranges(lat, lon, radius_km), location_type, active_only, exclude_id)
+        found = sorted(
+            (item for item in _with_distance(rows, lat, lon) if item[0] <= radius_km), key=lambda item: item[0]
+        )
+        return [_to_dict(distance, row) for distance, row in found[:k]]
+
+    found: List[Tuple[float, object]] = []
+    inner = -1
+    for half in KNN_HALF_SIZES:
+        rows = await _fetch_candidates(db, _band_ranges(row, col, inner, half), location_type, active_only, exclude_id)
+        found.extend(_with_distance(rows, lat, lon))
+        inner = half
+        covered = _covered_km(lat, lon, row, col, half)
+        if sum(1 for distance, _ in found if distance <= covered) >= k:
+            break
+    found.sort(key=lambda item: item[0])
+    return [_to_dict(distance, row) for distance, row in found[:k]]
+
+async def find_nearby_locations_from(
+    db: AsyncSession,
+    location_public_id: uuid.UUID,
+    **options,
+) -> List[dict]:
+    """Sama dengan `find_nearby_locations`, titik asalnya koordinat sebuah Location (tidak ikut di hasil)."""
+    origin = await _get_location_by_public_id(db, location_public_id)
+    if origin.latitude is None or origin.longitude is None:
+        raise BadRequestException(f"Location {location_public_id} belum punya koordinat.")
+    return await find_nearby_locations(
+        db, float(origin.latitude), float(origin.longitude), exclude_id=origin.id, **options
+    )
@@ -0,0 +1,139 @@
+# file: app/service/internal/user/lookup_cache.py
+#
+# Snapshot `GET /customers/lookup/all` (customer -> branch -> location untuk filter/dropdown).
+# Seluruh pohon disimpan sebagai bytes JSON siap kirim + ETag, di bawah nomor versi.
+# Setiap write customer/branch/location yang COMMIT menaikkan versi; request berikutnya
+# membangun ulang snapshot (3 query Core + orjson), sisanya dilayani dari memori.
+#
+# Versi naik lewat dua jalur:
+# - write ORM (Customer/Branch/Location di session.new/dirty/deleted) -> otomatis di `after_flush`,
+# - write Core (`insert(Branch)`, import massal) -> service memanggil `mark_lookup_dirty(db)`.
+# Keduanya baru menaikkan versi di `after_commit`, jadi snapshot tidak pernah dibangun
+# dari data yang belum commit lalu disimpan sebagai versi terbaru.
+#
+# Cache per worker; TTL membatasi data basi dari write yang terjadi di proses lain.
+# ETag dihitung dari isi body, jadi sama di semua worker selama datanya sama.
+# Snapshot juga membawa token delta-sync (lookup_sync.py) dari transaksi yang membangunnya.
+#
+# Bentuk JSON = List[CustomerLookup] (FeResLookup: public_id, name dulu).
+
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.models.users.customer import Customer, Branch, Location
+from app.service.internal.user.lookup_sync import current_sync_token
+
+LOOKUP_SNAPSHOT_TTL_SECONDS = 60.0
+
+_DIRTY_FLAG = "customer_lookup_dirty"
+_LOOKUP_MODELS = (Customer, Branch, Location)
+
+
+class LookupSnapshotCache:
+    """
+    Satu snapshot: (versi saat mulai dibangun, expires_at, etag, body, sync_token).
+    Rebuild dijaga lock supaya banyak request bersamaan tidak membangun snapshot yang sama berkali-kali.
+    """
+
+    def __init__(self, ttl_seconds: float = LOOKUP_SNAPSHOT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._snapshot: Optional[Tuple[int, float, str, bytes, str]] = None
+        self._lock = asyncio.Lock()
+
+    def bump(self) -> None:
+        self.version += 1
+
+    def current(self) -> Optional[Tuple[str, bytes, str]]:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != self.version or snapshot[1] < time.monotonic():
+            return None
+        return snapshot[2], snapshot[3], snapshot[4]
+
+    async def get(self, db: AsyncSession) -> Tuple[str, bytes, str]:
+        cached = self.current()
+        if cached is not None:
+            return cached
+        async with self._lock:
+            cached = self.current()
+            if cached is not None:
+                return cached
+            # Versi dicatat SEBELUM baca DB: write yang commit di tengah jalan bikin snapshot ini langsung basi
+            version = self.version
+            sync_token = await current_sync_token(db)
+            body = await _build_lookup_body(db)
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            self._snapshot = (version, time.monotonic() + self.ttl_seconds, etag, body, sync_token)
+            return etag, body, sync_token
+
+
+lookup_snapshot_cache = LookupSnapshotCache()
+
+
+def mark_lookup_dirty(db: AsyncSession) -> None:
+    """Panggil setelah write Core yang menyentuh customers/branches/locations (tidak lewat ORM)."""
+    db.info[_DIRTY_FLAG] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty_on_flush(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _LOOKUP_MODELS):
+            session.info[_DIRTY_FLAG] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    # Flag tidak dibersihkan saat rollback: naik versi yang sia-sia cuma berarti satu rebuild
+    if session.info.pop(_DIRTY_FLAG, False):
+        lookup_snapshot_cache.bump()
+
+
+async def _build_lookup_body(db: AsyncSession) -> bytes:
+    """Seluruh pohon lookup, berapapun kedalamannya. Tepat 3 query (customer, branch, location)."""
+    customer_rows = (await db.execute(
+        select(Customer.id, Customer.public_id, Customer.name).order_by(Customer.name)
+    )).all()
+    branch_rows = (await db.execute(
+        select(Branch.id, Branch.public_id, Branch.name, Branch.customer_id, Branch.parent_id).order_by(Branch.id)
+    )).all()
+    location_rows = (await db.execute(
+        select(Location.public_id, Location.name, Location.location_type, Location.branch_id).order_by(Location.id)
+    )).all()
+
+    branches: Dict[int, dict] = {
+        row.id: {"public_id": row.public_id, "name": row.name, "locations": [], "children": []}
+        for row in branch_rows
+    }
+    # Baris yang commit di antara 3 query (induknya belum terbaca) dilewati saja;
+    # commit itu sudah menaikkan versi, jadi snapshot ini dibangun ulang di request berikutnya
+    for row in location_rows:
+        branch = branches.get(row.branch_id)
+        if branch is not None:
+            branch["locations"].append({"public_id": row.public_id, "name": row.name, "location_type": row.location_type})
+    roots_by_customer: Dict[int, List[dict]] = {}
+    for row in branch_rows:
+        if row.parent_id is None:
+            roots_by_customer.setdefault(row.customer_id, []).append(branches[row.id])
+        elif row.parent_id in branches:
+            branches[row.parent_id]["children"].append(branches[row.id])
+
+    customers = [
+        {"public_id": row.public_id, "name": row.name, "branches": roots_by_customer.get(row.id, [])}
+        for row in customer_rows
+    ]
+    return orjson.dumps(customers)
+
+
+async def get_lookup_snapshot(db: AsyncSession) -> Tuple[str, bytes, str]:
+    """(etag, body JSON, sync token) untuk `/customers/lookup/all`. Query DB hanya kalau versi berubah / TTL habis."""
+    return await lookup_snapshot_cache.get(db)
+
@@ -0,0 +1,142 @@
+# file: app/service/internal/user/lookup_sync.py
+#
+# Delta-sync lookup customer -> branch -> location (`GET /customers/lookup/changes?since=`).
+# Client yang sudah memegang pohon dari `/customers/lookup/all` (header `X-Sync-Token`)
+# cukup mengambil baris yang berubah sejak token itu:
+# - upsert : customers/branches/locations dengan `updated_at` > token (index updated_at),
+# - delete : `lookup_tombstones` (diisi trigger AFTER DELETE) dengan `deleted_at` > token.
+#
+# `updated_at`/`deleted_at` = now() = waktu MULAI transaksi penulisnya, bukan waktu commit.
+# Transaksi yang mulai sebelum token tapi baru commit sesudahnya bisa terlewat, jadi batas
+# bawah dimundurkan SYNC_OVERLAP_SECONDS. Akibatnya beberapa baris bisa terkirim dua kali;
+# client harus memperlakukan semuanya sebagai upsert/delete idempoten.
+
+import base64
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException, GoneException
+from app.models.users.customer import Customer, Branch, Location, LookupTombstone
+
+SYNC_OVERLAP_SECONDS = 60
+# Lebih dari ini per jenis entitas -> lebih murah client memuat ulang `/lookup/all`
+LOOKUP_CHANGES_MAX_ROWS = 5000
+
+# Trigger tombstone untuk `db init` (create_all tidak membuat trigger); isinya sama dengan migration 2d8f4a61c9e3
+TOMBSTONE_TRIGGER_DDL = [
+    """
+    CREATE FUNCTION record_lookup_tombstone() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO lookup_tombstones (entity_type, public_id) VALUES (TG_ARGV[0], OLD.public_id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_lookup_tombstone
+        AFTER DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION record_lookup_tombstone('{entity_type}')
+        """
+        for table, entity_type in (("customers", "customer"), ("branches", "branch"), ("locations", "location"))
+    ),
+]
+
+
+def _encode_sync_token(synced_at: datetime) -> str:
+    """Bungkus waktu sinkron jadi token opaque untuk client."""
+    raw = json.dumps([synced_at.isoformat()]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_sync_token(token: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        (synced_at_iso,) = json.loads(raw)
+        synced_at = datetime.fromisoformat(synced_at_iso)
+    except (ValueError, TypeError):
+        raise BadRequestException("Token sync lookup tidak valid.")
+    if synced_at.tzinfo is None:
+        raise BadRequestException("Token sync lookup tidak valid.")
+    return synced_at
+
+async def current_sync_token(db: AsyncSession) -> str:
+    """Token untuk data yang dibaca di transaksi `db` (now() = awal transaksi, jadi tidak kebablasan)."""
+    return _encode_sync_token(await db.scalar(select(func.now())))
+
+async def _limited_rows(db: AsyncSession, query) -> list:
+    rows = (await db.execute(query.limit(LOOKUP_CHANGES_MAX_ROWS + 1))).all()
+    if len(rows) > LOOKUP_CHANGES_MAX_ROWS:
+        raise GoneException("Perubahan sejak token ini terlalu banyak, muat ulang /customers/lookup/all.")
+    return rows
+
+async def get_lookup_changes(db: AsyncSession, since: str) -> dict:
+    """Customer/branch/location yang dibuat, diubah, atau dihapus sejak token `since`, plus token baru."""
+    synced_at = await db.scalar(select(func.now()))
+    since_at = _decode_sync_token(since)
+    if since_at < synced_at - timedelta(days=settings.LOOKUP_TOMBSTONE_RETENTION_DAYS):
+        raise GoneException("Token sync lookup sudah kedaluwarsa, muat ulang /customers/lookup/all.")
+    changed_after = since_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+
+    customers = await _limited_rows(db,
+        select(Customer.public_id, Customer.name)
+        .where(Customer.updated_at > changed_after)
+        .order_by(Customer.updated_at)
+    )
+
+    parent = aliased(Branch)
+    branches = await _limited_rows(db,
+        select(
+            Branch.public_id,
+            Branch.name,
+            Customer.public_id.label("customer_public_id"),
+            parent.public_id.label("parent_public_id"),
+        )
+        .join(Customer, Customer.id == Branch.customer_id)
+        .outerjoin(parent, parent.id == Branch.parent_id)
+        .where(Branch.updated_at > changed_after)
+        .order_by(Branch.updated_at)
+    )
+
+    locations = await _limited_rows(db,
+        select(
+            Location.public_id,
+            Location.name,
+            Location.location_type,
+            Branch.public_id.label("branch_public_id"),
+        )
+        .join(Branch, Branch.id == Location.branch_id)
+        .where(Location.updated_at > changed_after)
+        .order_by(Location.updated_at)
+    )
+
+    tombstones = await _limited_rows(db,
+        select(LookupTombstone.entity_type, LookupTombstone.public_id)
+        .where(LookupTombstone.deleted_at > changed_after)
+        .order_by(LookupTombstone.id)
+    )
+    deleted = {"customers": [], "branches": [], "locations": []}
+    plural = {"customer": "customers", "branch": "branches", "location": "locations"}
+    for row in tombstones:
+        deleted[plural[row.entity_type]].append(row.public_id)
+
+    return {
+        "token": _encode_sync_token(synced_at),
+        "customers": [dict(row._mapping) for row in customers],
+        "branches": [dict(row._mapping) for row in branches],
+        "locations": [dict(row._mapping) for row in locations],
+        "deleted": deleted,
+    }
+
+async def purge_tombstones(db: AsyncSession, retention_days: int) -> int:
+    """Hapus tombstone yang lebih tua dari masa simpan (manage.py db purge-lookup-tombstones)."""
+    result = await db.execute(
+        delete(LookupTombstone).where(
+            LookupTombstone.deleted_at < func.now() - timedelta(days=retention_days)
+        )
+    )
+    return result.rowcount
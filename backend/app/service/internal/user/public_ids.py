@@ -0,0 +1,181 @@
+# file: app/service/internal/user/public_ids.py
+#
+# Resolusi public_id (UUID dari API) -> id integer untuk Customer, Branch, Location.
+# Pasangan itu tidak pernah berubah selama barisnya ada, jadi disimpan di LRU in-process:
+# write path yang cuma butuh FK (manifest packing, tambah location) tidak perlu query lagi.
+#
+# - Hasil resolve baru masuk LRU setelah transaksinya COMMIT (ditampung dulu di session.info),
+#   jadi baris yang dibuat lalu di-ROLLBACK tidak pernah tersimpan.
+# - Delete lewat ORM langsung membuang entry-nya (mapper `after_delete`); delete lewat Core
+#   wajib memanggil `forget_public_ids`.
+# - Cache per worker. Baris yang dihapus di worker lain: helper yang memuat objek (`get_by_public_id`)
+#   membuang entry-nya saat `db.get` kosong; `resolve_id` bisa meloloskan id basi sampai FK menolaknya.
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Type, TypeVar
+import uuid
+from sqlalchemy import event, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.users.customer import Customer, Branch, Location
+from app.core.exceptions import NotFoundException
+
+PUBLIC_ID_CACHE_MAX_ENTRIES = 50_000
+
+_PENDING_KEY = "public_id_cache_pending"
+_RESOLVABLE_MODELS = (Customer, Branch, Location)
+
+ModelT = TypeVar("ModelT", Customer, Branch, Location)
+CacheKey = Tuple[type, uuid.UUID]
+
+
+class PublicIdCache:
+    """
+    LRU terbatas: (model, public_id) -> id.
+    Tidak pakai lock: semua akses terjadi di event loop yang sama dan tidak ada `await` di dalamnya.
+    """
+
+    def __init__(self, max_entries: int = PUBLIC_ID_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, db: AsyncSession, key: CacheKey) -> Optional[int]:
+        """Cari di LRU, lalu di hasil resolve transaksi ini yang belum commit."""
+        entity_id = self._entries.get(key)
+        if entity_id is not None:
+            self._entries.move_to_end(key)
+        else:
+            entity_id = db.info.get(_PENDING_KEY, {}).get(key)
+        if entity_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entity_id
+
+    def remember(self, db: AsyncSession, key: CacheKey, entity_id: int) -> None:
+        """Tampung dulu; baru masuk LRU di `after_commit` session ini."""
+        db.info.setdefault(_PENDING_KEY, {})[key] = entity_id
+
+    def put(self, key: CacheKey, entity_id: int) -> None:
+        self._entries[key] = entity_id
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+public_id_cache = PublicIdCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _promote_pending(session: Session) -> None:
+    for key, entity_id in session.info.pop(_PENDING_KEY, {}).items():
+        public_id_cache.put(key, entity_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Customer, "after_delete")
+@event.listens_for(Branch, "after_delete")
+@event.listens_for(Location, "after_delete")
+def _evict_deleted(mapper, connection, target) -> None:
+    key = (type(target), target.public_id)
+    public_id_cache.forget(key)
+    session = object_session(target)
+    if session is not None:
+        session.info.get(_PENDING_KEY, {}).pop(key, None)
+
+
+def forget_public_ids(model: Type[ModelT], public_ids: Iterable[uuid.UUID]) -> None:
+    """Panggil setelah delete Core (tanpa ORM) pada customers/branches/locations."""
+    for public_id in public_ids:
+        public_id_cache.forget((model, public_id))
+
+
+def _not_found(model: type, public_id: uuid.UUID) -> NotFoundException:
+    return NotFoundException(f"{model.__name__} with public_id {public_id} not found.")
+
+
+async def resolve_id(db: AsyncSession, model: Type[ModelT], public_id: uuid.UUID) -> int:
+    """id integer dari public_id; raise NotFoundException kalau tidak ada. Tanpa query kalau sudah di cache."""
+    key = (model, public_id)
+    entity_id = public_id_cache.lookup(db, key)
+    if entity_id is not None:
+        return entity_id
+    entity_id = (await db.execute(select(model.id).where(model.public_id == public_id))).scalar_one_or_none()
+    if entity_id is None:
+        raise _not_found(model, public_id)
+    public_id_cache.remember(db, key, entity_id)
+    return entity_id
+
+
+async def resolve_many(
+    db: AsyncSession, model: Type[ModelT], public_ids: Iterable[uuid.UUID]
+) -> Dict[uuid.UUID, int]:
+    """
+    Versi batch: public_id -> id. Yang belum di cache di-resolve dalam SATU query
+    `WHERE public_id = ANY(:public_ids)`. public_id yang tidak ada tidak muncul di hasil.
+    """
+    resolved: Dict[uuid.UUID, int] = {}
+    missing = []
+    for public_id in dict.fromkeys(public_ids):
+        entity_id = public_id_cache.lookup(db, (model, public_id))
+        if entity_id is None:
+            missing.append(public_id)
+        else:
+            resolved[public_id] = entity_id
+    if missing:
+        rows = (await db.execute(
+            select(model.public_id, model.id).where(
+                model.public_id == any_(bindparam("public_ids", value=missing, type_=ARRAY(PG_UUID(as_uuid=True))))
+            )
+        )).all()
+        for row in rows:
+            public_id_cache.remember(db, (model, row.public_id), row.id)
+            resolved[row.public_id] = row.id
+    return resolved
+
+
+async def get_by_public_id(db: AsyncSession, model: Type[ModelT], public_id: uuid.UUID) -> ModelT:
+    """
+    Objek ORM lengkap dari public_id; raise NotFoundException kalau tidak ada.
+    Cache hit -> `db.get` per primary key (gratis kalau objeknya sudah ada di identity map session).
+    """
+    key = (model, public_id)
+    entity_id = public_id_cache.lookup(db, key)
+    if entity_id is not None:
+        entity = await db.get(model, entity_id)
+        if entity is not None:
+            return entity
+        # Sudah dihapus (di worker lain)
+        public_id_cache.forget(key)
+    entity = (await db.execute(select(model).where(model.public_id == public_id))).scalar_one_or_none()
+    if entity is None:
+        raise _not_found(model, public_id)
+    public_id_cache.remember(db, key, entity.id)
+    return entity
+
+
+def get_public_id_cache_stats() -> dict:
+    cache = public_id_cache
+    lookups = cache.hits + cache.misses
+    return {
+        "entries": len(cache._entries),
+        "max_entries": cache.max_entries,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "hit_ratio": cache.hits / lookups if lookups else 0.0,
+    }
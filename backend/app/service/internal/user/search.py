@@ -0,0 +1,126 @@
+# file: app/service/internal/user/search.py
+#
+# Typeahead `GET /customers/search?q=` untuk filter customer/branch/location,
+# pengganti filter client-side di atas seluruh pohon `/lookup/all`.
+#
+# Kandidat diambil per kolom (Customer.name, Branch.name, Location.name, Location.city)
+# lewat index GiST `gist_trgm_ops`: satu index scan melayani filter ILIKE '%q%'
+# sekaligus ORDER BY jarak word-similarity (`q <<-> kolom`) + LIMIT, jadi biayanya
+# sebanding dengan `limit`, bukan dengan jumlah baris yang cocok.
+# Jalur ancestry (customer -> branch ... ) diambil sekaligus dari closure table.
+# Total 2 query per ketikan.
+
+from typing import Dict, List
+from sqlalchemy import literal, null, union_all, Integer, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.exceptions import BadRequestException
+from app.models.users.customer import Customer, Branch, BranchClosure, Location
+from app.service.internal.text_search import MIN_SEARCH_LENGTH, contains_ilike
+
+
+def _candidates(term: str, limit: int, kind: str, matched_on: str, column, *, entity, city, branch_ref):
+    """Top-`limit` baris yang mengandung `term` di `column`, urut jarak word-similarity (KNN GiST)."""
+    distance = literal(term, String).op("<<->")(column)
+    top = (
+        select(
+            literal(kind).label("kind"),
+            literal(matched_on).label("matched_on"),
+            entity.id.label("entity_id"),
+            entity.public_id.label("public_id"),
+            entity.name.label("name"),
+            city.label("city"),
+            branch_ref.label("branch_ref"),
+            distance.label("distance"),
+        )
+        .where(contains_ilike(column, term))
+        .order_by(distance)
+        .limit(limit)
+        .subquery()
+    )
+    # Dibungkus subquery supaya ORDER BY + LIMIT tetap per kandidat di dalam UNION ALL
+    return select(top)
+
+
+async def _ancestry_paths(db: AsyncSession, branch_ids: List[int]) -> Dict[int, List[dict]]:
+    """branch_id -> [customer, root branch, ..., branch itu sendiri]. Satu query closure."""
+    if not branch_ids:
+        return {}
+    rows = (await db.execute(
+        select(
+            BranchClosure.descendant_id,
+            Branch.public_id,
+            Branch.name,
+            Customer.public_id.label("customer_public_id"),
+            Customer.name.label("customer_name"),
+        )
+        .join(Branch, Branch.id == BranchClosure.ancestor_id)
+        .join(Customer, Customer.id == Branch.customer_id)
+        .where(BranchClosure.descendant_id.in_(branch_ids))
+        .order_by(BranchClosure.descendant_id, BranchClosure.depth.desc())
+    )).all()
+    paths: Dict[int, List[dict]] = {}
+    for row in rows:
+        path = paths.get(row.descendant_id)
+        if path is None:
+            path = paths[row.descendant_id] = [
+                {"kind": "customer", "public_id": row.customer_public_id, "name": row.customer_name}
+            ]
+        path.append({"kind": "branch", "public_id": row.public_id, "name": row.name})
+    return paths
+
+
+async def search_lookup(db: AsyncSession, q: str, limit: int = 10) -> List[dict]:
+    """
+    Cari customer, branch, dan location (nama atau kota) yang mengandung `q`.
+    Hasil diurutkan dari yang paling mirip (score 0-1) dan tiap hit membawa jalur ancestry-nya.
+    """
+    term = q.strip()
+    if len(term) < MIN_SEARCH_LENGTH:
+        raise BadRequestException(f"Kata kunci minimal {MIN_SEARCH_LENGTH} karakter.")
+
+    no_city = null().cast(String)
+    no_branch = null().cast(Integer)
+    candidates = union_all(
+        _candidates(term, limit, "customer", "name", Customer.name,
+                    entity=Customer, city=no_city, branch_ref=no_branch),
+        _candidates(term, limit, "branch", "name", Branch.name,
+                    entity=Branch, city=no_city, branch_ref=Branch.id),
+        _candidates(term, limit, "location", "name", Location.name,
+                    entity=Location, city=Location.city, branch_ref=Location.branch_id),
+        _candidates(term, limit, "location", "city", Location.city,
+                    entity=Location, city=Location.city, branch_ref=Location.branch_id),
+    ).subquery()
+    rows = (await db.execute(
+        select(candidates).order_by(candidates.c.distance, candidates.c.name)
+    )).all()
+
+    # Location yang cocok di nama DAN kota cukup muncul sekali (yang jaraknya terdekat)
+    hits, seen = [], set()
+    for row in rows:
+        key = (row.kind, row.entity_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        hits.append(row)
+        if len(hits) >= limit:
+            break
+
+    paths = await _ancestry_paths(db, list({row.branch_ref for row in hits if row.branch_ref is not None}))
+    results = []
+    for row in hits:
+        path = paths.get(row.branch_ref, []) if row.branch_ref is not None else []
+        if row.kind == "branch":
+            # Ancestry branch = semua di atasnya, tanpa dirinya sendiri
+            path = path[:-1]
+        results.append({
+            "kind": row.kind,
+            "public_id": row.public_id,
+            "name": row.name,
+            "city": row.city,
+            "matched_on": row.matched_on,
+            "score": round(1.0 - float(row.distance), 4),
+            "path": path,
+        })
+    return results
@@ -1,5 +1,6 @@
 import logfire
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from logfire import ConsoleOptions, LogfireLoggingHandler
@@ -19,9 +20,18 @@ logging.basicConfig(
     force=True, # force=True diperlukan untuk menimpa konfigurasi uvicorn
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker job async manifest (POST /manifests?async=true) hidup selama proses API hidup
+    from app.service.internal.packing.jobs import manifest_job_pool
+    manifest_job_pool.start()
+    yield
+    await manifest_job_pool.stop()
+
 app = FastAPI(
     title="My Advanced FastAPI App",
-    description="API with structured logging and observability."
+    description="API with structured logging and observability.",
+    lifespan=lifespan,
 )
 
 logfire.instrument_fastapi(app)
@@ -41,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
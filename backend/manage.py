@@ -42,8 +42,14 @@ def init():
             typer.secho("Dropping all existing tables with CASCADE...", fg=typer.colors.YELLOW)
             await conn.execute(text("DROP SCHEMA public CASCADE;"))
             await conn.execute(text("CREATE SCHEMA public;"))
+            # Dibutuhkan index trigram (gin_trgm_ops) untuk endpoint pencarian
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
             typer.echo("Creating all tables...")
             await conn.run_sync(Base.metadata.create_all)
+            # Trigger tombstone delta-sync lookup (tidak ikut create_all)
+            from app.service.internal.user.lookup_sync import TOMBSTONE_TRIGGER_DDL
+            for statement in TOMBSTONE_TRIGGER_DDL:
+                await conn.execute(text(statement))
         typer.secho(" Database berhasil diinisialisasi.", fg=typer.colors.GREEN)
     asyncio.run(create_tables())
 
@@ -78,6 +84,193 @@ def downgrade(revision: str = typer.Argument("-1", help="Revisi tujuan downgrade
         typer.secho(f" Gagal saat downgrade: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+@db_cli.command("backfill-label-address")
+def backfill_label_address(
+    batch_size: int = typer.Option(500, help="Jumlah manifest per batch (satu transaksi per batch)."),
+    force: bool = typer.Option(False, "--force", help="Hitung ulang juga manifest yang sudah terisi."),
+):
+    from app.database.database import AsyncSessionLocal
+    from app.service.internal.packing import packing as packing_service
+
+    typer.echo("Mengisi kolom label_address untuk manifest yang sudah ada...")
+
+    async def run_backfill():
+        last_id, total = 0, 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                async with session.begin():
+                    next_id, processed = await packing_service.backfill_label_address_batch(
+                        session, after_id=last_id, batch_size=batch_size, force=force
+                    )
+            if next_id is None:
+                break
+            last_id = next_id
+            total += processed
+            typer.echo(f" - Sampai manifest id {last_id}")
+        await async_engine.dispose()
+        typer.secho(f" Backfill selesai ({total} manifest diproses).", fg=typer.colors.GREEN)
+    asyncio.run(run_backfill())
+
+@db_cli.command("backfill-packing-measures")
+def backfill_packing_measures(
+    batch_size: int = typer.Option(1000, help="Jumlah baris per batch (satu transaksi per batch)."),
+    sleep: float = typer.Option(0.1, help="Jeda (detik) antar batch supaya tidak membebani DB produksi."),
+):
+    from app.database.database import AsyncSessionLocal
+    from app.service.internal.packing import packing as packing_service
+
+    typer.echo("Mengisi kolom bertipe (quantity_units, expire_on, berat_kg) untuk data packing lama...")
+
+    async def run_table(label, backfill_batch):
+        last_id, total = 0, 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                async with session.begin():
+                    next_id, updated = await backfill_batch(session, after_id=last_id, batch_size=batch_size)
+            if next_id is None:
+                break
+            last_id = next_id
+            total += updated
+            typer.echo(f" - {label}: sampai id {last_id}")
+            await asyncio.sleep(sleep)
+        typer.secho(f" {label}: {total} baris diisi.", fg=typer.colors.GREEN)
+
+    async def run_backfill():
+        await run_table("packed_items", packing_service.backfill_item_measures_batch)
+        await run_table("packed_boxes", packing_service.backfill_box_weight_batch)
+        await async_engine.dispose()
+        typer.echo(" Jalankan `db rebuild-packing-stats` supaya rollup memakai kolom baru.")
+    asyncio.run(run_backfill())
+
+@db_cli.command("import-manifests")
+def import_manifests(
+    path: str = typer.Argument(..., help="Path file NDJSON atau CSV."),
+    file_format: str = typer.Option(None, "--format", help="ndjson / csv (default: dari ekstensi file)."),
+    chunk_size: int = typer.Option(200, help="Jumlah manifest per chunk COPY."),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Jalankan semuanya lalu ROLLBACK (cek error saja)."),
+):
+    from app.service.internal.file_lines import iter_file_lines
+    from app.service.internal.packing import importer as import_service
+
+    try:
+        fmt = import_service.ManifestImportFormat(
+            file_format or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        )
+    except ValueError:
+        typer.secho(f"Format '{file_format}' tidak dikenal (pakai ndjson atau csv).", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Import manifest dari {path} ({fmt.value})...")
+
+    async def run_import():
+        # Transaksi per chunk diatur importer; chunk yang gagal masuk ke report.errors
+        with open(path, encoding="utf-8-sig", newline="") as source:
+            report = await import_service.import_manifests(
+                iter_file_lines(source), fmt, chunk_size=chunk_size, dry_run=dry_run
+            )
+        await async_engine.dispose()
+        return report
+
+    report = asyncio.run(run_import())
+    for error in report.errors:
+        typer.secho(f" - baris {error['row']} ({error['ref'] or '-'}): {error['detail']}", fg=typer.colors.YELLOW)
+    if report.stopped_reason:
+        typer.secho(f" Import dihentikan: {report.stopped_reason}", fg=typer.colors.RED)
+    status = "dicek (dry run, tidak disimpan)" if dry_run else "di-import"
+    typer.secho(
+        f" {report.imported_count} manifest ({report.box_count} box, {report.item_count} item) {status}, "
+        f"{len(report.errors)} baris gagal.",
+        fg=typer.colors.GREEN,
+    )
+
+@db_cli.command("rebuild-packing-stats")
+def rebuild_packing_stats():
+    from app.database.database import AsyncSessionLocal
+    from app.service.internal.packing import stats as stats_service
+
+    typer.echo("Membangun ulang tabel rollup packing dari packed_boxes & packed_items...")
+
+    async def run_rebuild():
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await stats_service.rebuild_rollups(session)
+        await async_engine.dispose()
+        typer.secho(" Rollup packing berhasil dibangun ulang.", fg=typer.colors.GREEN)
+    asyncio.run(run_rebuild())
+
+@db_cli.command("rebuild-branch-closure")
+def rebuild_branch_closure():
+    from app.database.database import AsyncSessionLocal
+    from app.service.internal.user import customer as customer_service
+
+    typer.echo("Membangun ulang closure table branch dari branches.parent_id...")
+
+    async def run_rebuild():
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                pair_count = await customer_service.rebuild_branch_closure(session)
+        await async_engine.dispose()
+        typer.secho(f" Closure table selesai ({pair_count} pasangan ancestor-descendant).", fg=typer.colors.GREEN)
+    asyncio.run(run_rebuild())
+
+@db_cli.command("purge-lookup-tombstones")
+def purge_lookup_tombstones(
+    days: int = typer.Option(None, help="Masa simpan dalam hari (default: LOOKUP_TOMBSTONE_RETENTION_DAYS)."),
+):
+    from app.core.config import settings
+    from app.database.database import AsyncSessionLocal
+    from app.service.internal.user import lookup_sync as lookup_sync_service
+
+    retention_days = days or settings.LOOKUP_TOMBSTONE_RETENTION_DAYS
+    typer.echo(f"Menghapus tombstone lookup yang lebih tua dari {retention_days} hari...")
+
+    async def run_purge():
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                deleted = await lookup_sync_service.purge_tombstones(session, retention_days)
+        await async_engine.dispose()
+        typer.secho(f" {deleted} tombstone dihapus.", fg=typer.colors.GREEN)
+    asyncio.run(run_purge())
+
+@db_cli.command("onboard-customers")
+def onboard_customers(
+    path: str = typer.Argument(..., help="Path file NDJSON atau CSV (export master customer)."),
+    file_format: str = typer.Option(None, "--format", help="ndjson / csv (default: dari ekstensi file)."),
+    chunk_size: int = typer.Option(100, help="Jumlah customer per chunk (satu transaksi per chunk)."),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Validasi & cek duplikat, semua chunk di-ROLLBACK."),
+):
+    from app.service.internal.file_lines import iter_file_lines
+    from app.service.internal.user import customer_import as customer_import_service
+
+    try:
+        fmt = customer_import_service.CustomerImportFormat(
+            file_format or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        )
+    except ValueError:
+        typer.secho(f"Format '{file_format}' tidak dikenal (pakai ndjson atau csv).", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Onboarding customer dari {path} ({fmt.value})...")
+
+    async def run_onboard():
+        with open(path, encoding="utf-8-sig", newline="") as source:
+            report = await customer_import_service.onboard_customers_bulk(
+                iter_file_lines(source), fmt, chunk_size=chunk_size, dry_run=dry_run
+            )
+        await async_engine.dispose()
+        return report
+
+    report = asyncio.run(run_onboard())
+    for error in report.errors:
+        typer.secho(f" - baris {error['row']} ({error['ref'] or '-'}): {error['detail']}", fg=typer.colors.YELLOW)
+    status = "akan dibuat (dry run, tidak disimpan)" if dry_run else "dibuat"
+    typer.secho(
+        f" {report.created_count} customer ({report.branch_count} branch, {report.location_count} location) {status}, "
+        f"{len(report.errors)} record gagal. {report.elapsed_seconds:.1f} detik, "
+        f"{report.customers_per_second:.1f} customer/detik.",
+        fg=typer.colors.GREEN,
+    )
+
 @cli.command()
 def run(
     host: str = typer.Option("127.0.0.1", help="Host untuk server."),
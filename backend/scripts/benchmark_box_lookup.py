@@ -0,0 +1,63 @@
+# file: scripts/benchmark_box_lookup.py
+#
+# Mengukur lookup scan SSCC (`box_lookup.get_box_json_by_sscc`):
+# - "cold"  : cache kosong, 2 query (box+manifest, item) lewat index unik sscc
+# - "cached": scan ulang box yang sama, dilayani dari LRU in-process
+#
+# Butuh box yang sudah ada di database. Jalankan dari root backend:
+#   python scripts/benchmark_box_lookup.py --boxes 200
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.packing.manifest import PackedBox
+from app.service.internal.packing import box_lookup
+
+def summarize(label: str, samples_ms):
+    samples_ms = sorted(samples_ms)
+    p99 = samples_ms[int(len(samples_ms) * 0.99) - 1] if len(samples_ms) >= 100 else samples_ms[-1]
+    print(f"{label:>6} | {statistics.median(samples_ms):>9.3f} | {p99:>9.3f} | {len(samples_ms):>7}")
+
+async def main(box_count: int):
+    async with AsyncSessionLocal() as session:
+        ssccs = (await session.execute(
+            select(PackedBox.sscc).order_by(PackedBox.id.desc()).limit(box_count)
+        )).scalars().all()
+    if not ssccs:
+        print("Tidak ada box di database.")
+        return
+
+    box_lookup.box_lookup_cache.clear()
+    cold, cached = [], []
+    async with AsyncSessionLocal() as session:
+        for sscc in ssccs:
+            started = time.perf_counter()
+            await box_lookup.get_box_json_by_sscc(session, sscc)
+            cold.append((time.perf_counter() - started) * 1000)
+        for _ in range(5):
+            for sscc in ssccs:
+                started = time.perf_counter()
+                await box_lookup.get_box_json_by_sscc(session, sscc)
+                cached.append((time.perf_counter() - started) * 1000)
+
+    print(f"{'path':>6} | {'p50 ms':>9} | {'p99 ms':>9} | {'samples':>7}")
+    print("-" * 42)
+    summarize("cold", cold)
+    summarize("cached", cached)
+    print(box_lookup.get_box_cache_stats())
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark lookup scan SSCC: cold vs cached.")
+    parser.add_argument("--boxes", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.boxes))
@@ -0,0 +1,113 @@
+# file: scripts/benchmark_credit_reservation.py
+#
+# Throughput `credit.reserve_credit` saat banyak order masuk bersamaan untuk SATU customer:
+# reservasi per detik di 1, 16, dan 64 client paralel, untuk ledger satu baris vs sub-ledger (shard).
+# Tiap client = koneksi sendiri, tiap reservasi = transaksi sendiri (reserve + COMMIT),
+# sama seperti request order sungguhan.
+#
+# Customer benchmark di-COMMIT (client lain harus bisa melihatnya) lalu dihapus lagi di akhir.
+# Di akhir dicek: kredit awal - kredit tersisa == jumlah reservasi yang berhasil.
+#
+# Jalankan dari root backend (setelah `db upgrade` supaya tabel customer_credit_shards ada):
+#   python scripts/benchmark_credit_reservation.py --clients 1 16 64 --shards 16 --seconds 5
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.users.customer import Customer, CustomerSpecification, CustomerTypeEnum
+from app.service.internal.user import credit as credit_service
+
+INITIAL_CREDIT = Decimal("1000000000.00")
+RESERVE_AMOUNT = Decimal("1.00")
+
+
+async def create_customer(session_factory, label: str, shard_count: int) -> uuid.UUID:
+    async with session_factory() as db:
+        customer_id, public_id = (await db.execute(
+            insert(Customer).returning(Customer.id, Customer.public_id),
+            [{"name": f"Benchmark Kredit {label} {uuid.uuid4().hex[:8]}", "customer_type": CustomerTypeEnum.DISTRIBUTOR}],
+        )).one()
+        await db.execute(insert(CustomerSpecification), [{
+            "customer_id": customer_id,
+            "default_credit_limit": INITIAL_CREDIT,
+            "current_credit_limit": INITIAL_CREDIT,
+            "default_payment_terms_days": 30,
+        }])
+        if shard_count:
+            await credit_service.set_credit_shards(db, public_id, shard_count)
+        await db.commit()
+    return public_id
+
+
+async def drop_customer(session_factory, public_id: uuid.UUID) -> None:
+    async with session_factory() as db:
+        customer_id = await db.scalar(select(Customer.id).where(Customer.public_id == public_id))
+        # Shard ikut terhapus lewat FK ON DELETE CASCADE
+        await db.execute(delete(CustomerSpecification).where(CustomerSpecification.customer_id == customer_id))
+        await db.execute(delete(Customer).where(Customer.id == customer_id))
+        await db.commit()
+
+
+async def client(session_factory, public_id: uuid.UUID, deadline: float, counts: list) -> None:
+    async with session_factory() as db:
+        while time.perf_counter() < deadline:
+            await credit_service.reserve_credit(db, public_id, RESERVE_AMOUNT)
+            await db.commit()
+            counts[0] += 1
+
+
+async def run_case(session_factory, label: str, shard_count: int, clients: int, seconds: float) -> None:
+    public_id = await create_customer(session_factory, label, shard_count)
+    try:
+        counts = [0]
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(*(client(session_factory, public_id, deadline, counts) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+        async with session_factory() as db:
+            balance = await credit_service.get_credit_balance(db, public_id)
+        consumed = INITIAL_CREDIT - Decimal(str(balance["available_credit"]))
+        consistent = consumed == counts[0] * RESERVE_AMOUNT
+        print(f"{label:>14} | {clients:>7} | {counts[0]:>8} | {counts[0] / elapsed:>9.0f} | {consistent}")
+    finally:
+        await drop_customer(session_factory, public_id)
+
+
+async def main(client_counts, shard_count: int, seconds: float):
+    # Engine sendiri: pool harus muat semua client sekaligus
+    engine = create_async_engine(settings.DATABASE_URL, pool_size=max(client_counts), max_overflow=2)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    cases = [("1 baris", 0)]
+    if shard_count:
+        cases.append((f"{shard_count} shard", shard_count))
+
+    print(f"{'ledger':>14} | {'clients':>7} | {'reserve':>8} | {'per detik':>9} | saldo cocok")
+    print("-" * 60)
+    try:
+        for label, shards in cases:
+            for clients in client_counts:
+                await run_case(session_factory, label, shards, clients, seconds)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reservasi kredit bersamaan: satu baris vs sub-ledger.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--shards", type=int, default=16, help="Jumlah shard untuk mode sub-ledger (0 = lewati).")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.shards, args.seconds))
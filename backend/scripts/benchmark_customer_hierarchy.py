@@ -0,0 +1,124 @@
+# file: scripts/benchmark_customer_hierarchy.py
+#
+# Membandingkan loader hierarki customer:
+# - "selectinload": rantai selectinload(Branch.children) sedalam pohonnya
+#                   (cara lama; dulu di-hardcode 2 level, jadi level lebih dalam hilang)
+# - "cte"         : `get_customer_with_full_hierarchy` (WITH RECURSIVE + satu query location)
+# Pohon sintetis (fanout tetap, 1 location per branch) dibuat di dalam transaksi
+# lalu di-ROLLBACK, jadi database tidak berubah.
+#
+# Jalankan dari root backend:
+#   python scripts/benchmark_customer_hierarchy.py --depths 2 5 10 --fanout 2
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import selectinload
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.users.customer import Customer, Branch, Location, CustomerTypeEnum
+from app.service.internal.user import customer as customer_service
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+async def build_tree(db, depth: int, fanout: int):
+    """Insert customer + pohon branch (level demi level) + satu location per branch."""
+    customer_id, customer_public_id = (await db.execute(
+        insert(Customer)
+        .values(name=f"BENCH-{uuid.uuid4().hex[:12]}", customer_type=CustomerTypeEnum.DISTRIBUTOR)
+        .returning(Customer.id, Customer.public_id)
+    )).one()
+
+    parents = [None]
+    branch_ids = []
+    for level in range(depth):
+        rows = [
+            {"name": f"L{level}-{n}", "customer_id": customer_id, "parent_id": parent_id}
+            for parent_id in parents
+            for n in range(1 if level == 0 else fanout)
+        ]
+        parents = (await db.execute(
+            insert(Branch).returning(Branch.id, sort_by_parameter_order=True), rows
+        )).scalars().all()
+        branch_ids.extend(parents)
+
+    await db.execute(insert(Location), [
+        {
+            "branch_id": branch_id, "name": f"LOC-{branch_id}", "location_type": "GUDANG",
+            "is_default": True, "is_active": True, "location_pic": "-", "location_pic_contact": "-",
+        }
+        for branch_id in branch_ids
+    ])
+    return customer_public_id, len(branch_ids)
+
+def count_nodes(branches, levels: int) -> int:
+    """Hitung node sampai `levels` level (children di level terakhir selectinload tidak dimuat)."""
+    if levels == 0:
+        return 0
+    return sum(
+        1 + count_nodes(branch["children"] if isinstance(branch, dict) else branch.children, levels - 1)
+        for branch in branches
+    )
+
+async def selectinload_loader(db, customer_public_id, depth: int):
+    children_chain = selectinload(Customer.branches)
+    options = [selectinload(Customer.details), selectinload(Customer.specification),
+               selectinload(Customer.branches).selectinload(Branch.locations)]
+    for _ in range(depth - 1):
+        children_chain = children_chain.selectinload(Branch.children)
+        options.append(children_chain.selectinload(Branch.locations))
+    customer = (await db.execute(
+        select(Customer).where(Customer.public_id == customer_public_id).options(*options)
+    )).scalar_one()
+    return [branch for branch in customer.branches if branch.parent_id is None]
+
+async def cte_loader(db, customer_public_id, depth: int):
+    return (await customer_service.get_customer_with_full_hierarchy(db, customer_public_id))["branches"]
+
+async def measure(db, loader, customer_public_id, depth: int, repeat: int):
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        best = None
+        for _ in range(repeat):
+            db.expunge_all()
+            counter.count = 0
+            started = time.perf_counter()
+            roots = await loader(db, customer_public_id, depth)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, counter.count, count_nodes(roots, depth)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+async def main(depths, fanout: int, repeat: int):
+    print(f"{'depth':>5} | {'branches':>8} | {'loader':>12} | {'ms':>8} | {'queries':>7} | {'loaded':>6}")
+    print("-" * 62)
+    for depth in depths:
+        async with AsyncSessionLocal() as session:
+            customer_public_id, branch_count = await build_tree(session, depth, fanout)
+            for name, loader in (("selectinload", selectinload_loader), ("cte", cte_loader)):
+                ms, queries, loaded = await measure(session, loader, customer_public_id, depth, repeat)
+                print(f"{depth:>5} | {branch_count:>8} | {name:>12} | {ms:>8.1f} | {queries:>7} | {loaded:>6}")
+            await session.rollback()
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loader hierarki customer: selectinload vs WITH RECURSIVE.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.depths, args.fanout, args.repeat))
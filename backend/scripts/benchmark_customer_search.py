@@ -0,0 +1,115 @@
+# file: scripts/benchmark_customer_search.py
+#
+# Mengukur latensi typeahead `GET /customers/search` (search.search_lookup) per ketikan.
+# Data sintetis (default 100k location, 5 branch per customer) dibuat di dalam transaksi,
+# di-ANALYZE supaya planner memakai index trigram, lalu di-ROLLBACK di akhir.
+# Target: setiap query di bawah 20 ms.
+#
+# Jalankan dari root backend (setelah `db upgrade` supaya index GiST trigram ada):
+#   python scripts/benchmark_customer_search.py --locations 100000
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, text
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.users.customer import Customer, Branch, Location, CustomerTypeEnum
+from app.service.internal.user import customer as customer_service
+from app.service.internal.user import search as search_service
+
+TARGET_MS = 20.0
+CITIES = [
+    "Bandung", "Cimahi", "Garut", "Tasikmalaya", "Cirebon", "Bekasi", "Bogor", "Depok", "Sukabumi",
+    "Surabaya", "Malang", "Kediri", "Semarang", "Solo", "Yogyakarta", "Medan", "Padang", "Makassar",
+]
+FACILITIES = ["Puskesmas", "RSUD", "Apotek", "Klinik", "Gudang", "Instalasi Farmasi"]
+QUERIES = [
+    "pus", "pusk", "puskesmas", "puskesmas cim", "ban", "bandung", "rsud", "rsud sura",
+    "kli", "klinik mal", "gud", "dinkes", "xyz",
+]
+LOCATIONS_PER_BRANCH = 20
+CHILD_BRANCHES = 4
+
+
+async def seed(db, location_count: int, rng: random.Random) -> None:
+    """Customer -> 1 root branch + CHILD_BRANCHES anak, LOCATIONS_PER_BRANCH location per branch."""
+    branches_per_customer = 1 + CHILD_BRANCHES
+    customer_count = max(1, location_count // (branches_per_customer * LOCATIONS_PER_BRANCH))
+    run_id = uuid.uuid4().hex[:6]
+    customer_ids = (await db.execute(
+        insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+        [
+            {"name": f"Dinkes {rng.choice(CITIES)} {run_id}-{n}", "customer_type": CustomerTypeEnum.PEMERINTAH}
+            for n in range(customer_count)
+        ],
+    )).scalars().all()
+
+    root_ids = (await db.execute(
+        insert(Branch).returning(Branch.id, sort_by_parameter_order=True),
+        [{"name": f"Dinkes Provinsi {n}", "customer_id": customer_id, "parent_id": None}
+         for n, customer_id in enumerate(customer_ids)],
+    )).scalars().all()
+    await customer_service._insert_branch_closure(db, [(root_id, None) for root_id in root_ids])
+
+    child_rows = [
+        {"name": f"Kantor {rng.choice(CITIES)} {n}", "customer_id": customer_id, "parent_id": root_id}
+        for customer_id, root_id in zip(customer_ids, root_ids)
+        for n in range(CHILD_BRANCHES)
+    ]
+    child_ids = (await db.execute(
+        insert(Branch).returning(Branch.id, sort_by_parameter_order=True), child_rows
+    )).scalars().all()
+    await customer_service._insert_branch_closure(
+        db, [(child_id, row["parent_id"]) for child_id, row in zip(child_ids, child_rows)]
+    )
+
+    location_rows = []
+    for branch_id in [*root_ids, *child_ids]:
+        for n in range(LOCATIONS_PER_BRANCH):
+            city = rng.choice(CITIES)
+            location_rows.append({
+                "branch_id": branch_id, "name": f"{rng.choice(FACILITIES)} {city} {n}"[:50],
+                "location_type": "GUDANG", "city": city, "state_province": "-",
+                "is_default": n == 0, "is_active": True, "location_pic": "-", "location_pic_contact": "-",
+            })
+    await db.execute(insert(Location), location_rows)
+    for table in ("customers", "branches", "locations", "branch_closure"):
+        await db.execute(text(f"ANALYZE {table}"))
+    print(f"Seed: {customer_count} customer, {len(root_ids) + len(child_ids)} branch, {len(location_rows)} location")
+
+
+async def main(location_count: int, repeat: int, limit: int, seed_value: int):
+    async with AsyncSessionLocal() as session:
+        await seed(session, location_count, random.Random(seed_value))
+
+        print(f"{'query':>16} | {'hits':>4} | {'median ms':>9} | {'max ms':>7} | <{TARGET_MS:.0f} ms")
+        print("-" * 58)
+        for query in QUERIES:
+            timings, hits = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                hits = await search_service.search_lookup(session, query, limit=limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            print(f"{query:>16} | {len(hits):>4} | {median:>9.1f} | {max(timings):>7.1f} | {median < TARGET_MS}")
+        await session.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark latensi typeahead /customers/search.")
+    parser.add_argument("--locations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.locations, args.repeat, args.limit, args.seed))
@@ -0,0 +1,49 @@
+# file: scripts/benchmark_gs1_check_digit.py
+#
+# Micro-benchmark check digit GS1: fungsi lama per-string (`_calculate_check_digit`)
+# vs modul batch NumPy (`gs1.compute_check_digits` / `gs1.validate_codes`).
+# Tidak butuh database.
+#
+# Jalankan dari root backend:  python scripts/benchmark_gs1_check_digit.py --sizes 1000 100000 1000000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.internal.packing import gs1
+from app.service.internal.packing.packing import _calculate_check_digit, _sscc_body
+
+def best_of(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def main(sizes, repeat: int):
+    print(f"{'codes':>9} | {'per-string ms':>13} | {'numpy ms':>9} | {'speedup':>7} | {'validate ms':>11}")
+    print("-" * 63)
+    for size in sizes:
+        bodies = [_sscc_body(serial) for serial in random.sample(range(1, 999_999_999), size)]
+        codes = gs1.append_check_digits(bodies)
+
+        # Pastikan dua jalur menghasilkan check digit yang sama sebelum diukur
+        assert gs1.compute_check_digits(bodies).tolist() == [_calculate_check_digit(b) for b in bodies]
+
+        per_string_ms = best_of(lambda: [_calculate_check_digit(b) for b in bodies], repeat)
+        numpy_ms = best_of(lambda: gs1.compute_check_digits(bodies), repeat)
+        validate_ms = best_of(lambda: gs1.validate_codes(codes), repeat)
+        print(f"{size:>9} | {per_string_ms:>13.1f} | {numpy_ms:>9.1f} | {per_string_ms / numpy_ms:>6.1f}x | {validate_ms:>11.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark check digit GS1: per-string vs NumPy.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
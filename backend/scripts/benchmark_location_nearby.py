@@ -0,0 +1,148 @@
+# file: scripts/benchmark_location_nearby.py
+#
+# Membandingkan `geo.find_nearby_locations` (kandidat lewat index geo_cell) dengan
+# full scan haversine di SQL (`ORDER BY jarak LIMIT k`) untuk kNN dan radius 50 km.
+# Data sintetis (default 100k location, bergerombol di sekitar kota-kota Indonesia)
+# dibuat di dalam transaksi, di-ANALYZE, lalu di-ROLLBACK di akhir.
+# Hasil kedua jalur dicek sama (public_id + urutan jarak).
+#
+# Jalankan dari root backend (setelah `db upgrade` supaya kolom geo_cell ada):
+#   python scripts/benchmark_location_nearby.py --locations 100000 --k 10
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, text
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.users.customer import Customer, Branch, Location, CustomerTypeEnum
+from app.service.internal.user import customer as customer_service
+from app.service.internal.user import geo as geo_service
+
+RADIUS_KM = 50.0
+# (nama, lat, lon) pusat gerombolan
+CITY_CENTERS = [
+    ("Bandung", -6.9175, 107.6191), ("Jakarta", -6.2088, 106.8456), ("Surabaya", -7.2575, 112.7521),
+    ("Semarang", -6.9667, 110.4167), ("Yogyakarta", -7.7956, 110.3695), ("Medan", 3.5952, 98.6722),
+    ("Padang", -0.9471, 100.4172), ("Palembang", -2.9761, 104.7754), ("Makassar", -5.1477, 119.4327),
+    ("Manado", 1.4748, 124.8421), ("Denpasar", -8.6705, 115.2126), ("Kupang", -10.1772, 123.6070),
+    ("Pontianak", -0.0263, 109.3425), ("Balikpapan", -1.2379, 116.8529), ("Jayapura", -2.5337, 140.7181),
+]
+# Sebagian kecil location tersebar acak di seluruh wilayah (lat -11..6, lon 95..141)
+SCATTER_RATIO = 0.1
+
+# Pembanding: haversine untuk SEMUA baris lalu sort (tanpa index spasial)
+FULL_SCAN_SQL = """
+SELECT public_id, distance_km FROM (
+    SELECT public_id,
+           2 * :earth_radius * asin(least(1, sqrt(
+               power(sin(radians(latitude - :lat) / 2), 2)
+               + cos(radians(:lat)) * cos(radians(latitude)) * power(sin(radians(longitude - :lon) / 2), 2)
+           ))) AS distance_km
+    FROM locations
+    WHERE is_active AND latitude IS NOT NULL AND longitude IS NOT NULL
+) scored
+WHERE (CAST(:radius AS double precision) IS NULL OR distance_km <= :radius)
+ORDER BY distance_km
+LIMIT :k
+"""
+
+
+async def seed(db, location_count: int, rng: random.Random) -> None:
+    """1 customer -> 1 branch; semua location sintetis digantung di branch itu."""
+    customer_id = (await db.execute(
+        insert(Customer).returning(Customer.id),
+        [{"name": f"Benchmark Geo {rng.randrange(10**6)}", "customer_type": CustomerTypeEnum.PEMERINTAH}],
+    )).scalar_one()
+    branch_id = (await db.execute(
+        insert(Branch).returning(Branch.id),
+        [{"name": "Gudang Nasional", "customer_id": customer_id, "parent_id": None}],
+    )).scalar_one()
+    await customer_service._insert_branch_closure(db, [(branch_id, None)])
+
+    rows = []
+    for n in range(location_count):
+        if rng.random() < SCATTER_RATIO:
+            city, lat, lon = "-", rng.uniform(-11, 6), rng.uniform(95, 141)
+        else:
+            city, center_lat, center_lon = rng.choice(CITY_CENTERS)
+            # ~0.3 derajat (~33 km) sebaran di sekitar pusat kota
+            lat, lon = rng.gauss(center_lat, 0.3), rng.gauss(center_lon, 0.3)
+        rows.append({
+            "branch_id": branch_id, "name": f"Titik {city} {n}"[:50], "location_type": "GUDANG",
+            "city": city, "state_province": "-", "is_default": n == 0, "is_active": True,
+            "location_pic": "-", "location_pic_contact": "-",
+            "latitude": round(lat, 6), "longitude": round(lon, 6),
+        })
+    for start in range(0, len(rows), 10_000):
+        await db.execute(insert(Location), rows[start:start + 10_000])
+    await db.execute(text("ANALYZE locations"))
+    print(f"Seed: {len(rows)} location di sekitar {len(CITY_CENTERS)} kota")
+
+
+async def full_scan(db, lat: float, lon: float, k: int, radius_km):
+    rows = (await db.execute(text(FULL_SCAN_SQL), {
+        "earth_radius": geo_service.EARTH_RADIUS_KM, "lat": lat, "lon": lon, "k": k, "radius": radius_km,
+    })).all()
+    return [(row.public_id, float(row.distance_km)) for row in rows]
+
+
+def same_result(grid: list, scan: list) -> bool:
+    """Sama kalau jaraknya identik per posisi (public_id bisa beda kalau jaraknya seri)."""
+    if len(grid) != len(scan):
+        return False
+    return all(abs(hit["distance_km"] - distance) < 0.01 for hit, (_, distance) in zip(grid, scan))
+
+
+async def run_case(db, label: str, points: list, k: int, radius_km, repeat: int) -> None:
+    grid_ms, scan_ms, mismatches = [], [], 0
+    for lat, lon in points:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            grid = await geo_service.find_nearby_locations(db, lat, lon, k=k, radius_km=radius_km)
+            grid_ms.append((time.perf_counter() - started) * 1000)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scan = await full_scan(db, lat, lon, k, radius_km)
+            scan_ms.append((time.perf_counter() - started) * 1000)
+        mismatches += not same_result(grid, scan)
+    grid_median, scan_median = statistics.median(grid_ms), statistics.median(scan_ms)
+    print(
+        f"{label:>12} | {grid_median:>12.1f} | {scan_median:>12.1f} | "
+        f"{scan_median / grid_median:>6.1f}x | {mismatches}/{len(points)}"
+    )
+
+
+async def main(location_count: int, points: int, repeat: int, k: int, seed_value: int):
+    rng = random.Random(seed_value)
+    async with AsyncSessionLocal() as session:
+        await seed(session, location_count, rng)
+        # Titik uji: separuh di dekat kota, separuh acak (termasuk laut yang jauh dari mana-mana)
+        near_city = [rng.choice(CITY_CENTERS) for _ in range(points // 2)]
+        query_points = [(rng.gauss(lat, 0.2), rng.gauss(lon, 0.2)) for _, lat, lon in near_city]
+        query_points += [(rng.uniform(-11, 6), rng.uniform(95, 141)) for _ in range(points - len(near_city))]
+
+        print(f"{'query':>12} | {'grid med ms':>12} | {'scan med ms':>12} | {'speed':>7} | beda")
+        print("-" * 64)
+        await run_case(session, f"kNN k={k}", query_points, k, None, repeat)
+        await run_case(session, f"r={RADIUS_KM:.0f} km", query_points, k, RADIUS_KM, repeat)
+        await session.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark location terdekat: grid geo_cell vs full scan haversine.")
+    parser.add_argument("--locations", type=int, default=100_000)
+    parser.add_argument("--points", type=int, default=10, help="Jumlah titik asal yang diuji.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.locations, args.points, args.repeat, args.k, args.seed))
@@ -0,0 +1,108 @@
+# file: scripts/benchmark_manifest_bulk.py
+#
+# Membandingkan `create_packing_manifest` (flush per box) dengan
+# `create_packing_manifest_bulk` untuk beberapa ukuran manifest.
+# Yang diukur: jumlah round trip ke DB (statement yang benar-benar dikirim) dan latency.
+# Semua data dibuat di dalam transaksi yang di-ROLLBACK, jadi aman dijalankan di DB dev.
+#
+# Jalankan dari root backend:  python scripts/benchmark_manifest_bulk.py --boxes 10 50 200
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, select
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.users.customer import Location
+from app.models.packing.manifest import PackingManifest  # noqa: F401 (daftarkan mapper)
+from app.schema.internal.packing.packing_manifest import PackingManifestCreate
+from app.service.internal.packing import packing as packing_service
+
+ITEMS_PER_BOX = 6 # Aturan bisnis: maksimal 6 produk per box
+
+class RoundTripCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def build_payload(location_public_id, box_count: int) -> PackingManifestCreate:
+    return PackingManifestCreate.model_validate({
+        "locations": {"locations_id": str(location_public_id), "tujuan_kirim": "BENCHMARK"},
+        "content": {
+            "total_box": box_count,
+            "packing_slip": f"BENCH-{box_count}",
+            "box_number": [
+                {
+                    "id": box_no,
+                    "petugas": "bench",
+                    "berat": "12.5",
+                    "items": [
+                        {
+                            "product": f"PRODUK {item_no}",
+                            "batch": f"B{box_no:04d}{item_no}",
+                            "expire_date": "2027-12-31",
+                            "quantity": "10",
+                            "unit": "BOX",
+                        }
+                        for item_no in range(ITEMS_PER_BOX)
+                    ],
+                }
+                for box_no in range(1, box_count + 1)
+            ],
+        },
+    })
+
+async def run_once(create_fn, location_public_id, box_count: int, counter: RoundTripCounter):
+    payload = build_payload(location_public_id, box_count)
+    async with AsyncSessionLocal() as session:
+        await session.begin()
+        try:
+            counter.count = 0
+            started = time.perf_counter()
+            await create_fn(db=session, payload=payload)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            return counter.count, elapsed_ms
+        finally:
+            await session.rollback()
+
+async def main(box_counts, repeat: int):
+    async with AsyncSessionLocal() as session:
+        location_public_id = (await session.execute(select(Location.public_id).limit(1))).scalar_one_or_none()
+    if location_public_id is None:
+        print("Tidak ada Location di database. Onboard minimal satu customer dulu.")
+        return
+
+    counter = RoundTripCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    modes = [
+        ("per-box", packing_service.create_packing_manifest),
+        ("bulk", packing_service.create_packing_manifest_bulk),
+    ]
+    print(f"{'boxes':>6} | {'mode':>8} | {'round trips':>11} | {'latency ms (best)':>17}")
+    print("-" * 54)
+    for box_count in box_counts:
+        for mode_name, create_fn in modes:
+            best_ms = None
+            trips = 0
+            for _ in range(repeat):
+                trips, elapsed_ms = await run_once(create_fn, location_public_id, box_count, counter)
+                best_ms = elapsed_ms if best_ms is None else min(best_ms, elapsed_ms)
+            print(f"{box_count:>6} | {mode_name:>8} | {trips:>11} | {best_ms:>17.1f}")
+
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark insert manifest: per-box vs bulk.")
+    parser.add_argument("--boxes", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.boxes, args.repeat))
@@ -0,0 +1,94 @@
+# file: scripts/benchmark_manifest_serialization.py
+#
+# Membandingkan dua jalur serialisasi daftar manifest:
+# - "pydantic": ORM + selectinload -> PackingManifestResponse (from_attributes)
+#               -> validasi ulang response_model -> jsonable_encoder -> json.dumps
+#               (meniru apa yang dilakukan FastAPI sebelum ada jalur cepat)
+# - "orjson"  : proyeksi Core select() -> dict -> orjson.dumps (manifest_json.py)
+# Sekalian memastikan hasil JSON kedua jalur identik.
+#
+# Butuh minimal N manifest di database. Jalankan dari root backend:
+#   python scripts/benchmark_manifest_serialization.py --sizes 25 100 1000
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+
+from app.database.database import AsyncSessionLocal, async_engine
+from app.models.packing.manifest import PackingManifest
+from app.schema.internal.packing.packing_manifest import PackingManifestResponse
+from app.service.internal.packing import packing as packing_service
+from app.service.internal.packing import manifest_json as manifest_json_service
+
+response_adapter = TypeAdapter(List[PackingManifestResponse])
+
+async def pydantic_path(db, limit: int) -> bytes:
+    manifests, _ = await packing_service.get_latest_manifests(db=db, limit=limit)
+    response_list = [
+        PackingManifestResponse(
+            public_id=manifest.public_id,
+            created_at=manifest.created_at,
+            updated_at=manifest.updated_at,
+            location_public_id=manifest.location.public_id,
+            tujuan_kirim=manifest.tujuan_kirim,
+            packing_slip=manifest.packing_slip,
+            total_boxes=manifest.total_boxes,
+            packed_boxes=manifest.packed_boxes
+        )
+        for manifest in manifests
+    ]
+    # FastAPI: dump -> validasi response_model -> jsonable_encoder -> JSONResponse.render
+    validated = response_adapter.validate_python([item.model_dump() for item in response_list])
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+async def orjson_path(db, limit: int) -> bytes:
+    body, _ = await manifest_json_service.get_latest_manifests_json(db=db, limit=limit)
+    return body
+
+async def timed(fn, limit: int, repeat: int):
+    best, body = None, b""
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            started = time.perf_counter()
+            body = await fn(session, limit)
+            elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+async def main(sizes, repeat: int):
+    async with AsyncSessionLocal() as session:
+        available = (await session.execute(select(func.count(PackingManifest.id)))).scalar_one()
+    print(f"Manifest tersedia di DB: {available}")
+
+    print(f"{'manifests':>9} | {'pydantic ms':>11} | {'orjson ms':>9} | {'speedup':>7} | {'bytes':>9} | identical")
+    print("-" * 70)
+    for size in sizes:
+        if size > available:
+            print(f"{size:>9} | dilewati, data di DB kurang")
+            continue
+        pydantic_ms, pydantic_body = await timed(pydantic_path, size, repeat)
+        orjson_ms, orjson_body = await timed(orjson_path, size, repeat)
+        identical = json.loads(pydantic_body) == json.loads(orjson_body)
+        print(
+            f"{size:>9} | {pydantic_ms:>11.1f} | {orjson_ms:>9.1f} | "
+            f"{pydantic_ms / orjson_ms:>6.1f}x | {len(orjson_body):>9} | {identical}"
+        )
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark serialisasi daftar manifest: Pydantic vs orjson.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
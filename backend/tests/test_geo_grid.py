@@ -0,0 +1,79 @@
+# file: tests/test_geo_grid.py
+#
+# Regresi `geo._radius_ranges`: dulu setengah-lebar kotak radius dicari dengan loop yang tidak
+# pernah berhenti di lintang tinggi / dekat kutub. Sekarang harus langsung selesai dan semua
+# titik di dalam radius tetap jatuh di salah satu range sel.
+
+import math
+import random
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.models.users.customer import GEO_GRID_CELLS_PER_DEGREE, GEO_GRID_COLUMNS
+from app.service.internal.user import geo
+
+# (lat, lon, radius_km): lintang rendah/menengah, lintang tinggi, dan lingkaran yang mencapai kutub
+CASES = [
+    (-6.9175, 107.6191, 50.0),
+    (35.0, 139.0, 500.0),
+    (59.0, 10.0, 50.0),
+    (60.0, 10.0, 500.0),
+    (80.0, 20.0, 300.0),
+    (89.0, 0.0, 50.0),
+    (89.0, 0.0, 500.0),
+    (-89.5, 120.0, 10.0),
+    (-89.5, 120.0, 500.0),
+    (90.0, 0.0, 1.0),
+    (-90.0, 0.0, 1.0),
+]
+
+
+def _geo_cell(lat: float, lon: float) -> int:
+    """Sama dengan GEO_CELL_SQL."""
+    row = math.floor((lat + 90) * GEO_GRID_CELLS_PER_DEGREE)
+    col = min(math.floor((lon + 180) * GEO_GRID_CELLS_PER_DEGREE), GEO_GRID_COLUMNS - 1)
+    return row * GEO_GRID_COLUMNS + col
+
+
+def _destination(lat: float, lon: float, distance_km: float, bearing: float):
+    """Titik sejauh `distance_km` dari (lat, lon) ke arah `bearing` (radian), di bola."""
+    phi, lam = math.radians(lat), math.radians(lon)
+    delta = distance_km / geo.EARTH_RADIUS_KM
+    phi2 = math.asin(math.sin(phi) * math.cos(delta) + math.cos(phi) * math.sin(delta) * math.cos(bearing))
+    lam2 = lam + math.atan2(
+        math.sin(bearing) * math.sin(delta) * math.cos(phi),
+        math.cos(delta) - math.sin(phi) * math.sin(phi2),
+    )
+    return math.degrees(phi2), (math.degrees(lam2) + 540) % 360 - 180
+
+
+@pytest.mark.parametrize("lat, lon, radius_km", CASES)
+def test_radius_ranges_cover_circle(lat, lon, radius_km):
+    ranges = geo._radius_ranges(lat, lon, radius_km)
+    assert ranges
+    assert len(ranges) <= geo.GEO_GRID_ROWS + 1
+    for lo, hi in ranges:
+        assert 0 <= lo <= hi <= geo.GEO_GRID_ROWS * GEO_GRID_COLUMNS + GEO_GRID_COLUMNS - 1
+
+    rng = random.Random(f"{lat},{lon},{radius_km}")
+    bearings = [rng.uniform(0, 2 * math.pi) for _ in range(2000)] + [k * math.pi / 2 for k in range(4)]
+    for bearing in bearings:
+        # Setengahnya tepat di tepi lingkaran, sisanya di dalam
+        distance = radius_km if rng.random() < 0.5 else rng.uniform(0, radius_km)
+        point_lat, point_lon = _destination(lat, lon, distance, bearing)
+        # Titik tepat di tepi bisa sedikit di luar radius karena pembulatan; find_nearby juga membuangnya
+        if geo.haversine_km(lat, lon, point_lat, point_lon) > radius_km:
+            continue
+        cell = _geo_cell(point_lat, point_lon)
+        assert any(lo <= cell <= hi for lo, hi in ranges), (point_lat, point_lon)
+
+
+@pytest.mark.parametrize("lat", [89.0, -89.5, 90.0, -90.0])
+def test_radius_reaching_pole_uses_full_rows(lat):
+    ranges = geo._radius_ranges(lat, 0.0, 200.0)
+    assert len(ranges) == 1
+    lo, hi = ranges[0]
+    assert lo % GEO_GRID_COLUMNS == 0
+    assert hi % GEO_GRID_COLUMNS == GEO_GRID_COLUMNS - 1